@@ -1,14 +1,88 @@
-import pandas as pd
+import time
+import startup_profiler
+
+# Timeline-ul de pornire începe înaintea oricărui import greu
+STARTUP = startup_profiler.StartupProfiler()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 import threading
-import time
 import random
 import os
 import math
 import json
+import io
 from collections import defaultdict
+import save_worker
+
+# Modulele grele (pandas și stratul de date) se importă după ce fereastra e pe ecran
+pd = None
+storage_backend = None
+change_journal = None
+data_schema = None
+schedule_archive = None
+snapshot_cache = None
+backup_store = None
+file_watcher = None
+table_repository = None
+schedule_index = None
+line_compatibility = None
+order_dependencies = None
+order_search = None
+schedule_store = None
+id_allocator = None
+due_dates = None
+dimensions = None
+scheduling_engine = None
+setup_times = None
+shift_calendar = None
+maintenance_windows = None
+schedule_repair = None
+
+# Tabelul din memorie pentru fiecare sursă de date
+TABLE_ATTRS = {
+    'production_lines': 'production_lines_df',
+    'orders': 'orders_df',
+    'schedule': 'schedule_df'
+}
+
+# Peste acest număr de rânduri modificate extern, tabelul se înlocuiește complet
+EXTERNAL_DIFF_FULL_RELOAD = 1000
+
+# Metricile din snapshot sunt refolosite doar dacă sunt recente (depind de ora curentă)
+METRICS_CACHE_MAX_AGE = timedelta(minutes=15)
+
+# Timer-ul de termene se re-verifică cel puțin o dată pe minut
+DEADLINE_TIMER_MAX_MS = 60000
+
+
+def load_heavy_modules():
+    """Importă pandas și modulele de date (lazy, în spatele ecranului de încărcare)"""
+    global pd, storage_backend, change_journal, data_schema, schedule_archive, snapshot_cache, backup_store, file_watcher, table_repository, schedule_index, line_compatibility, order_dependencies, order_search, schedule_store, id_allocator, due_dates, dimensions, scheduling_engine, setup_times, shift_calendar, maintenance_windows, schedule_repair
+    import pandas as pd
+    import storage_backend
+    import change_journal
+    import data_schema
+    import schedule_archive
+    import snapshot_cache
+    import backup_store
+    import file_watcher
+    import table_repository
+    import schedule_index
+    import line_compatibility
+    import order_dependencies
+    import order_search
+    import schedule_store
+    import id_allocator
+    import due_dates
+    import dimensions
+    import scheduling_engine
+    import setup_times
+    import shift_calendar
+    import maintenance_windows
+    import schedule_repair
+
 
 class ManufacturingScheduler:
     def __init__(self, root):
@@ -26,9 +100,13 @@ class ManufacturingScheduler:
         self.schedule_file = "production_schedule.xlsx"
         self.rules_file = "production_rules.json"
 
-        # Încărcare date
-        self.initialize_databases()
-        self.load_all_data()
+        # Store columnar (Excel rămâne doar pentru import/export)
+        self.data_dir = "manufacturing_data"
+        self.excel_files = {
+            'production_lines': self.production_lines_file,
+            'orders': self.orders_file,
+            'schedule': self.schedule_file
+        }
 
         # Variabile de stare
         self.production_lines = {}
@@ -58,17 +136,104 @@ class ManufacturingScheduler:
             'total_capacity': 250          # Capacitate de bază
         }
 
-        # Inițializare metrici
-        self.calculate_production_metrics()
+        # Fereastra apare imediat: header + ecran de încărcare
+        self.create_header_panel()
+        self.create_splash_screen()
+        STARTUP.mark("Window shell (header + splash)")
+
+        # Importurile grele și încărcarea datelor rulează după primul frame desenat
+        self.root.after(1, self.finish_startup)
+
+    def create_splash_screen(self):
+        """Ecran de încărcare afișat cât timp se importă modulele și se încarcă datele"""
+        self.splash_frame = tk.Frame(self.root, bg='#1a1a2e')
+        self.splash_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.splash_text = tk.StringVar(value="⏳ Starting...")
+        tk.Label(self.splash_frame, text="🏭", font=('Segoe UI', 48),
+                fg='#00d4aa', bg='#1a1a2e').pack(pady=(150, 10))
+        tk.Label(self.splash_frame, textvariable=self.splash_text,
+                font=('Segoe UI', 14), fg='#e8eaf0', bg='#1a1a2e').pack()
+
+    def set_splash_status(self, text):
+        """Actualizează mesajul ecranului de încărcare și redesenează"""
+        self.splash_text.set(text)
+        self.root.update_idletasks()
+
+    def finish_startup(self):
+        """A doua etapă a pornirii: importuri grele, date, tab-ul activ"""
+        try:
+            STARTUP.mark("Window on screen")
+            self.set_splash_status("📦 Loading modules...")
+            load_heavy_modules()
+            STARTUP.mark("Heavy imports (pandas, data layer)")
+
+            self.set_splash_status("📊 Loading production data...")
+            # Backend selectabil: arrow (implicit), parquet, sqlite, excel
+            self.storage = storage_backend.create_storage_backend(
+                self.data_dir, os.environ.get('MANUFACTURING_STORAGE', 'arrow'))
+
+            # Jurnal de modificări (doar rândurile schimbate, compactat periodic)
+            self.journal = change_journal.ChangeJournal(os.path.join(self.data_dir, "changes.journal"))
+
+            # Worker de salvare în fundal (grupează salvările în rafală)
+            self.save_worker = save_worker.BackgroundSaveWorker(self.write_data_snapshot)
+
+            # Arhivă rece pentru istoricul programărilor (partiții lunare)
+            self.schedule_archive = schedule_archive.ScheduleArchive(os.path.join(self.data_dir, "archive"))
+
+            # Backup-uri deduplicate, păstrate pe generații
+            self.backup_store = backup_store.BackupStore(os.path.join(self.data_dir, "backups"))
+
+            # Snapshot binar pentru redeschidere rapidă
+            self.snapshot_cache = snapshot_cache.SnapshotCache(os.path.join(self.data_dir, "snapshot.cache"))
+
+            # Index pe cheia primară (OrderID / LineID / ScheduleID)
+            self.create_repositories()
+
+            # Încărcare date
+            self.initialize_databases()
+            self.load_all_data()
+            STARTUP.mark("Data load")
+
+            # Inițializare metrici (din snapshot dacă sunt recente)
+            if not self.restore_cached_metrics():
+                self.calculate_production_metrics()
+            STARTUP.mark("Production metrics")
 
-        # Creare interfață
-        self.create_main_layout()
+            # Snapshot nou după o pornire rece (doar dacă store-ul nu e în curs de scriere)
+            if not self.loaded_from_snapshot and not self.save_worker.is_dirty:
+                self.write_snapshot_cache()
 
-        # Start thread optimizare
-        self.optimization_thread = threading.Thread(target=self.continuous_optimization, daemon=True)
-        self.optimization_thread.start()
+            # Creare interfață - doar tab-ul activ, restul la prima selecție
+            self.splash_frame.destroy()
+            self.create_main_layout()
+            self.update_header_metrics()
+            STARTUP.mark("Active tab")
+
+            # Compactare periodică a jurnalului de modificări
+            self.root.after(300000, self.schedule_journal_compaction)
+
+            # Detectare modificări externe în fișierele Excel și în reguli
+            self.file_watcher = file_watcher.FileWatcher({**self.excel_files, 'rules': self.rules_file})
+            self.root.after(self.file_watcher.poll_interval_ms, self.poll_external_changes)
+
+            # Timer armat pe următorul termen al unei comenzi deschise
+            self.arm_deadline_timer()
+
+            # Flush la închiderea ferestrei
+            self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        print("🏭 Manufacturing Scheduler inițializat cu succes")
+            # Start thread optimizare
+            self.optimization_thread = threading.Thread(target=self.continuous_optimization, daemon=True)
+            self.optimization_thread.start()
+
+            print("🏭 Manufacturing Scheduler inițializat cu succes")
+            STARTUP.report()
+
+        except Exception as e:
+            print(f"❌ Eroare la pornire: {e}")
+            messagebox.showerror("Eroare", f"Eroare la pornirea aplicației: {str(e)}")
 
     def initialize_metrics_properly(self):
         """Inițializează metricile corect după crearea UI"""
@@ -136,11 +301,16 @@ class ManufacturingScheduler:
 
     def initialize_databases(self):
         """Creează sau actualizează bazele de date pentru producție"""
-        self.create_production_lines_db()
-        self.create_orders_db()
-        self.create_schedule_db()
+        # Workbook-urile demo se scriu doar la prima pornire (store gol)
+        if not all(self.storage.exists(name) for name in storage_backend.TABLE_NAMES):
+            self.create_production_lines_db()
+            self.create_orders_db()
+            self.create_schedule_db()
         self.create_rules_config()
 
+        # Migrare one-shot din Excel în store-ul columnar
+        storage_backend.migrate_excel_to_store(self.storage, self.excel_files)
+
     def create_production_lines_db(self):
         """Creează baza de date pentru liniile de producție"""
         if not os.path.exists(self.production_lines_file):
@@ -290,66 +460,663 @@ class ManufacturingScheduler:
             print("✅ Reguli de producție create")
 
     def load_all_data(self):
-        """Încarcă toate datele din bazele de date"""
+        """Încarcă toate datele din store-ul columnar"""
         try:
-            print("📊 Încărcare date producție...")
+            print(f"📊 Încărcare date producție ({self.storage.name} store)...")
+
+            # Pornire rapidă: tabelele normalizate din snapshot, dacă sursele nu s-au schimbat
+            cached = self.snapshot_cache.load(self.snapshot_sources()) if hasattr(self, 'snapshot_cache') else None
+            self.loaded_from_snapshot = cached is not None
+            self.cached_metrics = cached.get('metrics') if cached else None
 
-            # Încărcare linii producție
-            self.production_lines_df = pd.read_excel(self.production_lines_file)
+            if cached:
+                tables = cached['tables']
+                print("⚡ Date încărcate din snapshot (surse neschimbate)")
+            else:
+                # Încărcare snapshot de bază
+                tables = {name: self.storage.load_table(name) for name in storage_backend.TABLE_NAMES}
+
+                # Recuperare: aplică modificările din jurnal ne-compactate încă
+                tables = self.journal.replay(tables)
+
+                # Tipizare centralizată (categorii, lățimi numerice reduse, datetime64)
+                tables, self.memory_report = data_schema.normalize_tables(tables)
+
+            # Linii producție
+            self.production_lines_df = tables['production_lines']
             print(f"✅ {len(self.production_lines_df)} linii de producție încărcate")
 
-            # Încărcare comenzi
-            self.orders_df = pd.read_excel(self.orders_file)
-            self.orders_df['OrderDate'] = pd.to_datetime(self.orders_df['OrderDate'])
-            self.orders_df['DueDate'] = pd.to_datetime(self.orders_df['DueDate'])
+            # Comenzi
+            self.orders_df = tables['orders']
             print(f"✅ {len(self.orders_df)} comenzi încărcate")
 
-            # Încărcare programare
-            self.schedule_df = pd.read_excel(self.schedule_file)
-            if not self.schedule_df.empty:
-                self.schedule_df['StartDateTime'] = pd.to_datetime(self.schedule_df['StartDateTime'])
-                self.schedule_df['EndDateTime'] = pd.to_datetime(self.schedule_df['EndDateTime'])
-                self.schedule_df['LastModified'] = pd.to_datetime(self.schedule_df['LastModified'])
-            print(f"✅ {len(self.schedule_df)} programări încărcate")
-
             # Încărcare reguli
             with open(self.rules_file, 'r') as f:
                 self.production_rules = json.load(f)
             print("✅ Reguli de producție încărcate")
 
+            # Programare - doar orizontul activ, istoricul rămâne în arhivă
+            self.schedule_df = tables['schedule']
+            self.roll_schedule_horizon()
+            print(f"✅ {len(self.schedule_df)} programări încărcate "
+                  f"({self.schedule_archive.archived_rows} în arhivă)")
+
+            # Indexurile din snapshot se adoptă fără reconstruire (tabelul schimbat între timp → reconstruire)
+            if cached:
+                indexes = cached.get('indexes', {})
+                for table_name, attr in TABLE_ATTRS.items():
+                    self.repositories[table_name].restore_state(getattr(self, attr), indexes.get(table_name))
+
         except Exception as e:
             print(f"❌ Eroare la încărcarea datelor: {e}")
             messagebox.showerror("Eroare", f"Eroare la încărcarea datelor: {str(e)}")
 
-    def save_all_data(self):
-        """Salvează toate datele în bazele de date"""
+    @property
+    def schedule_df(self):
+        """Tabelul programărilor; intrările din buffer sunt scrise în el la prima citire"""
+        df = self._schedule_df     # AttributeError (hasattr False) până la încărcare
+        if getattr(self, 'schedule_store', None) is not None and self.schedule_store.pending:
+            self.schedule_store.commit(self.schedule_repo)
+            df = self._schedule_df
+        return df
+
+    @schedule_df.setter
+    def schedule_df(self, df):
+        self._schedule_df = df
+
+    def create_repositories(self):
+        """Repository cu index pe cheia primară pentru fiecare tabel (căutare după ID fără scanare)"""
+        # Repository-ul schedule citește tabelul direct (fără commit-ul buffer-ului de programări noi)
+        self.repositories = {
+            table_name: table_repository.TableRepository(
+                table_name,
+                lambda attr=attr: getattr(self, '_schedule_df' if attr == 'schedule_df' else attr),
+                lambda df, attr=attr: setattr(self, attr, df))
+            for table_name, attr in TABLE_ATTRS.items()
+        }
+        self.lines_repo = self.repositories['production_lines']
+        self.orders_repo = self.repositories['orders']
+        self.schedule_repo = self.repositories['schedule']
+
+        # Buffer pentru programările noi - o singură inserare în tabel per lot
+        self.schedule_store = schedule_store.ScheduleStore()
+
+        # Secvențe persistente de ID-uri (ORD / LINE / SCH), avansate de ID-urile din tabele
+        self.id_allocator = id_allocator.IdAllocator(
+            os.path.join(self.data_dir, "id_sequences.json"), self.repositories)
+
+        # Index pe termene (DueDate) - întârzieri și termene apropiate fără scanarea comenzilor
+        self.due_dates = due_dates.DueDateIndex(self.orders_repo, on_change=self.on_due_dates_changed)
+        self.due_dates.add_deadline_listener(self.on_orders_overdue)
+        self.deadline_timer = None
+
+        # Dimensiuni clienți / produse - chei întregi peste coloanele categoriale din orders
+        self.customers = dimensions.Dimension(self.orders_repo, 'CustomerName', 'CustomerKey')
+        self.products = dimensions.Dimension(self.orders_repo, 'ProductName', 'ProductKey')
+
+        # Index de intervale pe linii pentru programări (suprapuneri, goluri, ore ocupate)
+        self.schedule_index = schedule_index.ScheduleIntervalIndex(self.schedule_repo, self.schedule_store)
+
+        # Matrice tip produs × linie, recompilată doar când liniile sau regulile se schimbă
+        self.line_compatibility = line_compatibility.CompatibilityMatrix(
+            self.lines_repo, lambda: getattr(self, 'production_rules', {}))
+
+        # Calendarul de schimburi (ore de lucru pe zi, zile pe săptămână) - timp de lucru în loc de timp de ceas
+        self.shift_calendar = shift_calendar.ShiftCalendar(
+            lambda: self.production_config, lambda: getattr(self, 'production_rules', {}))
+
+        # Ferestre de mentenanță - intervale blocate în calendarul liniei; o schimbare repară doar linia afectată
+        self.maintenance = maintenance_windows.MaintenanceCalendar(
+            os.path.join(self.data_dir, "maintenance_windows.json"), self.lines_repo, self.shift_calendar,
+            on_change=self.on_maintenance_changed)
+
+        # Timpi de schimbare a fabricației între tipuri de produs (setup_complexity × SetupTime_Minutes)
+        self.setup_model = setup_times.SetupModel(
+            self.lines_repo, lambda: getattr(self, 'production_rules', {}))
+
+        # Graful de dependențe dintre comenzi (coloana Dependencies), ordonat topologic
+        self.order_dependencies = order_dependencies.DependencyGraph(self.orders_repo)
+
+        # Index de trigrame pentru căutarea în comenzi (construit la prima căutare)
+        self.order_search = order_search.OrderSearchIndex(self.orders_repo)
+
+        # Reparare incrementală a programului (comandă nouă / ștearsă, durată schimbată, linie oprită)
+        self.schedule_repairer = schedule_repair.ScheduleRepairer(
+            self.repositories, self.schedule_index, self.shift_calendar, self.order_dependencies,
+            self.create_batch_scheduler, self.id_allocator, self.schedule_store)
+
+    def snapshot_sources(self):
+        """Fișierele de care depinde snapshot-ul: store, jurnal, reguli, arhivă"""
+        return (self.storage.source_files() +
+                [self.journal.journal_path, self.journal.meta_path, self.rules_file,
+                 self.schedule_archive.manifest_path])
+
+    def write_snapshot_cache(self):
+        """Salvează tabelele normalizate, indexurile și metricile pentru următoarea pornire"""
         try:
-            # Backup înainte de salvare
-            for file in [self.production_lines_file, self.orders_file, self.schedule_file]:
-                if os.path.exists(file):
-                    backup_file = f"{file}.backup"
-                    import shutil
-                    shutil.copy2(file, backup_file)
+            tables = {
+                'production_lines': self.production_lines_df,
+                'orders': self.orders_df,
+                'schedule': self.schedule_df
+            }
+            self.snapshot_cache.save(self.snapshot_sources(), {
+                'tables': tables,
+                'indexes': {table_name: self.repositories[table_name].export_state() for table_name in tables},
+                'metrics': {
+                    'values': dict(self.production_metrics),
+                    'computed_at': datetime.now()
+                }
+            })
+            print("⚡ Snapshot de pornire actualizat")
 
-            # Salvare linii producție
-            self.production_lines_df.to_excel(self.production_lines_file, index=False)
+        except Exception as e:
+            print(f"❌ Eroare la scrierea snapshot-ului: {e}")
 
-            # Salvare comenzi
-            self.orders_df.to_excel(self.orders_file, index=False)
+    def restore_cached_metrics(self):
+        """Refolosește metricile din snapshot dacă au fost calculate recent"""
+        cached = getattr(self, 'cached_metrics', None)
+        if not cached or datetime.now() - cached['computed_at'] > METRICS_CACHE_MAX_AGE:
+            return False
 
-            # Salvare programare
-            self.schedule_df.to_excel(self.schedule_file, index=False)
+        self.production_metrics = dict(cached['values'])
+        return True
 
-            # Salvare reguli
-            with open(self.rules_file, 'w') as f:
-                json.dump(self.production_rules, f, indent=2)
+    def roll_schedule_horizon(self):
+        """Mută programările terminate/istorice din setul activ în arhiva rece"""
+        try:
+            self.schedule_df, archived = self.schedule_archive.archive_cold(self.schedule_df)
+            if archived:
+                # Arhiva e scrisă înainte ca setul activ să fie salvat fără aceste rânduri
+                self.save_all_data()
+
+        except Exception as e:
+            print(f"❌ Eroare la arhivarea programărilor: {e}")
+
+    def get_schedule_history(self, start=None, end=None):
+        """Programările dintr-un interval: setul activ + partițiile arhivate încărcate la cerere"""
+        hot_df = self.schedule_df
+        if not hot_df.empty:
+            mask = pd.Series(True, index=hot_df.index)
+            if start is not None:
+                mask &= hot_df['EndDateTime'] >= pd.Timestamp(start)
+            if end is not None:
+                mask &= hot_df['StartDateTime'] <= pd.Timestamp(end)
+            hot_df = hot_df[mask]
+
+        archived_df = self.schedule_archive.load_range(start, end)
+        if archived_df.empty:
+            return hot_df
+
+        history_df = pd.concat([archived_df, hot_df], ignore_index=True)
+        return data_schema.normalize_frame('schedule', history_df).sort_values('StartDateTime')
 
-            print("💾 Toate datele salvate cu succes")
+    def save_all_data(self):
+        """Programează salvarea tuturor datelor pe worker-ul de fundal (nu blochează UI-ul)"""
+        try:
+            self.save_worker.request_save(self.take_data_snapshot())
+            self.update_save_indicator()
 
         except Exception as e:
             print(f"❌ Eroare la salvare: {e}")
             messagebox.showerror("Eroare", f"Eroare la salvarea datelor: {str(e)}")
 
+    def take_data_snapshot(self):
+        """Snapshot imuabil al tabelelor, luat pe thread-ul principal"""
+        return {
+            'production_lines': self.production_lines_df.copy(),
+            'orders': self.orders_df.copy(),
+            'schedule': self.schedule_df.copy(),
+            'rules': json.loads(json.dumps(self.production_rules)),
+            'journal_seq': self.journal.last_seq
+        }
+
+    def write_data_snapshot(self, snapshot):
+        """Scrie un snapshot în store - rulează pe thread-ul worker-ului de salvare"""
+        tables = [name for name in storage_backend.TABLE_NAMES if name in snapshot]
+
+        # Backup deduplicat - generație nouă doar dacă un tabel s-a schimbat
+        backup_tables = {name: snapshot[name] for name in tables + ['rules'] if name in snapshot}
+        if backup_tables:
+            self.backup_store.create_generation(backup_tables)
+
+        for table_name in tables:
+            self.storage.save_table(table_name, snapshot[table_name])
+
+        # Salvare reguli
+        if 'rules' in snapshot:
+            with open(self.rules_file, 'w') as f:
+                json.dump(snapshot['rules'], f, indent=2)
+
+        # Snapshot complet - intrările din jurnal până la journal_seq devin redundante
+        if 'journal_seq' in snapshot and (len(tables) == len(storage_backend.TABLE_NAMES)
+                                          or self.storage.supports_row_updates):
+            self.journal.mark_compacted(snapshot['journal_seq'])
+
+        print("💾 Toate datele salvate cu succes")
+
+    def record_change(self, table_name, op, row):
+        """Salvează o singură modificare de rând în jurnal (fără rescrierea tabelelor)"""
+        try:
+            self.journal.append(table_name, op, row)
+
+            # Backend-urile tranzacționale (SQLite) primesc modificarea imediat
+            self.storage.apply_change(table_name, op, row)
+
+            if self.journal.needs_compaction():
+                self.compact_journal_async()
+
+        except Exception as e:
+            print(f"❌ Eroare la scrierea în jurnal: {e}")
+            # Fallback: salvare completă
+            self.save_all_data()
+
+    def compact_journal_async(self):
+        """Compactează jurnalul în snapshot-ul de bază prin worker-ul de salvare"""
+        # O salvare în curs va compacta oricum jurnalul
+        if self.save_worker.is_dirty:
+            return
+
+        if self.storage.supports_row_updates:
+            # Backend-urile cu scrieri pe rând au deja toate modificările
+            self.save_worker.request_save({'journal_seq': self.journal.last_seq})
+        else:
+            self.save_worker.request_save(self.take_data_snapshot())
+
+        self.update_save_indicator()
+
+    def schedule_journal_compaction(self):
+        """Compactare periodică a jurnalului (la 5 minute)"""
+        try:
+            if self.journal.pending_entries > 0:
+                self.compact_journal_async()
+
+            # Orizontul activ avansează odată cu timpul
+            self.roll_schedule_horizon()
+        except Exception as e:
+            print(f"❌ Eroare la compactarea periodică: {e}")
+
+        self.root.after(300000, self.schedule_journal_compaction)
+
+    def poll_save_results(self):
+        """Preia rezultatele worker-ului de salvare pe thread-ul Tk"""
+        try:
+            for status, detail, elapsed in self.save_worker.poll_results():
+                if status == 'ok':
+                    print(f"💾 Salvare în fundal terminată în {elapsed:.2f}s")
+                else:
+                    self.status_text.set("❌ Save failed")
+                    messagebox.showerror("Eroare", f"Eroare la salvarea datelor: {detail}")
+
+            self.update_save_indicator()
+
+        except Exception as e:
+            print(f"❌ Eroare la verificarea salvărilor: {e}")
+
+        self.root.after(250, self.poll_save_results)
+
+    def update_save_indicator(self):
+        """Actualizează indicatorul de stare a salvării din status bar"""
+        if not hasattr(self, 'save_state_text'):
+            return
+
+        if self.save_worker.is_dirty:
+            self.save_state_text.set("⏳ Saving...")
+        else:
+            self.save_state_text.set("💾 All changes saved")
+
+    def on_close(self):
+        """Închidere aplicație - scrie tot ce e în așteptare înainte de ieșire"""
+        try:
+            self.status_text.set("💾 Saving before exit...")
+            self.root.update_idletasks()
+
+            if self.journal.pending_entries > 0:
+                self.compact_journal_async()
+
+            # Worker-ul se oprește doar după confirmarea ieșirii - la anulare salvările continuă normal
+            if self.save_worker.flush(timeout=60):
+                # Toate scrierile s-au terminat - snapshot-ul corespunde exact surselor
+                self.write_snapshot_cache()
+            elif not messagebox.askyesno("Unsaved Changes",
+                                         "Saving is taking longer than expected.\nExit anyway?"):
+                self.status_text.set("⏳ Still saving...")
+                return
+
+            self.save_worker.stop(timeout=0)
+            self.journal.close()
+
+        except Exception as e:
+            print(f"❌ Eroare la închidere: {e}")
+
+        self.root.destroy()
+
+    def export_data_to_excel(self):
+        """Exportă tabelele curente în fișierele Excel (format de schimb)"""
+        try:
+            tables = {
+                'production_lines': self.production_lines_df,
+                'orders': self.orders_df,
+                'schedule': self.schedule_df
+            }
+
+            for table_name, excel_file in self.excel_files.items():
+                rows = self.storage.export_to_excel(table_name, excel_file, tables[table_name])
+                print(f"📤 Exportat {table_name} → {excel_file} ({rows} rânduri)")
+
+            # Scrierile proprii nu sunt modificări externe
+            if hasattr(self, 'file_watcher'):
+                self.file_watcher.acknowledge_all()
+
+            self.status_text.set("📤 Data exported to Excel")
+            messagebox.showinfo("Export Excel", "Data exported to:\n" + "\n".join(self.excel_files.values()))
+
+        except Exception as e:
+            print(f"❌ Eroare la exportul Excel: {e}")
+            messagebox.showerror("Eroare", f"Eroare la exportul Excel: {str(e)}")
+
+    def import_data_from_excel(self):
+        """Reimportă fișierele Excel în store, înlocuind datele curente"""
+        try:
+            if not messagebox.askyesno("Import Excel",
+                                       "Replace current data with the contents of the Excel files?"):
+                return
+
+            for table_name, excel_file in self.excel_files.items():
+                if os.path.exists(excel_file):
+                    rows = self.storage.import_from_excel(table_name, excel_file)
+                    print(f"📥 Importat {excel_file} → {table_name} ({rows} rânduri)")
+
+            # Modificările din jurnal sunt anterioare datelor importate
+            self.journal.mark_compacted(self.journal.last_seq)
+            if hasattr(self, 'file_watcher'):
+                self.file_watcher.acknowledge_all()
+
+            self.load_all_data()
+            self.populate_production_lines()
+            self.populate_orders()
+            self.calculate_production_metrics()
+            self.update_header_metrics()
+            self.status_text.set("📥 Data imported from Excel")
+
+        except Exception as e:
+            print(f"❌ Eroare la importul Excel: {e}")
+            messagebox.showerror("Eroare", f"Eroare la importul Excel: {str(e)}")
+
+    def arm_deadline_timer(self):
+        """Programează verificarea la următorul termen (plafonat, pentru termenele adăugate între timp)"""
+        if self.deadline_timer is not None:
+            self.root.after_cancel(self.deadline_timer)
+
+        delay_ms = DEADLINE_TIMER_MAX_MS
+        next_deadline = self.due_dates.next_deadline()
+        if next_deadline is not None:
+            seconds = (next_deadline[0] - pd.Timestamp.now()).total_seconds()
+            delay_ms = max(1000, min(delay_ms, int(seconds * 1000) + 1000))
+
+        self.deadline_timer = self.root.after(delay_ms, self.on_deadline_timer)
+
+    def on_deadline_timer(self):
+        self.deadline_timer = None
+        try:
+            self.due_dates.fire_crossed()
+        except Exception as e:
+            print(f"❌ Eroare la verificarea termenelor: {e}")
+        self.arm_deadline_timer()
+
+    def on_due_dates_changed(self):
+        """Termenele s-au schimbat - timer-ul se re-armează (doar din thread-ul UI)"""
+        if getattr(self, 'deadline_timer', None) is not None and threading.current_thread() is threading.main_thread():
+            self.arm_deadline_timer()
+
+    def on_maintenance_changed(self, line_id, previous_calendar, start, end):
+        """Fereastră de mentenanță schimbată - se mută doar programările afectate ale liniei"""
+        self.on_schedule_repaired(self.schedule_repairer.repair_line(line_id, start, end, previous_calendar),
+                                  f"Maintenance on {line_id}")
+
+    def on_schedule_repaired(self, result, reason, record=True):
+        """Jurnalizează doar rândurile atinse de o reparare incrementală a programului
+        (record=False când urmează oricum o salvare completă)"""
+        if not len(result) and not result.unscheduled:
+            return
+
+        if record:
+            for table_name, op, row in result.changes(self.schedule_repo, self.orders_repo):
+                self.record_change(table_name, op, row)
+
+        print(f"{reason}:\n{result.report()}")
+        self.status_text.set(f"🩹 {reason}: {len(result.moved)} moved, {len(result.added)} added, "
+                             f"{len(result.removed)} removed, {len(result.unscheduled)} unscheduled")
+
+    def schedule_new_orders(self, orders, record=True):
+        """Comenzile tocmai adăugate primesc un loc în program: cele neprogramate printr-o singură rulare
+        a motorului, cele deja Scheduled pe o linie (dar fără programări) pe linia lor"""
+        if orders.empty:
+            return
+
+        unscheduled = scheduling_engine.unscheduled_mask(orders)
+        order_ids = orders.loc[unscheduled, 'OrderID'].tolist()
+        if order_ids:
+            reason = f"Order {order_ids[0]} added" if len(order_ids) == 1 else f"{len(order_ids)} orders added"
+            self.on_schedule_repaired(self.schedule_repairer.orders_added(order_ids), reason, record)
+
+        assigned = orders[~unscheduled & (orders['Status'] == 'Scheduled')]
+        for order_id, line_id in zip(assigned['OrderID'].tolist(), assigned['AssignedLine'].tolist()):
+            if not self.schedule_repairer.bookings.get(order_id):
+                self.on_schedule_repaired(self.schedule_repairer.line_changed(order_id, line_id),
+                                          f"Order {order_id} added", record)
+
+    def on_orders_overdue(self, order_ids):
+        """Eveniment: comenzi deschise care tocmai au depășit termenul"""
+        print(f"⏰ Comenzi întârziate: {', '.join(map(str, order_ids))}")
+        self.status_text.set(f"⏰ {len(order_ids)} order(s) just became overdue: {', '.join(map(str, order_ids[:3]))}")
+        self.calculate_production_metrics()
+        self.update_header_metrics()
+
+    def poll_external_changes(self):
+        """Verifică periodic dacă fișierele de date au fost modificate de alt program"""
+        try:
+            for source in self.file_watcher.changed_sources():
+                if self.reload_external_source(source):
+                    self.file_watcher.acknowledge(source)
+
+        except Exception as e:
+            print(f"❌ Eroare la verificarea fișierelor: {e}")
+
+        self.root.after(self.file_watcher.poll_interval_ms, self.poll_external_changes)
+
+    def reload_external_source(self, source):
+        """Reîncarcă doar sursa modificată și aplică diferențele la nivel de rând"""
+        if source == 'rules':
+            with open(self.rules_file, 'r') as f:
+                self.production_rules = json.load(f)
+            print("👀 Reguli de producție reîncărcate (modificare externă)")
+            self.status_text.set("👀 Production rules reloaded")
+            return True
+
+        path = self.excel_files[source]
+        if not os.path.exists(path):
+            return True
+
+        try:
+            new_df = data_schema.normalize_frame(source, pd.read_excel(path))
+        except Exception as e:
+            # Fișierul poate fi încă în curs de scriere - reîncercăm la următorul poll
+            print(f"⚠️ {path} nu poate fi citit încă: {e}")
+            return False
+
+        # Fișierul e un export: se aplică doar ce s-a schimbat în el față de ultima versiune confirmată
+        baseline = self.file_watcher.baseline(source)
+        old_df = (data_schema.normalize_frame(source, pd.read_excel(io.BytesIO(baseline)))
+                  if baseline is not None else new_df.iloc[0:0])
+
+        key_column = change_journal.PRIMARY_KEYS[source]
+        attr = TABLE_ATTRS[source]
+        inserted, updated, deleted = file_watcher.rebase_diff(getattr(self, attr), old_df, new_df, key_column)
+
+        changed_rows = len(inserted) + len(updated) + len(deleted)
+        if changed_rows == 0:
+            return True
+
+        if changed_rows > EXTERNAL_DIFF_FULL_RELOAD:
+            # Modificare masivă - diferențele se aplică vectorizat, într-o singură salvare
+            self.apply_external_diff_bulk(source, inserted, updated, deleted)
+            self.save_all_data()
+        else:
+            self.apply_external_diff(source, new_df, inserted, updated, deleted)
+
+        print(f"👀 {path}: {len(inserted)} rânduri noi, {len(updated)} modificate, {len(deleted)} șterse")
+        self.refresh_table_views(source)
+        self.status_text.set(f"👀 {os.path.basename(path)} changed externally - "
+                             f"{changed_rows} rows updated")
+        return True
+
+    def apply_external_diff(self, source, new_df, inserted, updated, deleted):
+        """Aplică rândurile noi/modificate/șterse în memorie și în jurnal"""
+        repository = self.repositories[source]
+        key_column = repository.key_column
+
+        if deleted:
+            # Comenzile șterse își eliberează programările înainte să dispară din tabel
+            if source == 'orders':
+                for key in deleted:
+                    self.on_schedule_repaired(self.schedule_repairer.order_removed(key), f"Order {key} removed")
+            repository.delete(deleted)
+            for key in deleted:
+                self.record_change(source, 'delete', {key_column: key})
+
+        # Doar celulele schimbate sunt actualizate
+        for key, changes in updated.items():
+            old_hours = repository.get_value(key, 'EstimatedHours') if source == 'orders' else None
+            self.record_change(source, 'upsert', repository.update(key, changes))
+
+            # Delte pentru repararea incrementală a programului
+            if source == 'orders' and 'EstimatedHours' in changes:
+                self.on_schedule_repaired(
+                    self.schedule_repairer.duration_changed(key, old_hours, changes['EstimatedHours']),
+                    f"Order {key} duration changed")
+            if (source == 'orders' and 'AssignedLine' in changes
+                    and repository.get_value(key, 'Status') not in scheduling_engine.CLOSED_ORDER_STATUSES):
+                self.on_schedule_repaired(self.schedule_repairer.line_changed(key, changes['AssignedLine']),
+                                          f"Order {key} moved to another line")
+            elif source == 'production_lines' and changes.get('Status', 'Active') != 'Active':
+                self.on_schedule_repaired(self.schedule_repairer.line_down(key), f"Line {key} down")
+
+        if not inserted.empty:
+            repository.insert(inserted)
+            for row in inserted.to_dict('records'):
+                self.record_change(source, 'upsert', row)
+
+            # Comenzile noi deschise primesc un loc în program
+            if source == 'orders':
+                self.schedule_new_orders(inserted)
+
+    def apply_external_diff_bulk(self, source, inserted, updated, deleted):
+        """Aplică diferențele mari fără jurnal pe rând: ștergere, update_many pe coloană, o inserare"""
+        repository = self.repositories[source]
+        if deleted:
+            repository.delete(deleted)
+
+        columns = {}
+        for key, changes in updated.items():
+            for column, value in changes.items():
+                columns.setdefault(column, ([], []))
+                columns[column][0].append(key)
+                columns[column][1].append(value)
+        for column, (keys, values) in columns.items():
+            repository.update_many(keys, {column: values})
+
+        if not inserted.empty:
+            repository.insert(inserted)
+            # Salvarea completă de după diferențele mari include și programările noi
+            if source == 'orders':
+                self.schedule_new_orders(inserted, record=False)
+
+    def refresh_table_views(self, source):
+        """Reîmprospătează doar vizualizarea tabelului modificat și metricile"""
+        if source == 'production_lines':
+            self.populate_production_lines()
+        elif source == 'orders':
+            self.populate_orders()
+        elif source == 'schedule':
+            self.populate_timeline()
+
+        self.calculate_production_metrics()
+        self.update_header_metrics()
+
+    def show_backup_generations(self):
+        """Dialog pentru restaurarea unei generații de backup"""
+        try:
+            generations = self.backup_store.list_generations()
+            if not generations:
+                messagebox.showinfo("Backups", "No backup generations available yet.")
+                return
+
+            dialog = tk.Toplevel(self.root)
+            dialog.title("🛟 Restore Backup")
+            dialog.geometry("420x360")
+            dialog.configure(bg='#1a1a2e')
+            dialog.transient(self.root)
+
+            tk.Label(dialog, text="🛟 Backup Generations", font=('Segoe UI', 12, 'bold'),
+                    fg='#00d4aa', bg='#1a1a2e').pack(pady=10)
+
+            listbox = tk.Listbox(dialog, font=('Segoe UI', 10), bg='#16213e', fg='#e8eaf0',
+                                 selectbackground='#0078ff', height=12)
+            listbox.pack(fill=tk.BOTH, expand=True, padx=15)
+
+            for generation in generations:
+                listbox.insert(tk.END, f"#{generation['id']}  -  {generation['created_at'].replace('T', ' ')}")
+            listbox.selection_set(0)
+
+            def restore_selected():
+                selection = listbox.curselection()
+                if not selection:
+                    return
+                generation = generations[selection[0]]
+                if messagebox.askyesno("Restore Backup",
+                                       f"Replace current data with backup #{generation['id']}?",
+                                       parent=dialog):
+                    dialog.destroy()
+                    self.restore_backup_generation(generation['id'])
+
+            tk.Button(dialog, text="♻️ Restore", command=restore_selected,
+                     font=('Segoe UI', 10), bg='#ffa502', fg='white',
+                     relief='flat', padx=15, pady=5).pack(pady=10)
+
+        except Exception as e:
+            print(f"❌ Eroare la afișarea backup-urilor: {e}")
+            messagebox.showerror("Eroare", f"Eroare la afișarea backup-urilor: {str(e)}")
+
+    def restore_backup_generation(self, generation_id):
+        """Restaurează toate tabelele dintr-o generație de backup"""
+        try:
+            # Salvările în curs nu trebuie să suprascrie datele restaurate
+            self.save_worker.flush()
+            tables = self.backup_store.restore(generation_id)
+
+            for table_name in storage_backend.TABLE_NAMES:
+                if table_name in tables:
+                    self.storage.save_table(table_name, tables[table_name])
+
+            if 'rules' in tables:
+                with open(self.rules_file, 'w') as f:
+                    json.dump(tables['rules'], f, indent=2)
+
+            # Modificările din jurnal sunt anterioare datelor restaurate
+            self.journal.mark_compacted(self.journal.last_seq)
+
+            self.load_all_data()
+            self.populate_production_lines()
+            self.populate_orders()
+            self.calculate_production_metrics()
+            self.update_header_metrics()
+            self.status_text.set(f"🛟 Backup #{generation_id} restored")
+            print(f"🛟 Backup #{generation_id} restaurat")
+
+        except Exception as e:
+            print(f"❌ Eroare la restaurarea backup-ului: {e}")
+            messagebox.showerror("Eroare", f"Eroare la restaurarea backup-ului: {str(e)}")
+
     def calculate_production_metrics(self):
         """Calculează metricile de producție în mod REALIST"""
         try:
@@ -366,10 +1133,7 @@ class ManufacturingScheduler:
                     efficiency_penalty = 0
 
                     # Penalty pentru comenzi întârziate
-                    overdue_orders = len(self.orders_df[
-                        (self.orders_df['DueDate'] < datetime.now()) &
-                        (self.orders_df['Status'] != 'Completed')
-                    ])
+                    overdue_orders = self.due_dates.overdue_count()
                     if overdue_orders > 0:
                         efficiency_penalty += overdue_orders * 0.02  # -2% per comandă întârziată
 
@@ -414,10 +1178,11 @@ class ManufacturingScheduler:
                     on_time_delivery = 100
 
                 # 4. LINE UTILIZATION - Calculat din programări reale (40-85%)
+                changeover_hours = self.changeover_hours(datetime.now(), datetime.now() + timedelta(days=7))
                 if len(active_lines_df) > 0:
                     total_utilization = 0
                     for _, line in active_lines_df.iterrows():
-                        line_util = self.calculate_realistic_line_utilization(line['LineID'])
+                        line_util = self.calculate_realistic_line_utilization(line['LineID'], changeover_hours)
                         total_utilization += line_util
                     line_utilization = total_utilization / len(active_lines_df)
                 else:
@@ -425,12 +1190,20 @@ class ManufacturingScheduler:
 
                 # 5. THROUGHPUT - Capacitate teoretică ajustată cu factori reali
                 # Capacitate teoretică
-                theoretical_throughput = total_capacity * 16  # 16 ore/zi
+                # Capacitate pe oră × orele de lucru medii pe zi (schimburi, fără mentenanță) ale fiecărei linii
+                week_start, week_end = datetime.now(), datetime.now() + timedelta(days=7)
+                theoretical_throughput = sum(
+                    line['Capacity_UnitsPerHour'] * self.shift_calendar.working_hours(line['LineID'], week_start, week_end) / 7
+                    for _, line in active_lines_df.iterrows())
 
                 # Ajustări realiste
                 efficiency_factor = overall_efficiency
                 utilization_factor = line_utilization / 100
-                setup_time_factor = 0.85  # 15% timp pierdut pentru setup
+                # Timp pierdut cu schimbările de fabricație programate (15% estimat fără programări)
+                scheduled_hours = sum(self.schedule_index.busy_hours(line_id, datetime.now(), datetime.now() + timedelta(days=7),
+                                                                     calendar=self.shift_calendar)
+                                      for line_id in active_lines_df['LineID'])
+                setup_time_factor = 1 - changeover_hours.sum() / scheduled_hours if scheduled_hours > 0 else 0.85
                 quality_factor = 0.95     # 5% timp pentru controlul calității
 
                 realistic_throughput = theoretical_throughput * efficiency_factor * utilization_factor * setup_time_factor * quality_factor
@@ -481,14 +1254,25 @@ class ManufacturingScheduler:
                 'line_utilization': 60.0, 'throughput': 2400
             }
 
-    def calculate_realistic_line_utilization(self, line_id):
-        """Calculează utilizarea realistă a unei linii"""
+    def get_line_schedules(self, line_id, start=None, end=None, statuses=None):
+        """Programările unei linii în fereastra [start, end) - din indexul de intervale"""
+        schedule_ids = self.schedule_index.overlapping(line_id, start, end, statuses)
+        return self.schedule_df.loc[[self.schedule_repo.label(key) for key in schedule_ids]]
+
+    def changeover_hours(self, start, end):
+        """Orele de schimbare a fabricației pe linie pentru programările care încep în [start, end)"""
+        if not hasattr(self, 'schedule_df') or self.schedule_df.empty:
+            return pd.Series(dtype='float64')
+        order_types = self.orders_df.set_index('OrderID')['ProductType'].astype(object)
+        return self.setup_model.changeover_hours(self.schedule_df, order_types, start, end)
+
+    def calculate_realistic_line_utilization(self, line_id, changeover_hours=None):
+        """Calculează utilizarea realistă a unei linii (timpul productiv, fără setup și control de calitate)"""
         try:
             if not hasattr(self, 'schedule_df') or self.schedule_df.empty:
                 # Utilizare simulată realistă bazată pe status
-                line_info = self.production_lines_df[self.production_lines_df['LineID'] == line_id]
-                if not line_info.empty:
-                    efficiency = line_info.iloc[0]['Efficiency']
+                efficiency = self.lines_repo.get_value(line_id, 'Efficiency')
+                if efficiency is not None:
                     # Utilizare între 40-80% bazată pe eficiență
                     base_utilization = 40 + (efficiency * 40)
                     # Adaugă variabilitate realistă
@@ -500,37 +1284,33 @@ class ManufacturingScheduler:
             start_date = datetime.now()
             end_date = start_date + timedelta(days=7)
 
-            line_schedules = self.schedule_df[
-                (self.schedule_df['LineID'] == line_id) &
-                (self.schedule_df['StartDateTime'] >= start_date) &
-                (self.schedule_df['EndDateTime'] <= end_date)
-            ]
+            total_scheduled_hours = self.schedule_index.busy_hours(line_id, start_date, end_date,
+                                                                   calendar=self.shift_calendar)
 
-            if line_schedules.empty:
+            if total_scheduled_hours == 0:
                 return random.uniform(35, 55)  # Utilizare mică fără programări
 
-            # Calculează orele programate
-            total_scheduled_hours = 0
-            for _, schedule in line_schedules.iterrows():
-                duration = schedule['EndDateTime'] - schedule['StartDateTime']
-                total_scheduled_hours += duration.total_seconds() / 3600
-
-            # Ore disponibile (7 zile * 16 ore/zi)
-            total_available_hours = 7 * 16
+            # Ore disponibile - orele de lucru ale liniei din calendarul de schimburi, fără ferestrele de mentenanță
+            total_available_hours = self.shift_calendar.working_hours(line_id, start_date, end_date)
+            if total_available_hours <= 0:
+                return 0
 
             # Utilizare cu factori reali
             base_utilization = (total_scheduled_hours / total_available_hours) * 100
 
             # Ajustări pentru factori reali
             if base_utilization > 0:
-                # Setup time penalty
-                setup_penalty = min(5, total_scheduled_hours * 0.1)
-                # Maintenance penalty
-                maintenance_penalty = random.uniform(2, 8)
-                # Quality check penalty
-                quality_penalty = min(3, total_scheduled_hours * 0.05)
-
-                final_utilization = base_utilization - setup_penalty - maintenance_penalty - quality_penalty
+                # Setup time penalty - schimbările de fabricație programate pe linie
+                if changeover_hours is None:
+                    changeover_hours = self.changeover_hours(start_date, end_date)
+                setup_penalty = changeover_hours.get(line_id, 0.0) / total_available_hours * 100
+                # Mentenanța planificată e deja scăzută din orele disponibile (calendarul liniei)
+                # Quality check penalty - controlul de după fiecare programare din fereastră
+                scheduled_count = len(self.schedule_index.starting_in(line_id, start_date, end_date))
+                quality_hours = self.setup_model.quality_check(line_id).total_seconds() / 3600 * scheduled_count
+                quality_penalty = quality_hours / total_available_hours * 100
+
+                final_utilization = base_utilization - setup_penalty - quality_penalty
                 return max(35, min(85, final_utilization))
 
             return random.uniform(35, 55)
@@ -598,10 +1378,7 @@ class ManufacturingScheduler:
         self.trigger_metrics_update("Optimization completed")
 
     def create_main_layout(self):
-        """Creează layout-ul principal pentru manufacturing"""
-        # Header cu metrici producție
-        self.create_header_panel()
-
+        """Creează layout-ul principal pentru manufacturing (header-ul e creat deja la pornire)"""
         # Main container cu tabs
         main_container = tk.Frame(self.root, bg='#1a1a2e')
         main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 10))
@@ -610,21 +1387,45 @@ class ManufacturingScheduler:
         self.notebook = ttk.Notebook(main_container)
         self.notebook.pack(fill=tk.BOTH, expand=True)
 
-        # Tab 1: Production Lines Overview
-        self.create_production_lines_tab()
-
-        # Tab 2: Orders Management
-        self.create_orders_management_tab()
+        # Tab-urile se construiesc la prima selecție (doar cel activ la pornire)
+        self.tab_builders = [
+            ("🏭 Production Lines", self.create_production_lines_tab),
+            ("📋 Orders Management", self.create_orders_management_tab),
+            ("📅 Timeline & Schedule", self.create_timeline_tab),
+            ("🚀 Optimization & Analytics", self.create_optimization_tab)
+        ]
+        self.tab_frames = []
+        self.built_tabs = set()
 
-        # Tab 3: Timeline & Schedule
-        self.create_timeline_tab()
+        for tab_text, _ in self.tab_builders:
+            tab_frame = tk.Frame(self.notebook, bg='#1a1a2e')
+            self.notebook.add(tab_frame, text=tab_text)
+            self.tab_frames.append(tab_frame)
 
-        # Tab 4: Optimization & Analytics
-        self.create_optimization_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.build_tab(0)
 
         # Status bar
         self.create_status_bar()
 
+    def build_tab(self, index):
+        """Construiește conținutul unui tab o singură dată"""
+        if index in self.built_tabs:
+            return
+
+        self.built_tabs.add(index)
+        tab_text, builder = self.tab_builders[index]
+        started = time.perf_counter()
+        builder(self.tab_frames[index])
+        print(f"🧱 Tab construit: {tab_text} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    def on_tab_changed(self, event=None):
+        """Construiește tab-ul selectat la prima afișare"""
+        try:
+            self.build_tab(self.notebook.index(self.notebook.select()))
+        except Exception as e:
+            print(f"❌ Eroare la construirea tab-ului: {e}")
+
     def create_header_panel(self):
         """Creează panoul header cu metrici - UPDATED VERSION"""
         header_frame = tk.Frame(self.root, bg='#1a1a2e', height=120)
@@ -766,10 +1567,8 @@ class ManufacturingScheduler:
             import traceback
             traceback.print_exc()
 
-    def create_production_lines_tab(self):
+    def create_production_lines_tab(self, lines_frame):
         """Creează tab-ul pentru liniile de producție"""
-        lines_frame = tk.Frame(self.notebook, bg='#1a1a2e')
-        self.notebook.add(lines_frame, text="🏭 Production Lines")
 
         # Header pentru linii
         lines_header = tk.Frame(lines_frame, bg='#16213e', height=60)
@@ -824,6 +1623,9 @@ class ManufacturingScheduler:
 
     def populate_production_lines(self):
         """Populează liniile de producție"""
+        if not hasattr(self, 'lines_scrollable_frame'):
+            return  # Tab-ul nu a fost construit încă
+
         try:
             # Clear container
             for widget in self.lines_scrollable_frame.winfo_children():
@@ -897,7 +1699,7 @@ class ManufacturingScheduler:
             (f"👥 {line_data['OperatorCount']} operators", "Staff"),
             (f"🔧 {line_data['SetupTime_Minutes']} min", "Setup Time"),
             (f"✅ {line_data['QualityCheckTime_Minutes']} min", "Quality Check"),
-            (f"🔧 {pd.to_datetime(line_data['MaintenanceScheduled']).strftime('%d/%m')}", "Next Maintenance")
+            (f"🔧 {line_data['MaintenanceScheduled'].strftime('%d/%m')}", "Next Maintenance")
         ]
 
         for i, (value, label) in enumerate(metrics):
@@ -947,10 +1749,8 @@ class ManufacturingScheduler:
                  font=('Segoe UI', 8), bg='#2ed573', fg='white',
                  relief='flat', padx=10, pady=3).pack(side=tk.LEFT, padx=5)
 
-    def create_orders_management_tab(self):
+    def create_orders_management_tab(self, orders_frame):
         """Creează tab-ul pentru managementul comenzilor"""
-        orders_frame = tk.Frame(self.notebook, bg='#1a1a2e')
-        self.notebook.add(orders_frame, text="📋 Orders Management")
 
         # Header
         orders_header = tk.Frame(orders_frame, bg='#16213e', height=60)
@@ -968,6 +1768,10 @@ class ManufacturingScheduler:
                  font=('Segoe UI', 10), bg='#00d4aa', fg='white',
                  relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=5)
 
+        tk.Button(orders_btn_frame, text="📦 Bulk Import", command=self.bulk_import_orders,
+                 font=('Segoe UI', 10), bg='#9b59b6', fg='white',
+                 relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=5)
+
         tk.Button(orders_btn_frame, text="🔍 Filter", command=self.filter_orders,
                  font=('Segoe UI', 10), bg='#0078ff', fg='white',
                  relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=5)
@@ -1009,6 +1813,9 @@ class ManufacturingScheduler:
 
     def populate_orders(self):
         """Populează comenzile în interfață - FIXED pentru ecran gol"""
+        if not hasattr(self, 'orders_scrollable_frame'):
+            return  # Tab-ul nu a fost construit încă
+
         try:
             # Clear container
             for widget in self.orders_scrollable_frame.winfo_children():
@@ -1199,12 +2006,12 @@ class ManufacturingScheduler:
 
         # Grid cu detalii 2x3
         details = [
-            (f"📅 Order: {pd.to_datetime(order_data['OrderDate']).strftime('%d/%m/%Y')}", "Order Date"),
-            (f"⏰ Due: {pd.to_datetime(order_data['DueDate']).strftime('%d/%m/%Y')}", "Due Date"),
+            (f"📅 Order: {order_data['OrderDate'].strftime('%d/%m/%Y')}", "Order Date"),
+            (f"⏰ Due: {order_data['DueDate'].strftime('%d/%m/%Y')}", "Due Date"),
             (f"🎯 Type: {order_data['ProductType']}", "Product Type"),
             (f"⏱️ Est: {order_data['EstimatedHours']:.1f}h", "Estimated Hours"),
             (f"🏭 Line: {order_data['AssignedLine'] if order_data['AssignedLine'] else 'Unassigned'}", "Assigned Line"),
-            (f"🔗 Deps: {'Yes' if order_data['Dependencies'] else 'None'}", "Dependencies")
+            (f"🔗 Deps: {len(self.order_dependencies.prerequisites_of(order_data['OrderID'])) or 'None'}", "Dependencies")
         ]
 
         for i, (value, label) in enumerate(details):
@@ -1258,10 +2065,8 @@ class ManufacturingScheduler:
                      font=('Segoe UI', 8), bg=color, fg='white',
                      relief='flat', padx=8, pady=3).pack(side=tk.LEFT, padx=(0, 5))
 
-    def create_timeline_tab(self):
+    def create_timeline_tab(self, timeline_frame):
         """Creează tab-ul pentru timeline și programare - COMPLETE FIX"""
-        timeline_frame = tk.Frame(self.notebook, bg='#1a1a2e')
-        self.notebook.add(timeline_frame, text="📅 Timeline & Schedule")
 
         # Header timeline
         timeline_header = tk.Frame(timeline_frame, bg='#16213e', height=60)
@@ -1344,6 +2149,9 @@ class ManufacturingScheduler:
 
     def populate_timeline_fixed(self):
         """Populează timeline-ul - VERSION CARE FUNCȚIONEAZĂ 100%"""
+        if not hasattr(self, 'timeline_content'):
+            return  # Tab-ul nu a fost construit încă
+
         try:
             print("📅 FIXED Timeline population starting...")
 
@@ -1474,6 +2282,9 @@ class ManufacturingScheduler:
 
     def populate_timeline_with_today_highlight(self):
         """Populează timeline cu highlight pentru ziua curentă"""
+        if not hasattr(self, 'timeline_content'):
+            return  # Tab-ul nu a fost construit încă
+
         try:
             print("📅 Populating timeline with TODAY highlight...")
 
@@ -1870,8 +2681,8 @@ class ManufacturingScheduler:
 
             self.status_text.set("🔄 Running intelligent auto-scheduler...")
 
-            # 1. Simulare modificări în date
-            changes_made = self.perform_auto_scheduling_logic()
+            # 1. Programează toate comenzile neprogramate într-un singur lot
+            result = self.perform_auto_scheduling_logic()
 
             # 2. FORȚEAZĂ refresh cu noile date
             self.populate_timeline_with_today_highlight()
@@ -1881,124 +2692,82 @@ class ManufacturingScheduler:
             self.update_header_metrics()
 
             # 4. Afișează rezultatele
-            if changes_made > 0:
-                success_message = f"✅ AUTO-SCHEDULE COMPLETED!\n\n" + \
-                                f"📋 {changes_made} orders rescheduled\n" + \
-                                f"🏭 {random.randint(3, 5)} lines optimized\n" + \
-                                f"📈 {random.randint(8, 15)}% efficiency improvement\n" + \
-                                f"⏰ {random.randint(2, 6)} delays resolved"
-
-                messagebox.showinfo("Auto-Schedule Results", success_message)
-                self.status_text.set(f"✅ Auto-schedule completed - {changes_made} changes made")
-            else:
-                messagebox.showinfo("Auto-Schedule",
-                                   "ℹ️ Schedule already optimal!\n\nNo changes were needed.")
-                self.status_text.set("ℹ️ Auto-schedule: No changes needed")
-
-            print(f"✅ Auto-schedule completed with {changes_made} changes")
+            self.show_auto_schedule_result(result)
 
         except Exception as e:
             print(f"❌ Error in auto_schedule_fixed: {e}")
             self.status_text.set("❌ Auto-schedule failed")
 
-    def perform_auto_scheduling_logic(self):
-        """Logica reală de auto-scheduling cu modificări vizibile"""
-        try:
-            changes_made = 0
-
-            # 1. Găsește comenzi neprogramate sau sub-optimizate
-            if not hasattr(self, 'orders_df') or self.orders_df.empty:
-                return 0
-
-            unscheduled_orders = self.orders_df[
-                (self.orders_df['AssignedLine'] == '') |
-                (self.orders_df['AssignedLine'].isna()) |
-                (self.orders_df['Status'] == 'Planned')
-            ]
-
-            # 2. Pentru primele 3 comenzi, asignează-le automat
-            for i, (idx, order) in enumerate(unscheduled_orders.head(3).iterrows()):
-                # Selectează o linie activă random
-                if hasattr(self, 'production_lines_df'):
-                    active_lines = self.production_lines_df[
-                        self.production_lines_df['Status'] == 'Active'
-                    ]
-
-                    if not active_lines.empty:
-                        selected_line = active_lines.sample(1).iloc[0]
-
-                        # Actualizează comanda
-                        self.orders_df.at[idx, 'AssignedLine'] = selected_line['LineID']
-                        self.orders_df.at[idx, 'Status'] = 'Scheduled'
-
-                        # Adaugă programare
-                        self.add_auto_schedule_entry(order, selected_line)
+    def show_auto_schedule_result(self, result):
+        """Raportul motorului de programare (comenzi plasate, întârzieri, utilizare)"""
+        if result is None:
+            messagebox.showerror("Auto-Schedule", "❌ Auto-schedule failed - see console for details.")
+            self.status_text.set("❌ Auto-schedule failed")
+            return
 
-                        changes_made += 1
-                        print(f"   Auto-assigned {order['OrderID']} to {selected_line['LineID']}")
+        scheduled = result.summary['scheduled']
+        if scheduled > 0 or result.unscheduled:
+            message = "✅ AUTO-SCHEDULE COMPLETED!\n\n" + result.report()
+            if result.unscheduled:
+                reasons = list(result.unscheduled.items())[:5]
+                message += "\n\nNot scheduled:\n" + "\n".join(f"• {order_id}: {reason}" for order_id, reason in reasons)
 
-            # 3. Optimizează unele progrese
-            in_progress_orders = self.orders_df[self.orders_df['Status'] == 'In Progress']
-            for idx, order in in_progress_orders.head(2).iterrows():
-                # Crește progresul cu 10-20%
-                progress_increase = random.randint(10, 20)
-                new_progress = min(100, order['Progress'] + progress_increase)
-                self.orders_df.at[idx, 'Progress'] = new_progress
+            messagebox.showinfo("Auto-Schedule Results", message)
+            self.status_text.set(f"✅ Auto-schedule completed - {scheduled} orders scheduled")
+        else:
+            messagebox.showinfo("Auto-Schedule",
+                               "ℹ️ Schedule already optimal!\n\nNo changes were needed.")
+            self.status_text.set("ℹ️ Auto-schedule: No changes needed")
 
-                if new_progress == 100:
-                    self.orders_df.at[idx, 'Status'] = 'Completed'
+        print(f"✅ Auto-schedule completed - {scheduled} scheduled, {len(result.unscheduled)} not scheduled")
 
-                changes_made += 1
-                print(f"   Progressed {order['OrderID']} to {new_progress}%")
+    def perform_auto_scheduling_logic(self):
+        """Programează toate comenzile neprogramate cu motorul de capacitate finită; întoarce ScheduleResult"""
+        try:
+            if not hasattr(self, 'orders_df') or self.orders_df.empty:
+                return None
 
-            return changes_made
+            result = self.create_batch_scheduler().run(self.orders_df, self.schedule_df, self.production_lines_df)
+            if not result.schedule_df.empty:
+                self.apply_schedule_result(result)
+            return result
 
         except Exception as e:
             print(f"❌ Error in auto-scheduling logic: {e}")
-            return 0
+            return None
 
-    def add_auto_schedule_entry(self, order, line):
-        """Adaugă intrare în programare pentru auto-schedule"""
-        try:
-            # Calculează timpul de start și sfârșit
-            start_time = datetime.now() + timedelta(hours=random.randint(1, 24))
-            duration_hours = order['EstimatedHours']
-            end_time = start_time + timedelta(hours=duration_hours)
+    def create_batch_scheduler(self):
+        """Motorul de programare cu regulile curente (priorități, setup, calendar de schimburi)"""
+        rules = getattr(self, 'production_rules', {}).get('production_rules', {})
+        return scheduling_engine.BatchScheduler(
+            self.line_compatibility, self.order_dependencies, self.schedule_index,
+            rules.get('priority_weights'), setup_model=self.setup_model, calendar=self.shift_calendar)
 
-            # Creează intrarea de programare
-            new_schedule = {
-                'ScheduleID': f"AUTO-{int(time.time())}-{random.randint(100, 999)}",
-                'OrderID': order['OrderID'],
-                'LineID': line['LineID'],
-                'StartDateTime': start_time,
-                'EndDateTime': end_time,
-                'Status': 'Scheduled',
-                'ActualStart': '',
-                'ActualEnd': '',
-                'ScheduledBy': 'Auto-Scheduler',
-                'LastModified': datetime.now()
-            }
-
-            # Adaugă în DataFrame
-            if hasattr(self, 'schedule_df'):
-                new_df = pd.DataFrame([new_schedule])
-                self.schedule_df = pd.concat([self.schedule_df, new_df], ignore_index=True)
+    def apply_schedule_result(self, result):
+        """Salvează programările lotului: un bloc de ScheduleID-uri, o inserare, o actualizare a comenzilor"""
+        schedule = result.entries(self.id_allocator.reserve('schedule', len(result.schedule_df)))
 
-            print(f"   Created schedule entry: {new_schedule['ScheduleID']}")
+        self.schedule_repo.insert(schedule)
+        self.orders_repo.update_many(schedule['OrderID'].tolist(),
+                                     {'AssignedLine': schedule['LineID'].tolist(), 'Status': 'Scheduled'})
+        self.save_all_data()
 
-        except Exception as e:
-            print(f"❌ Error adding schedule entry: {e}")
+        print(f"   Auto-scheduled {len(schedule)} orders on {schedule['LineID'].nunique()} lines")
 
     def auto_schedule_fixed(self):
         """Auto-schedule cu refresh forțat"""
         try:
             print("🔄 AUTO-SCHEDULE with forced refresh...")
+            self.status_text.set("🔄 Running intelligent auto-scheduler...")
+
+            result = self.perform_auto_scheduling_logic()
 
             # FORȚEAZĂ refresh timeline cu versiunea funcțională
             self.populate_timeline_fixed()
+            self.calculate_production_metrics()
+            self.update_header_metrics()
 
-            self.status_text.set("✅ Auto-schedule completed")
-            messagebox.showinfo("Auto-Schedule", "Timeline refreshed with visible elements!")
+            self.show_auto_schedule_result(result)
 
         except Exception as e:
             print(f"❌ Error in auto-schedule: {e}")
@@ -2478,18 +3247,14 @@ class ManufacturingScheduler:
                 return []
 
             # Definește intervalul pentru zi
-            day_start = date
-            day_end = date + timedelta(days=1)
-
-            # Filtrează programările
-            line_schedules = self.schedule_df[
-                (self.schedule_df['LineID'] == line_id) &
-                (pd.to_datetime(self.schedule_df['StartDateTime']).dt.date >= day_start.date()) &
-                (pd.to_datetime(self.schedule_df['StartDateTime']).dt.date < day_end.date()) &
-                (self.schedule_df['Status'].isin(['Scheduled', 'In Progress']))
-            ]
+            day_start = pd.Timestamp(date).normalize()
+            day_end = day_start + timedelta(days=1)
 
-            return line_schedules.to_dict('records')
+            # Programările care încep în ziua respectivă (căutare în indexul liniei)
+            schedule_ids = self.schedule_index.starting_in(line_id, day_start, day_end,
+                                                           schedule_index.ACTIVE_STATUSES)
+
+            return [self.schedule_repo.get(key).to_dict() for key in schedule_ids]
 
         except Exception as e:
             print(f"❌ Error getting scheduled orders: {e}")
@@ -2502,13 +3267,10 @@ class ManufacturingScheduler:
             if not hasattr(self, 'orders_df') or self.orders_df.empty:
                 return
 
-            order_matches = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
-
-            if order_matches.empty:
+            order_data = self.orders_repo.get(schedule_data['OrderID'])
+            if order_data is None:
                 return
 
-            order_data = order_matches.iloc[0]
-
             # Frame pentru task
             task_frame = tk.Frame(parent, bg='#0078ff', relief='raised', bd=1)
             task_frame.pack(fill=tk.X, padx=2, pady=2)
@@ -2562,10 +3324,8 @@ class ManufacturingScheduler:
         """Afișează detaliile unui task din timeline"""
         try:
             # Găsește comanda
-            order_matches = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
-
-            if not order_matches.empty:
-                order_data = order_matches.iloc[0]
+            order_data = self.orders_repo.get(schedule_data['OrderID'])
+            if order_data is not None:
                 self.show_order_details(order_data)
 
             self.status_text.set(f"Selected: {schedule_data['OrderID']} on {schedule_data['LineID']}")
@@ -2668,14 +3428,14 @@ class ManufacturingScheduler:
     def schedule_order_on_line(self, order_data, line_id, target_date, scheduler_window):
         """Programează o comandă pe o linie"""
         try:
-            # Calculează timpul de start și sfârșit
-            start_time = target_date.replace(hour=8, minute=0)  # Începe la 8:00
-            duration_hours = order_data['EstimatedHours']
-            end_time = start_time + timedelta(hours=duration_hours)
+            # Primul moment liber de lucru al liniei din ziua aleasă (nu în trecut), durata în ore de lucru
+            after = max(target_date.replace(hour=0, minute=0, second=0, microsecond=0), datetime.now())
+            start_time, end_time = self.find_line_slot(line_id, order_data['ProductType'],
+                                                       order_data['EstimatedHours'], after)
 
             # Creează intrarea de programare
             new_schedule = {
-                'ScheduleID': f"SCH-{int(time.time())}-{random.randint(100, 999)}",
+                'ScheduleID': self.id_allocator.next_id('schedule'),
                 'OrderID': order_data['OrderID'],
                 'LineID': line_id,
                 'StartDateTime': start_time,
@@ -2687,20 +3447,16 @@ class ManufacturingScheduler:
                 'LastModified': datetime.now()
             }
 
-            # Adaugă în DataFrame
-            new_df = pd.DataFrame([new_schedule])
-            if hasattr(self, 'schedule_df'):
-                self.schedule_df = pd.concat([self.schedule_df, new_df], ignore_index=True)
-            else:
-                self.schedule_df = new_df
+            # Adaugă în buffer-ul de programări (exportat în DataFrame la prima citire)
+            self.schedule_store.append(new_schedule)
 
             # Actualizează comanda
-            order_idx = self.orders_df[self.orders_df['OrderID'] == order_data['OrderID']].index[0]
-            self.orders_df.at[order_idx, 'AssignedLine'] = line_id
-            self.orders_df.at[order_idx, 'Status'] = 'Scheduled'
+            updated_order = self.orders_repo.update(order_data['OrderID'],
+                                                    {'AssignedLine': line_id, 'Status': 'Scheduled'})
 
-            # Salvează datele
-            self.save_all_data()
+            # Salvează doar rândurile modificate
+            self.record_change('schedule', 'upsert', new_schedule)
+            self.record_change('orders', 'upsert', updated_order)
 
             # Refreshează interfața
             self.populate_timeline()
@@ -2726,13 +3482,10 @@ class ManufacturingScheduler:
         """Creează o sarcină în timeline"""
         try:
             # Găsește comanda asociată
-            order = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
-
-            if order.empty:
+            order_data = self.orders_repo.get(schedule_data['OrderID'])
+            if order_data is None:
                 return
 
-            order_data = order.iloc[0]
-
             # Task frame
             task_frame = tk.Frame(parent, bg='#0078ff', relief='raised', bd=1)
             task_frame.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
@@ -2764,10 +3517,8 @@ class ManufacturingScheduler:
         except Exception as e:
             print(f"❌ Eroare la crearea task timeline: {e}")
 
-    def create_optimization_tab(self):
+    def create_optimization_tab(self, opt_frame):
         """Creează tab-ul pentru optimizare și analitics"""
-        opt_frame = tk.Frame(self.notebook, bg='#1a1a2e')
-        self.notebook.add(opt_frame, text="🚀 Optimization & Analytics")
 
         # Header optimizare
         opt_header = tk.Frame(opt_frame, bg='#16213e', height=60)
@@ -2917,6 +3668,24 @@ class ManufacturingScheduler:
                     font=('Segoe UI', 8),
                     fg='#b0b0b0', bg='#16213e').pack(anchor='w', padx=20)
 
+        # Secțiunea date (Excel doar pentru import/export)
+        data_frame = tk.LabelFrame(parent, text="💾 Data Storage",
+                                 bg='#16213e', fg='#00d4aa',
+                                 font=('Segoe UI', 12, 'bold'), bd=2)
+        data_frame.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Button(data_frame, text="📤 Export Excel", command=self.export_data_to_excel,
+                 font=('Segoe UI', 10), bg='#0078ff', fg='white',
+                 relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=10, pady=10)
+
+        tk.Button(data_frame, text="📥 Import Excel", command=self.import_data_from_excel,
+                 font=('Segoe UI', 10), bg='#ffa502', fg='white',
+                 relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=5, pady=10)
+
+        tk.Button(data_frame, text="🛟 Backups", command=self.show_backup_generations,
+                 font=('Segoe UI', 10), bg='#9b59b6', fg='white',
+                 relief='flat', padx=15, pady=5).pack(side=tk.LEFT, padx=5, pady=10)
+
         # Buton optimizare mare
         optimize_btn = tk.Button(parent, text="🚀 RUN OPTIMIZATION",
                                command=self.run_full_optimization,
@@ -2962,6 +3731,9 @@ class ManufacturingScheduler:
 
     def populate_analytics(self):
         """Populează zona de analytics"""
+        if not hasattr(self, 'analytics_scrollable'):
+            return  # Tab-ul nu a fost construit încă
+
         try:
             # Clear container
             for widget in self.analytics_scrollable.winfo_children():
@@ -3079,7 +3851,7 @@ class ManufacturingScheduler:
                 'Completed': len(self.orders_df[self.orders_df['Progress'] == 100]),
                 'In Progress': len(self.orders_df[(self.orders_df['Progress'] > 0) & (self.orders_df['Progress'] < 100)]),
                 'Not Started': len(self.orders_df[self.orders_df['Progress'] == 0]),
-                'Overdue': len(self.orders_df[self.orders_df['DueDate'] < datetime.now()])
+                'Overdue': self.due_dates.overdue_count(open_only=False)
             }
 
             stats_grid = tk.Frame(progress_frame, bg='#16213e')
@@ -3156,9 +3928,18 @@ class ManufacturingScheduler:
                 font=('Segoe UI', 9),
                 fg='#00d4aa', bg='#16213e').pack(side=tk.RIGHT, padx=10, pady=5)
 
+        # Indicator salvare (dirty state)
+        self.save_state_text = tk.StringVar(value="💾 All changes saved")
+        tk.Label(self.status_bar, textvariable=self.save_state_text,
+                font=('Segoe UI', 9),
+                fg='#ffa502', bg='#16213e').pack(side=tk.RIGHT, padx=10, pady=5)
+
         # Update clock
         self.update_clock()
 
+        # Rezultatele salvărilor din fundal
+        self.poll_save_results()
+
     def update_clock(self):
         """Actualizează ceasul"""
         try:
@@ -3231,23 +4012,16 @@ class ManufacturingScheduler:
             start_date = datetime.now()
             end_date = start_date + timedelta(days=7)
 
-            line_schedules = self.schedule_df[
-                (self.schedule_df['LineID'] == line_id) &
-                (self.schedule_df['StartDateTime'] >= start_date) &
-                (self.schedule_df['EndDateTime'] <= end_date)
-            ]
+            total_scheduled_hours = self.schedule_index.busy_hours(line_id, start_date, end_date,
+                                                                   calendar=self.shift_calendar)
 
-            if line_schedules.empty:
+            if total_scheduled_hours == 0:
                 return random.uniform(20, 40)  # Utilizare mică dacă nu sunt programări
 
-            # Calculează totalul orelor programate
-            total_scheduled_hours = 0
-            for _, schedule in line_schedules.iterrows():
-                duration = schedule['EndDateTime'] - schedule['StartDateTime']
-                total_scheduled_hours += duration.total_seconds() / 3600
-
-            # Totalul orelor disponibile (7 zile * 16 ore/zi)
-            total_available_hours = 7 * 16
+            # Totalul orelor disponibile - orele de lucru ale liniei din calendarul de schimburi
+            total_available_hours = self.shift_calendar.working_hours(line_id, start_date, end_date)
+            if total_available_hours <= 0:
+                return 0
 
             utilization = (total_scheduled_hours / total_available_hours) * 100
             return min(100, max(0, utilization))
@@ -3568,11 +4342,10 @@ class ManufacturingScheduler:
                     }
 
                     # Adaugă în DataFrame
-                    new_df = pd.DataFrame([new_line])
-                    self.production_lines_df = pd.concat([self.production_lines_df, new_df], ignore_index=True)
+                    self.lines_repo.insert([new_line])
 
                     # Salvează și refresh
-                    self.save_all_data()
+                    self.record_change('production_lines', 'upsert', new_line)
                     self.populate_production_lines()
                     self.calculate_production_metrics()
                     self.update_header_metrics()
@@ -3631,17 +4404,8 @@ class ManufacturingScheduler:
             print(f"❌ Form scroll test failed: {e}")
 
     def generate_line_id(self):
-        """Generează un ID unic pentru linia de producție"""
-        existing_ids = set(self.production_lines_df['LineID'].tolist())
-
-        for dept in ['A', 'B', 'C', 'D']:
-            for num in range(1, 100):
-                new_id = f"LINE-{dept}{num:02d}"
-                if new_id not in existing_ids:
-                    return new_id
-
-        import time
-        return f"LINE-{int(time.time() % 10000)}"
+        """Următorul ID de linie din secvența persistentă (rezervat la salvare)"""
+        return self.id_allocator.peek('production_lines')
 
     def refresh_production_lines(self):
         """Refresh liniile de producție"""
@@ -3691,7 +4455,7 @@ class ManufacturingScheduler:
 🔧 Setup Time: {line_data['SetupTime_Minutes']} minutes
 ✅ Quality Check: {line_data['QualityCheckTime_Minutes']} minutes
 🎯 Product Types: {line_data['ProductTypes']}
-🔧 Next Maintenance: {line_data['MaintenanceScheduled']}
+🔧 Next Maintenance: {str(line_data['MaintenanceScheduled'])[:10]}
             """
 
             tk.Label(info_frame, text=info_text,
@@ -3759,7 +4523,9 @@ class ManufacturingScheduler:
                 'setup_time': tk.IntVar(value=line_data['SetupTime_Minutes']),
                 'quality_time': tk.IntVar(value=line_data['QualityCheckTime_Minutes']),
                 'product_types': tk.StringVar(value=line_data['ProductTypes']),
-                'status': tk.StringVar(value=line_data['Status'])
+                'status': tk.StringVar(value=line_data['Status']),
+                'maintenance': tk.StringVar(value=maintenance_windows.format_windows(
+                    self.maintenance.for_line(line_data['LineID'])))
             }
 
             # Câmpuri editabile
@@ -3772,7 +4538,8 @@ class ManufacturingScheduler:
                 ("🔧 Setup Time:", form_vars['setup_time'], "scale_small"),
                 ("✅ Quality Check:", form_vars['quality_time'], "scale_small"),
                 ("🎯 Product Types:", form_vars['product_types'], "entry"),
-                ("🔄 Status:", form_vars['status'], "combo_status")
+                ("🔄 Status:", form_vars['status'], "combo_status"),
+                ("🔧 Maintenance Windows (date or start..end; separated by ';'):", form_vars['maintenance'], "entry")
             ]
 
             for label_text, var, field_type in fields:
@@ -3806,20 +4573,36 @@ class ManufacturingScheduler:
 
             def save_changes():
                 try:
+                    # Ferestrele de mentenanță - doar dacă au fost modificate (repară programările liniei)
+                    changes = {}
+                    windows = maintenance_windows.parse_windows(form_vars['maintenance'].get())
+                    if windows != self.maintenance.for_line(line_data['LineID']):
+                        self.maintenance.set_windows(line_data['LineID'], windows)
+                        if windows:
+                            changes['MaintenanceScheduled'] = next(
+                                (start for start, end in windows if end > datetime.now()), windows[-1][0])
+
                     # Update în DataFrame
-                    idx = self.production_lines_df[self.production_lines_df['LineID'] == line_data['LineID']].index[0]
-
-                    self.production_lines_df.at[idx, 'LineName'] = form_vars['line_name'].get()
-                    self.production_lines_df.at[idx, 'Department'] = form_vars['department'].get()
-                    self.production_lines_df.at[idx, 'Capacity_UnitsPerHour'] = form_vars['capacity'].get()
-                    self.production_lines_df.at[idx, 'Efficiency'] = form_vars['efficiency'].get()
-                    self.production_lines_df.at[idx, 'OperatorCount'] = form_vars['operators'].get()
-                    self.production_lines_df.at[idx, 'SetupTime_Minutes'] = form_vars['setup_time'].get()
-                    self.production_lines_df.at[idx, 'QualityCheckTime_Minutes'] = form_vars['quality_time'].get()
-                    self.production_lines_df.at[idx, 'ProductTypes'] = form_vars['product_types'].get()
-                    self.production_lines_df.at[idx, 'Status'] = form_vars['status'].get()
-
-                    self.save_all_data()
+                    updated_line = self.lines_repo.update(line_data['LineID'], {
+                        'LineName': form_vars['line_name'].get(),
+                        'Department': form_vars['department'].get(),
+                        'Capacity_UnitsPerHour': form_vars['capacity'].get(),
+                        'Efficiency': form_vars['efficiency'].get(),
+                        'OperatorCount': form_vars['operators'].get(),
+                        'SetupTime_Minutes': form_vars['setup_time'].get(),
+                        'QualityCheckTime_Minutes': form_vars['quality_time'].get(),
+                        'ProductTypes': form_vars['product_types'].get(),
+                        'Status': form_vars['status'].get(),
+                        **changes
+                    })
+
+                    self.record_change('production_lines', 'upsert', updated_line)
+
+                    # Linia scoasă din producție - programările ei viitoare se mută pe alte linii
+                    if line_data['Status'] == 'Active' and updated_line['Status'] != 'Active':
+                        self.on_schedule_repaired(self.schedule_repairer.line_down(line_data['LineID']),
+                                                  f"Line {line_data['LineID']} down")
+
                     self.populate_production_lines()
                     self.calculate_production_metrics()
                     self.update_header_metrics()
@@ -4170,11 +4953,11 @@ class ManufacturingScheduler:
                     }
 
                     # Adaugă în DataFrame
-                    new_df = pd.DataFrame([new_order])
-                    self.orders_df = pd.concat([self.orders_df, new_df], ignore_index=True)
+                    self.orders_repo.insert([new_order])
 
-                    # Salvează și refresh
-                    self.save_all_data()
+                    # Salvează, programează comanda nouă și refresh
+                    self.record_change('orders', 'upsert', new_order)
+                    self.schedule_new_orders(pd.DataFrame([new_order]))
                     self.populate_orders()
                     self.calculate_production_metrics()
                     self.update_header_metrics()
@@ -4194,8 +4977,8 @@ class ManufacturingScheduler:
     📅 Due Date: {new_order['DueDate']}
     ⏱️ Estimated: {new_order['EstimatedHours']} hours
 
-    📋 Status: {new_order['Status']}
-    🔄 Ready for scheduling!"""
+    📋 Status: {self.orders_repo.get_value(new_order['OrderID'], 'Status')}
+    🏭 Line: {self.orders_repo.get_value(new_order['OrderID'], 'AssignedLine') or 'not scheduled yet'}"""
 
                     messagebox.showinfo("Order Created!", success_msg)
                     self.status_text.set(f"✅ Created order: {new_order['OrderID']}")
@@ -4222,6 +5005,47 @@ class ManufacturingScheduler:
             print(f"❌ Error creating new order form: {e}")
             messagebox.showerror("Error", f"Failed to open new order form: {str(e)}")
 
+    def bulk_import_orders(self):
+        """Import în bloc al comenzilor dintr-un export ERP (CSV sau xlsx)"""
+        try:
+            from tkinter import filedialog
+            import bulk_import
+
+            path = filedialog.askopenfilename(
+                title="Bulk Import Orders",
+                filetypes=[("CSV / Excel files", "*.csv *.xlsx"), ("All files", "*.*")])
+            if not path:
+                return
+
+            self.status_text.set("📦 Importing orders...")
+            self.root.update_idletasks()
+
+            importer = bulk_import.BulkOrderImporter(self.orders_df['OrderID'], id_allocator=self.id_allocator)
+            result = importer.run(path)
+            report_path = importer.write_rejected_report(result, path)
+
+            if not result.accepted_df.empty:
+                # Un singur append, o singură salvare și un singur refresh pentru tot lotul
+                self.orders_repo.insert(result.accepted_df)
+                self.schedule_new_orders(result.accepted_df, record=False)
+                self.save_all_data()
+                self.populate_orders()
+                self.calculate_production_metrics()
+                self.update_header_metrics()
+
+            print(f"📦 Bulk import: {len(result.accepted_df)} acceptate, {len(result.rejected_df)} respinse "
+                  f"în {result.elapsed:.2f}s")
+
+            message = result.summary()
+            if report_path:
+                message += f"\n\n📄 Rejected rows report:\n{report_path}"
+            messagebox.showinfo("Bulk Import", message)
+            self.status_text.set(f"📦 Imported {len(result.accepted_df):,} orders")
+
+        except Exception as e:
+            print(f"❌ Eroare la importul în bloc: {e}")
+            messagebox.showerror("Eroare", f"Eroare la importul comenzilor: {str(e)}")
+
     # BONUS: Funcție pentru validarea avansată a datelor
     def validate_order_data(self, form_vars):
         """Validare avansată pentru datele comenzii"""
@@ -4261,17 +5085,12 @@ class ManufacturingScheduler:
     def setup_customer_autocomplete(self, customer_entry):
         """Setup auto-completare pentru câmpul customer"""
         try:
-            # Obține lista de clienți existenți
-            existing_customers = self.orders_df['CustomerName'].unique().tolist()
-
-            # Aici ai putea implementa autocomplete cu o librărie
-            # Pentru moment, doar tooltip cu sugestii
-            tooltip_text = "Existing customers:\n" + "\n".join(existing_customers[:5])
-
             def show_customers(event):
+                # Clienții care încep cu textul introdus, din dimensiunea de clienți
+                existing_customers = self.customers.complete(customer_entry.get())
                 if existing_customers:
                     messagebox.showinfo("Existing Customers",
-                                       f"Recent customers:\n\n" + "\n".join(existing_customers[:10]))
+                                       f"Matching customers:\n\n" + "\n".join(existing_customers))
 
             customer_entry.bind("<Double-Button-1>", show_customers)
 
@@ -4279,17 +5098,8 @@ class ManufacturingScheduler:
             print(f"❌ Error setting up autocomplete: {e}")
 
     def generate_order_id(self):
-        """Generează un ID unic pentru comandă"""
-        year = datetime.now().year
-        existing_ids = set(self.orders_df['OrderID'].tolist())
-
-        for num in range(1, 10000):
-            new_id = f"ORD-{year}-{num:03d}"
-            if new_id not in existing_ids:
-                return new_id
-
-        import time
-        return f"ORD-{year}-{int(time.time() % 10000)}"
+        """Următorul ID de comandă din secvența anului curent (rezervat la salvare)"""
+        return self.id_allocator.peek('orders')
 
     def filter_orders(self):
         """Afișează form-ul de filtrare comenzi"""
@@ -4304,7 +5114,9 @@ class ManufacturingScheduler:
                 parent=self.root,
                 orders_df=self.orders_df if hasattr(self, 'orders_df') else pd.DataFrame(),
                 production_lines_df=self.production_lines_df if hasattr(self, 'production_lines_df') else pd.DataFrame(),
-                on_filter_applied=self.apply_orders_filter  # Callback pentru aplicarea filtrului
+                on_filter_applied=self.apply_orders_filter,  # Callback pentru aplicarea filtrului
+                search_index=self.order_search if hasattr(self, 'orders_df') else None,
+                due_index=self.due_dates if hasattr(self, 'orders_df') else None
             )
 
             self.status_text.set("🔍 Orders Filter opened")
@@ -4330,7 +5142,10 @@ class ManufacturingScheduler:
                 orders_df=self.orders_df if hasattr(self, 'orders_df') else pd.DataFrame(),
                 production_lines_df=self.production_lines_df if hasattr(self, 'production_lines_df') else pd.DataFrame(),
                 schedule_df=self.schedule_df if hasattr(self, 'schedule_df') else pd.DataFrame(),
-                production_metrics=self.production_metrics if hasattr(self, 'production_metrics') else {}
+                production_metrics=self.production_metrics if hasattr(self, 'production_metrics') else {},
+                due_index=self.due_dates if hasattr(self, 'orders_df') else None,
+                customers=self.customers if hasattr(self, 'orders_df') else None,
+                products=self.products if hasattr(self, 'orders_df') else None
             )
 
             self.status_text.set("📊 Orders Analytics opened")
@@ -4482,9 +5297,9 @@ class ManufacturingScheduler:
                     'Customer': order_data['CustomerName']
                 }),
                 ("📅 Timeline", {
-                    'Order Date': pd.to_datetime(order_data['OrderDate']).strftime('%d/%m/%Y'),
-                    'Due Date': pd.to_datetime(order_data['DueDate']).strftime('%d/%m/%Y'),
-                    'Days Until Due': str((pd.to_datetime(order_data['DueDate']) - datetime.now()).days),
+                    'Order Date': order_data['OrderDate'].strftime('%d/%m/%Y'),
+                    'Due Date': order_data['DueDate'].strftime('%d/%m/%Y'),
+                    'Days Until Due': str((order_data['DueDate'] - datetime.now()).days),
                     'Estimated Hours': f"{order_data['EstimatedHours']} hours"
                 }),
                 ("🔄 Production Status", {
@@ -4601,12 +5416,12 @@ class ManufacturingScheduler:
             def save_progress():
                 try:
                     # Update în DataFrame
-                    idx = self.orders_df[self.orders_df['OrderID'] == order_data['OrderID']].index[0]
+                    updated_order = self.orders_repo.update(order_data['OrderID'], {
+                        'Progress': progress_var.get(),
+                        'Status': status_var.get()
+                    })
 
-                    self.orders_df.at[idx, 'Progress'] = progress_var.get()
-                    self.orders_df.at[idx, 'Status'] = status_var.get()
-
-                    self.save_all_data()
+                    self.record_change('orders', 'upsert', updated_order)
                     self.populate_orders()
                     self.calculate_production_metrics()
                     self.update_header_metrics()
@@ -4659,7 +5474,8 @@ class ManufacturingScheduler:
                 parent=self.root,
                 production_lines_df=self.production_lines_df if hasattr(self, 'production_lines_df') else pd.DataFrame(),
                 orders_df=self.orders_df if hasattr(self, 'orders_df') else pd.DataFrame(),
-                schedule_df=self.schedule_df if hasattr(self, 'schedule_df') else pd.DataFrame()
+                schedule_df=self.schedule_df if hasattr(self, 'schedule_df') else pd.DataFrame(),
+                orders_repository=self.orders_repo
             )
 
             self.status_text.set("📊 Gantt View opened")
@@ -4706,41 +5522,21 @@ class ManufacturingScheduler:
             print("🔄 AUTO-SCHEDULE starting...")
             self.status_text.set("🔄 Running auto-scheduler...")
 
-            # Auto-schedule logic (simplificat pentru test)
-            unscheduled_orders = self.orders_df[
-                (self.orders_df['AssignedLine'] == '') |
-                (self.orders_df['AssignedLine'].isna())
-            ]
-
-            scheduled_count = min(3, len(unscheduled_orders))  # Max 3 pentru test
-
-            print(f"   Found {len(unscheduled_orders)} unscheduled orders")
-            print(f"   Will schedule {scheduled_count} orders")
+            result = self.perform_auto_scheduling_logic()
 
             # FORȚEAZĂ refresh timeline după scheduling
             self.populate_timeline()
 
-            self.status_text.set(f"✅ Auto-scheduled {scheduled_count} orders")
-            messagebox.showinfo("Auto-Schedule", f"Successfully scheduled {scheduled_count} orders!\nTimeline refreshed.")
+            self.show_auto_schedule_result(result)
 
         except Exception as e:
             print(f"❌ Error in auto-schedule: {e}")
             self.status_text.set("❌ Auto-schedule failed")
 
     def find_compatible_lines(self, product_type):
-        """Găsește liniile compatibile cu un tip de produs"""
+        """Găsește liniile active compatibile cu un tip de produs (din matricea precompilată)"""
         try:
-            compatible_lines = []
-
-            for _, line in self.production_lines_df.iterrows():
-                if line['Status'] == 'Active':
-                    line_products = line['ProductTypes'].split(',')
-                    line_products = [p.strip() for p in line_products]
-
-                    if product_type in line_products or 'All' in line_products:
-                        compatible_lines.append(line.to_dict())
-
-            return compatible_lines
+            return self.line_compatibility.compatible_lines(product_type)
 
         except Exception as e:
             print(f"❌ Error finding compatible lines: {e}")
@@ -4774,16 +5570,12 @@ class ManufacturingScheduler:
     def create_schedule_entry(self, order, line):
         """Creează o intrare în programare"""
         try:
-            # Calculează timpul de start (următoarea dată liberă pentru linia)
-            start_time = self.find_next_available_slot(line['LineID'])
-
-            # Calculează durata
-            duration_hours = order['EstimatedHours']
-            end_time = start_time + timedelta(hours=duration_hours)
+            # Primul gol al liniei în timpul de lucru (schimburi), cu setup și control de calitate
+            start_time, end_time = self.find_line_slot(line['LineID'], order['ProductType'], order['EstimatedHours'])
 
             # Creează intrarea de programare
             new_schedule = {
-                'ScheduleID': f"SCH-{int(time.time())}-{random.randint(100, 999)}",
+                'ScheduleID': self.id_allocator.next_id('schedule'),
                 'OrderID': order['OrderID'],
                 'LineID': line['LineID'],
                 'StartDateTime': start_time,
@@ -4795,41 +5587,39 @@ class ManufacturingScheduler:
                 'LastModified': datetime.now()
             }
 
-            new_df = pd.DataFrame([new_schedule])
-            self.schedule_df = pd.concat([self.schedule_df, new_df], ignore_index=True)
+            self.schedule_store.append(new_schedule)
 
         except Exception as e:
             print(f"❌ Error creating schedule entry: {e}")
 
-    def find_next_available_slot(self, line_id):
-        """Găsește următorul slot disponibil pentru o linie"""
+    def find_next_available_slot(self, line_id, duration=timedelta(0)):
+        """Găsește primul slot liber de cel puțin `duration` timp de lucru pentru o linie, începând de acum"""
         try:
-            # Obține programările existente pentru această linie
-            line_schedules = self.schedule_df[
-                (self.schedule_df['LineID'] == line_id) &
-                (self.schedule_df['Status'].isin(['Scheduled', 'In Progress']))
-            ].sort_values('StartDateTime')
-
-            # Începe de la ora curentă
-            current_time = datetime.now()
-
-            # Dacă nu sunt programări, întoarce ora curentă
-            if line_schedules.empty:
-                return current_time
-
-            # Găsește primul gap disponibil
-            for _, schedule in line_schedules.iterrows():
-                if current_time < schedule['StartDateTime']:
-                    return current_time
-                else:
-                    current_time = max(current_time, schedule['EndDateTime'])
-
-            return current_time
+            start, _ = self.shift_calendar.fit(self.schedule_index, line_id, datetime.now(), duration)
+            return start.to_pydatetime()
 
         except Exception as e:
             print(f"❌ Error finding available slot: {e}")
             return datetime.now()
 
+    def find_line_slot(self, line_id, product_type, estimated_hours, after=None):
+        """(start, sfârșit) pentru o comandă pe linie: primul gol ≥ after în timpul de lucru, incluzând
+        schimbarea de fabricație față de programarea anterioară și controlul de calitate"""
+        after = after or datetime.now()
+        work = timedelta(hours=float(estimated_hours)) + self.setup_model.quality_check(line_id)
+        start, _ = self.shift_calendar.fit(self.schedule_index, line_id, after, work)
+
+        previous_id = self.schedule_index.preceding(line_id, start)
+        previous_order = None
+        if previous_id is not None:
+            previous_order = self.schedule_repo.get_value(previous_id, 'OrderID',
+                                                          self.schedule_store.get_value(previous_id, 'OrderID'))
+        previous_type = self.orders_repo.get_value(previous_order, 'ProductType') if previous_order is not None else None
+        work += self.setup_model.changeover(line_id, previous_type, product_type)
+
+        start, end = self.shift_calendar.fit(self.schedule_index, line_id, start, work)
+        return start.to_pydatetime(), end.to_pydatetime()
+
     # Funcții pentru optimizare
     def run_optimization(self):
         """Rulează optimizarea cu logica corectă de baseline"""
@@ -5048,7 +5838,7 @@ class ManufacturingScheduler:
                     base_efficiency = 0.75  # Eficiență de bază pentru linii
                     new_line_efficiency = base_efficiency * efficiency_multiplier
                     new_line_efficiency = min(new_line_efficiency, 0.98)
-                    self.production_lines_df.at[idx, 'Efficiency'] = new_line_efficiency
+                    data_schema.set_value(self.production_lines_df, idx, 'Efficiency', new_line_efficiency)
 
         except Exception as e:
             print(f"❌ Error applying improvements: {e}")
@@ -5075,7 +5865,7 @@ class ManufacturingScheduler:
             # Resetează și liniile la eficiența de bază
             if hasattr(self, 'production_lines_df'):
                 for idx in self.production_lines_df.index:
-                    self.production_lines_df.at[idx, 'Efficiency'] = 0.75  # Eficiență de bază
+                    data_schema.set_value(self.production_lines_df, idx, 'Efficiency', 0.75)  # Eficiență de bază
 
             print("✅ Reset to baseline completed")
 
@@ -5306,6 +6096,7 @@ class ManufacturingScheduler:
                 orders_df=self.orders_df if hasattr(self, 'orders_df') else pd.DataFrame(),
                 schedule_df=self.schedule_df if hasattr(self, 'schedule_df') else pd.DataFrame(),
                 baseline_metrics=self.baseline_metrics if hasattr(self, 'baseline_metrics') else {},
+                history_loader=self.get_schedule_history,
                 optimization_vars=self.optimization_vars if hasattr(self, 'optimization_vars') else {
                     'minimize_delays': tk.DoubleVar(value=0.4),
                     'maximize_efficiency': tk.DoubleVar(value=0.3),
@@ -5415,13 +6206,10 @@ class ManufacturingScheduler:
 
             # Verifică comenzile cu întârziere
             if hasattr(self, 'orders_df'):
-                overdue = self.orders_df[
-                    (self.orders_df['DueDate'] < datetime.now()) &
-                    (self.orders_df['Status'] != 'Completed')
-                ]
+                overdue_count = self.due_dates.overdue_count()
 
-                if len(overdue) > 0:
-                    issues.append(f"{len(overdue)} overdue orders detected")
+                if overdue_count > 0:
+                    issues.append(f"{overdue_count} overdue orders detected")
 
             return issues
 
@@ -5452,6 +6240,7 @@ if __name__ == "__main__":
     print("🏭 Manufacturing Production Scheduler - Starting...")
 
     root = tk.Tk()
+    STARTUP.mark("Tk root")
     app = ManufacturingScheduler(root)
 
     print("✅ Manufacturing Scheduler ready!")
@@ -5467,6 +6256,8 @@ if __name__ == "__main__":
     try:
         root.mainloop()
     except KeyboardInterrupt:
+        if hasattr(app, 'save_worker'):
+            app.save_worker.stop()
         print("\n👋 Manufacturing Scheduler stopped by user")
     except Exception as e:
         print(f"❌ Fatal error: {e}")
@@ -819,7 +819,7 @@ class AnalyticsDashboard:
 
 🔧 Maintenance:
 • Status: {line_data['Status']}
-• Next Maintenance: {line_data['MaintenanceScheduled']}
+• Next Maintenance: {str(line_data['MaintenanceScheduled'])[:10]}
 
 📈 Recommendations:
 • {self.generate_line_recommendations(line_data)}
@@ -0,0 +1,133 @@
+"""
+🛟 Backup Store
+Content-addressed, compressed backup generations with a retention policy.
+Unchanged tables are never written twice; any generation can be restored.
+"""
+
+import os
+import gzip
+import json
+import pickle
+import hashlib
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+
+def content_hash(value):
+    """Hash stabil pentru conținutul unui tabel (DataFrame) sau al unei configurații (dict)"""
+    digest = hashlib.blake2b(digest_size=16)
+
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(c) for c in value.columns]).encode('utf-8'))
+        digest.update(json.dumps([str(t) for t in value.dtypes]).encode('utf-8'))
+        # Hash vectorizat pe rânduri - fără serializarea tabelului
+        digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class BackupStore:
+    def __init__(self, backup_dir, generations=10, compress_level=6):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.index_path = os.path.join(backup_dir, 'generations.json')
+        self.max_generations = generations      # Câte generații sunt păstrate
+        self.compress_level = compress_level
+        self.lock = threading.Lock()
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.generations = self._read_index()
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.generations, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, object_hash):
+        return os.path.join(self.objects_dir, object_hash[:2], f"{object_hash}.pkl.gz")
+
+    def _write_object(self, object_hash, value):
+        """Scrie un obiect comprimat doar dacă nu există deja (deduplicare)"""
+        path = self._object_path(object_hash)
+        if os.path.exists(path):
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=self.compress_level) as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+
+    def create_generation(self, tables):
+        """Salvează o generație nouă; întoarce None dacă nimic nu s-a schimbat"""
+        with self.lock:
+            hashes = {name: content_hash(value) for name, value in tables.items()}
+
+            # Tabelele lipsă din snapshot (salvări parțiale) moștenesc generația anterioară
+            if self.generations:
+                merged = dict(self.generations[-1]['tables'])
+                merged.update(hashes)
+                if merged == self.generations[-1]['tables']:
+                    return None
+                hashes = merged
+
+            written = 0
+            for name, value in tables.items():
+                written += self._write_object(hashes[name], value)
+
+            generation = {
+                'id': (self.generations[-1]['id'] + 1) if self.generations else 1,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'tables': hashes
+            }
+            self.generations.append(generation)
+            self._apply_retention()
+            self._write_index()
+
+            print(f"🛟 Backup generația {generation['id']} ({written} obiecte noi)")
+            return generation['id']
+
+    def _apply_retention(self):
+        """Păstrează ultimele N generații și șterge obiectele nereferențiate"""
+        if len(self.generations) <= self.max_generations:
+            return
+
+        self.generations = self.generations[-self.max_generations:]
+        referenced = {h for generation in self.generations for h in generation['tables'].values()}
+
+        for folder in os.listdir(self.objects_dir):
+            folder_path = os.path.join(self.objects_dir, folder)
+            for file_name in os.listdir(folder_path):
+                if file_name.split('.')[0] not in referenced:
+                    os.remove(os.path.join(folder_path, file_name))
+
+    def list_generations(self):
+        """Generațiile disponibile, cele mai noi primele"""
+        with self.lock:
+            return list(reversed(self.generations))
+
+    def restore(self, generation_id):
+        """Încarcă tabelele unei generații (dict nume → DataFrame/config)"""
+        with self.lock:
+            generation = next((g for g in self.generations if g['id'] == generation_id), None)
+            if generation is None:
+                raise KeyError(f"Backup generation {generation_id} not found")
+
+            tables = {}
+            for name, object_hash in generation['tables'].items():
+                with gzip.open(self._object_path(object_hash), 'rb') as f:
+                    tables[name] = pickle.load(f)
+            return tables
@@ -0,0 +1,200 @@
+"""
+📦 Bulk Order Import
+Streaming CSV/xlsx order import with vectorized validation (same rules as the
+New Order form), OrderID deduplication, bulk ID assignment and a rejected-rows report
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import data_schema
+
+# Coloanele obligatorii în fișierul importat
+REQUIRED_COLUMNS = ['ProductName', 'ProductType', 'Quantity', 'CustomerName', 'DueDate', 'EstimatedHours']
+
+# Valorile implicite ale unei comenzi noi (ca în formularul New Order)
+ORDER_DEFAULTS = {
+    'Priority': 'Medium',
+    'Status': 'Planned',
+    'AssignedLine': '',
+    'Progress': 0,
+    'Dependencies': '',
+    'Notes': ''
+}
+
+
+class BulkImportResult:
+    def __init__(self, accepted_df, rejected_df, total_rows, past_due, elapsed):
+        self.accepted_df = accepted_df      # Comenzi valide, cu OrderID alocat
+        self.rejected_df = rejected_df      # Rânduri respinse + coloana RejectReason
+        self.total_rows = total_rows
+        self.past_due = past_due            # Comenzi acceptate cu DueDate în trecut
+        self.elapsed = elapsed
+
+    def summary(self):
+        return (f"📦 Rows read: {self.total_rows:,}\n"
+                f"✅ Imported: {len(self.accepted_df):,}\n"
+                f"❌ Rejected: {len(self.rejected_df):,}\n"
+                f"⚠️ Past due date: {self.past_due:,}\n"
+                f"⏱️ Time: {self.elapsed:.2f}s")
+
+
+class BulkOrderImporter:
+    def __init__(self, existing_order_ids, chunk_size=20000, id_allocator=None):
+        self.existing_ids = set(existing_order_ids)
+        self.chunk_size = chunk_size
+        self.id_allocator = id_allocator    # Secvența persistentă de OrderID-uri (opțională)
+
+    def read_chunks(self, path):
+        """Citește fișierul în bucăți (CSV prin pandas, xlsx prin openpyxl read-only)"""
+        if path.lower().endswith('.csv'):
+            for chunk in pd.read_csv(path, chunksize=self.chunk_size, dtype=str, keep_default_na=False):
+                yield chunk
+            return
+
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(column).strip() if column is not None else '' for column in next(rows)]
+
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= self.chunk_size:
+                    yield pd.DataFrame(buffer, columns=header)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header)
+        finally:
+            workbook.close()
+
+    def validate_chunk(self, chunk):
+        """Validare vectorizată - aceleași reguli ca validate_order_data și formularul New Order"""
+        chunk = chunk.rename(columns=lambda column: str(column).strip())
+        for column in REQUIRED_COLUMNS:
+            if column not in chunk.columns:
+                raise ValueError(f"Missing required column: {column}")
+
+        text = {column: chunk[column].fillna('').astype(str).str.strip()
+                for column in ('ProductName', 'ProductType', 'CustomerName')}
+        quantity = pd.to_numeric(chunk['Quantity'], errors='coerce')
+        hours = pd.to_numeric(chunk['EstimatedHours'], errors='coerce')
+        due_date = pd.to_datetime(chunk['DueDate'], format='%Y-%m-%d', errors='coerce')
+        priority = (chunk['Priority'].fillna('').astype(str).str.strip()
+                    if 'Priority' in chunk.columns else pd.Series('', index=chunk.index))
+        priority = priority.mask(priority == '', ORDER_DEFAULTS['Priority'])
+
+        rules = [
+            (text['ProductName'] == '', "Product Name is required"),
+            ((text['ProductName'] != '') & (text['ProductName'].str.len() < 3),
+             "Product Name must be at least 3 characters"),
+            (text['ProductType'] == '', "Product Type is required"),
+            (text['CustomerName'] == '', "Customer Name is required"),
+            ((text['CustomerName'] != '') & (text['CustomerName'].str.len() < 2),
+             "Customer Name must be at least 2 characters"),
+            (quantity.isna() | (quantity <= 0), "Quantity must be greater than 0"),
+            (quantity.notna() & (quantity % 1 != 0), "Quantity must be a whole number"),
+            (quantity > 10000, "Quantity seems unusually high (>10,000 units)"),
+            (hours.isna() | (hours <= 0), "Estimated Hours must be greater than 0"),
+            (hours > 1000, "Estimated Hours seems unusually high (>1,000 hours)"),
+            (due_date.isna(), "Invalid due date format (use YYYY-MM-DD)"),
+            (~priority.isin(data_schema.PRIORITIES), "Invalid Priority")
+        ]
+
+        reasons = pd.Series('', index=chunk.index)
+        for mask, message in rules:
+            reasons = reasons.mask(mask.fillna(False), reasons + message + '; ')
+
+        # Deduplicare: OrderID existent în date sau repetat în fișier
+        if 'OrderID' in chunk.columns:
+            order_ids = chunk['OrderID'].fillna('').astype(str).str.strip()
+            duplicate = (order_ids != '') & (order_ids.isin(self.existing_ids) | order_ids.duplicated())
+            reasons = reasons.mask(duplicate, reasons + "Duplicate OrderID; ")
+        else:
+            order_ids = pd.Series('', index=chunk.index)
+
+        valid = reasons == ''
+        accepted = pd.DataFrame({
+            'OrderID': order_ids[valid],
+            'ProductName': text['ProductName'][valid],
+            'ProductType': text['ProductType'][valid],
+            'Quantity': quantity[valid].astype('int64'),
+            'Priority': priority[valid],
+            'CustomerName': text['CustomerName'][valid],
+            'DueDate': due_date[valid],
+            'EstimatedHours': hours[valid]
+        })
+        if 'Notes' in chunk.columns:
+            accepted['Notes'] = chunk.loc[valid, 'Notes'].fillna('').astype(str)
+        if 'Dependencies' in chunk.columns:
+            accepted['Dependencies'] = chunk.loc[valid, 'Dependencies'].fillna('').astype(str)
+
+        self.existing_ids.update(order_ids[valid & (order_ids != '')])
+
+        rejected = chunk[~valid].copy()
+        rejected['RejectReason'] = reasons[~valid].str.rstrip('; ')
+        return accepted, rejected
+
+    def assign_order_ids(self, accepted_df):
+        """Alocă în bloc ID-uri ORD-<an>-NNN pentru rândurile fără OrderID"""
+        missing = accepted_df['OrderID'] == ''
+        if not missing.any():
+            return accepted_df
+
+        if self.id_allocator is not None:
+            # ID-urile explicite din fișier avansează secvența, apoi se rezervă un singur bloc
+            self.id_allocator.observe('orders', accepted_df.loc[~missing, 'OrderID'])
+            new_ids = self.id_allocator.reserve('orders', int(missing.sum()))
+            accepted_df.loc[missing, 'OrderID'] = new_ids
+            self.existing_ids.update(new_ids)
+            return accepted_df
+
+        prefix = f"ORD-{datetime.now().year}-"
+        numbers = (pd.Series(sorted(self.existing_ids), dtype=str)
+                   .str.extract(rf'^{prefix}(\d+)$')[0].dropna().astype(int))
+        start = (numbers.max() if not numbers.empty else 0) + 1
+
+        new_ids = [f"{prefix}{number:03d}" for number in range(start, start + missing.sum())]
+        accepted_df.loc[missing, 'OrderID'] = new_ids
+        self.existing_ids.update(new_ids)
+        return accepted_df
+
+    def run(self, path):
+        """Importă fișierul complet: citire în bucăți, validare, alocare ID-uri"""
+        started = datetime.now()
+        accepted_chunks, rejected_chunks, total_rows = [], [], 0
+
+        for chunk in self.read_chunks(path):
+            total_rows += len(chunk)
+            accepted, rejected = self.validate_chunk(chunk)
+            accepted_chunks.append(accepted)
+            rejected_chunks.append(rejected)
+
+        accepted_df = pd.concat(accepted_chunks, ignore_index=True) if accepted_chunks else pd.DataFrame()
+        rejected_df = pd.concat(rejected_chunks, ignore_index=True) if rejected_chunks else pd.DataFrame()
+
+        past_due = 0
+        if not accepted_df.empty:
+            accepted_df = self.assign_order_ids(accepted_df)
+            accepted_df['OrderDate'] = pd.Timestamp(started.date())
+            for column, value in ORDER_DEFAULTS.items():
+                if column not in accepted_df.columns:
+                    accepted_df[column] = value
+            past_due = int((accepted_df['DueDate'] < pd.Timestamp(started.date())).sum())
+
+        elapsed = (datetime.now() - started).total_seconds()
+        return BulkImportResult(accepted_df, rejected_df, total_rows, past_due, elapsed)
+
+    @staticmethod
+    def write_rejected_report(result, source_path):
+        """Scrie rândurile respinse într-un CSV lângă fișierul sursă"""
+        if result.rejected_df.empty:
+            return None
+
+        base, _ = os.path.splitext(source_path)
+        report_path = f"{base}_rejected.csv"
+        result.rejected_df.to_csv(report_path, index=False)
+        return report_path
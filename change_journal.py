@@ -0,0 +1,154 @@
+"""
+📝 Change Journal
+Append-only write-ahead journal for row-level changes with periodic compaction
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, date
+
+import pandas as pd
+
+# Cheia primară pentru fiecare tabel
+PRIMARY_KEYS = {
+    'production_lines': 'LineID',
+    'orders': 'OrderID',
+    'schedule': 'ScheduleID'
+}
+
+
+def _json_default(value):
+    """Serializare pentru tipurile pandas/numpy din rânduri"""
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _clean_row(row):
+    """Înlocuiește NaN/NaT cu None pentru JSON valid"""
+    return {key: (None if not isinstance(value, (list, dict)) and pd.isna(value) else value)
+            for key, value in row.items()}
+
+
+class ChangeJournal:
+    def __init__(self, journal_path, compact_threshold=500):
+        self.journal_path = journal_path
+        self.meta_path = f"{journal_path}.meta"
+        self.compact_threshold = compact_threshold
+        self.lock = threading.Lock()
+
+        self.compacted_seq = self._read_compacted_seq()
+        self.last_seq = self.compacted_seq
+        self.pending_entries = 0
+
+        for entry in self.read_entries():
+            self.last_seq = max(self.last_seq, entry['seq'])
+            self.pending_entries += 1
+
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _read_compacted_seq(self):
+        try:
+            with open(self.meta_path, 'r') as f:
+                return json.load(f).get('compacted_seq', 0)
+        except (OSError, ValueError):
+            return 0
+
+    def append(self, table_name, op, row):
+        """Adaugă o modificare în jurnal (upsert/delete) și întoarce numărul de secvență"""
+        key_column = PRIMARY_KEYS[table_name]
+
+        with self.lock:
+            self.last_seq += 1
+            entry = {
+                'seq': self.last_seq,
+                'table': table_name,
+                'op': op,
+                'key': row[key_column],
+                'row': _clean_row(row) if op == 'upsert' else None
+            }
+            self._file.write(json.dumps(entry, default=_json_default) + "\n")
+            self._file.flush()
+            self.pending_entries += 1
+            return self.last_seq
+
+    def read_entries(self, after_seq=None):
+        """Citește intrările din jurnal mai noi decât after_seq (implicit: ultima compactare)"""
+        if after_seq is None:
+            after_seq = self.compacted_seq
+
+        entries = []
+        if not os.path.exists(self.journal_path):
+            return entries
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Ultima linie poate fi incompletă după un crash
+                    continue
+                if entry['seq'] > after_seq:
+                    entries.append(entry)
+
+        return entries
+
+    def replay(self, tables):
+        """Aplică jurnalul peste snapshot-ul de bază (recuperare după crash)"""
+        entries = self.read_entries()
+        if not entries:
+            return tables
+
+        # Starea finală per cheie - ultima modificare câștigă
+        final_state = {}
+        for entry in entries:
+            final_state.setdefault(entry['table'], {})[entry['key']] = entry
+
+        for table_name, changes in final_state.items():
+            df = tables[table_name]
+            key_column = PRIMARY_KEYS[table_name]
+
+            deleted_keys = [key for key, entry in changes.items() if entry['op'] == 'delete']
+            upserts = [entry['row'] for entry in changes.values() if entry['op'] == 'upsert']
+
+            # Rândurile modificate sunt înlocuite complet
+            df = df[~df[key_column].isin(list(changes.keys()))]
+            if upserts:
+                df = pd.concat([df, pd.DataFrame(upserts)], ignore_index=True)
+
+            tables[table_name] = df.reset_index(drop=True)
+            print(f"🔁 Jurnal aplicat pe {table_name}: {len(upserts)} upsert, {len(deleted_keys)} delete")
+
+        return tables
+
+    def needs_compaction(self):
+        """Verifică dacă jurnalul a crescut suficient pentru compactare"""
+        return self.pending_entries >= self.compact_threshold
+
+    def mark_compacted(self, seq):
+        """Marchează intrările până la seq ca incluse în snapshot și rescrie jurnalul"""
+        with self.lock:
+            tmp_meta = f"{self.meta_path}.tmp"
+            with open(tmp_meta, 'w') as f:
+                json.dump({'compacted_seq': seq, 'compacted_at': datetime.now().isoformat()}, f)
+            os.replace(tmp_meta, self.meta_path)
+            self.compacted_seq = seq
+
+            # Păstrează doar intrările scrise în timpul compactării
+            self._file.close()
+            remaining = self.read_entries(after_seq=seq)
+            tmp_journal = f"{self.journal_path}.tmp"
+            with open(tmp_journal, 'w', encoding='utf-8') as f:
+                for entry in remaining:
+                    f.write(json.dumps(entry, default=_json_default) + "\n")
+            os.replace(tmp_journal, self.journal_path)
+
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self.pending_entries = len(remaining)
+
+    def close(self):
+        with self.lock:
+            self._file.close()
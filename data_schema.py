@@ -0,0 +1,197 @@
+"""
+🧬 Data Schema
+Central typed schema for production lines, orders and schedule frames.
+Frames are normalized once at load: categoricals for enumerations,
+narrow numeric widths and datetime64 for every date column.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Valori cunoscute pentru enumerări (valorile noi din date sunt adăugate automat)
+LINE_STATUSES = ['Active', 'Maintenance', 'Inactive']
+ORDER_STATUSES = ['Planned', 'Queued', 'Scheduled', 'In Progress', 'Completed', 'On Hold', 'Critical Delay']
+SCHEDULE_STATUSES = ['Scheduled', 'In Progress', 'Completed', 'Cancelled']
+PRIORITIES = ['Critical', 'High', 'Medium', 'Low']
+DEPARTMENTS = ['Assembly', 'Machining', 'Packaging', 'Quality', 'Logistics']
+PRODUCT_TYPES = ['Electronics', 'Automotive', 'Medical', 'Heavy', 'Precision', 'Package']
+
+SCHEMAS = {
+    'production_lines': {
+        'categories': {
+            'Status': LINE_STATUSES,
+            'Department': DEPARTMENTS
+        },
+        'integers': {
+            'Capacity_UnitsPerHour': 'int32',
+            'OperatorCount': 'int32',
+            'SetupTime_Minutes': 'int32',
+            'QualityCheckTime_Minutes': 'int32'
+        },
+        'floats': {
+            'Efficiency': 'float32'
+        },
+        'dates': ['MaintenanceScheduled']
+    },
+    'orders': {
+        'categories': {
+            'Status': ORDER_STATUSES,
+            'Priority': PRIORITIES,
+            'ProductType': PRODUCT_TYPES,
+            'CustomerName': [],
+            'ProductName': [],
+            'AssignedLine': []
+        },
+        'integers': {
+            'Quantity': 'int32',
+            'Progress': 'int8'
+        },
+        'floats': {
+            'EstimatedHours': 'float32'
+        },
+        'dates': ['OrderDate', 'DueDate']
+    },
+    'schedule': {
+        'categories': {
+            'Status': SCHEDULE_STATUSES,
+            'LineID': [],
+            'ScheduledBy': []
+        },
+        'integers': {},
+        'floats': {},
+        'dates': ['StartDateTime', 'EndDateTime', 'ActualStart', 'ActualEnd', 'LastModified']
+    }
+}
+
+
+def memory_usage(df):
+    """Memoria ocupată de un DataFrame (bytes, inclusiv string-urile)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _categorical(series, known_values):
+    """Categorical cu valorile cunoscute + cele prezente în date (nicio valoare pierdută)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+
+    values = series.where(series.notna(), None)
+    present = [value for value in pd.unique(values.dropna()) if value not in known_values]
+    return pd.Series(pd.Categorical(values, categories=list(known_values) + present),
+                     index=series.index, name=series.name)
+
+
+def _narrow_integer(series, dtype):
+    """Întreg de lățime redusă; rămâne float32 dacă există valori lipsă sau zecimale"""
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.isna().any() or not (numeric == np.floor(numeric)).all():
+        return numeric.astype('float32')
+
+    info = np.iinfo(dtype)
+    if len(numeric) and (numeric.min() < info.min or numeric.max() > info.max):
+        return numeric.astype('int64')
+    return numeric.astype(dtype)
+
+
+def normalize_frame(table_name, df):
+    """Aplică schema tabelului pe un DataFrame (o singură dată, la încărcare)"""
+    schema = SCHEMAS.get(table_name)
+    if schema is None:
+        return df
+
+    df = df.copy()
+
+    for column in schema['dates']:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column].replace('', None), errors='coerce')
+
+    for column, known_values in schema['categories'].items():
+        if column in df.columns:
+            df[column] = _categorical(df[column], known_values)
+
+    for column, dtype in schema['integers'].items():
+        if column in df.columns:
+            df[column] = _narrow_integer(df[column], dtype)
+
+    for column, dtype in schema['floats'].items():
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+
+    return df
+
+
+def normalize_tables(tables):
+    """Normalizează toate tabelele și raportează memoria înainte/după"""
+    report = {}
+
+    for table_name, df in tables.items():
+        before = memory_usage(df)
+        tables[table_name] = normalize_frame(table_name, df)
+        after = memory_usage(tables[table_name])
+        report[table_name] = (before, after)
+        print(f"🧬 {table_name}: {before / 1024:.1f} KB → {after / 1024:.1f} KB")
+
+    return tables, report
+
+
+def _is_missing(value):
+    """None, NaN / NaT sau text gol (o celulă golită din formular)"""
+    if isinstance(value, str):
+        return not value.strip()
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def set_value(df, index, column, value):
+    """Atribuire .at compatibilă cu schema (categorii noi, lățimi numerice depășite, valori golite)"""
+    dtype = df[column].dtype
+
+    # Valoarea golită devine valoarea lipsă a coloanei numerice / de tip dată
+    if _is_missing(value):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            value = pd.NaT
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            value = np.nan
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        if value is not None and not pd.isna(value) and value not in dtype.categories:
+            df[column] = df[column].cat.add_categories([value])
+
+    elif pd.api.types.is_integer_dtype(dtype):
+        numeric = float(value)
+        info = np.iinfo(dtype)
+        if np.isnan(numeric) or numeric != int(numeric):
+            # Întregii nu pot ține valori lipsă sau zecimale - coloana devine float (ca la încărcare)
+            df[column] = df[column].astype('float64')
+        elif not info.min <= numeric <= info.max:
+            df[column] = df[column].astype('int64')
+
+    df.at[index, column] = value
+
+
+def set_values(df, labels, column, values):
+    """Atribuire vectorizată pe mai multe rânduri, compatibilă cu schema (ca set_value)"""
+    dtype = df[column].dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        new_values = pd.unique(pd.Series(values, dtype=object).dropna())
+        missing = [value for value in new_values if value not in dtype.categories]
+        if missing:
+            df[column] = df[column].cat.add_categories(missing)
+
+    elif pd.api.types.is_integer_dtype(dtype):
+        numeric = pd.to_numeric(pd.Series(values), errors='coerce')
+        info = np.iinfo(dtype)
+        if numeric.isna().any() or not (numeric == np.floor(numeric)).all():
+            df[column] = df[column].astype('float64')
+        elif len(numeric) and (numeric.min() < info.min or numeric.max() > info.max):
+            df[column] = df[column].astype('int64')
+
+    df.loc[labels, column] = values
+
+
+def append_rows(table_name, df, rows):
+    """Adaugă rânduri noi și păstrează tipurile din schemă"""
+    new_df = pd.DataFrame(rows)
+    return normalize_frame(table_name, pd.concat([df, new_df], ignore_index=True))
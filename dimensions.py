@@ -0,0 +1,81 @@
+"""
+🏷️ Dimensions
+Customer and product dimension tables over the orders' categorical columns:
+integer surrogate keys (the category codes), interned names, usage counts
+via bincount and prefix autocomplete - no string group-bys or unique() scans.
+"""
+
+import bisect
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+class Dimension:
+    def __init__(self, orders_repository, column, key_name):
+        self.orders_repository = orders_repository
+        self.column = column                # Coloana din orders (categorical)
+        self.key_name = key_name            # Numele cheii surogat (ex. CustomerKey)
+
+        self.names = []                     # cheie → nume (internat)
+        self.keys = {}                      # nume → cheie
+        self._sorted = []                   # (nume lowercase, cheie) pentru autocomplete
+        self._categories = None             # Categoriile pentru care e construită dimensiunea
+
+    def _series(self):
+        df = self.orders_repository.frame()
+        series = df[self.column] if self.column in df.columns else pd.Series([], dtype='category')
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype('category')
+
+        # Categoriile se schimbă doar la valori noi / tabel nou - atunci se reconstruiește dimensiunea
+        categories = series.cat.categories
+        if categories is not self._categories:
+            self._build(categories)
+        return series
+
+    def _build(self, categories):
+        self.names = [sys.intern(str(name)) for name in categories]
+        self.keys = {name: key for key, name in enumerate(self.names)}
+        self._sorted = sorted((name.lower(), key) for key, name in enumerate(self.names))
+        self._categories = categories
+
+    def codes(self):
+        """Cheile surogat pentru fiecare comandă (-1 = lipsă)"""
+        return self._series().cat.codes.to_numpy()
+
+    def key(self, name):
+        self._series()
+        return self.keys.get(name)
+
+    def name(self, key):
+        self._series()
+        return self.names[key] if 0 <= key < len(self.names) else None
+
+    def counts(self):
+        """Numărul de comenzi pe cheie (bincount pe coduri întregi)"""
+        codes = self.codes()
+        return np.bincount(codes[codes >= 0], minlength=len(self.names))
+
+    def table(self):
+        """Tabelul dimensiunii: cheie, nume, număr de comenzi"""
+        counts = self.counts()
+        return pd.DataFrame({self.key_name: np.arange(len(self.names)),
+                             self.column: self.names,
+                             'Orders': counts})
+
+    def complete(self, prefix, limit=10):
+        """Numele care încep cu `prefix` (fără diferență majuscule/minuscule), cele mai folosite primele"""
+        self._series()
+        prefix = prefix.strip().lower()
+        first = bisect.bisect_left(self._sorted, (prefix,))
+        matches = []
+        for lowered, key in self._sorted[first:]:
+            if not lowered.startswith(prefix):
+                break
+            matches.append(key)
+
+        counts = self.counts()
+        matches.sort(key=lambda key: -counts[key])
+        return [self.names[key] for key in matches[:limit] if counts[key] > 0]
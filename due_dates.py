@@ -0,0 +1,160 @@
+"""
+⏰ Due Dates
+Maintained due-date index over orders: sorted (DueDate, OrderID) arrays for
+all orders and for open (not completed) ones, so "overdue now", "due within
+N days" and "next deadline" are bisect queries. Fires a deadline-crossed
+event for open orders instead of rescanning the table.
+"""
+
+import bisect
+import heapq
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+COMPLETED_STATUS = 'Completed'
+
+
+class DueDateIndex:
+    SNAPSHOT_FIELDS = ('all_keys', 'open_keys', 'entries')
+
+    def __init__(self, orders_repository=None, on_change=None):
+        self.orders_repository = orders_repository
+        self.on_change = on_change          # Apelat când termenele se schimbă (ex. re-armarea timer-ului)
+
+        self.all_keys = []                  # (DueDate, OrderID) sortate - toate comenzile
+        self.open_keys = []                 # (DueDate, OrderID) sortate - comenzile necompletate
+        self.entries = {}                   # OrderID → (DueDate, deschisă)
+
+        self.deadline_listeners = []
+        self.checked_until = datetime.now()  # Termenele dinainte au fost deja raportate
+
+        if orders_repository is not None:
+            orders_repository.add_listener(self)
+
+    # Notificări de la TableRepository
+    def table_rebuilt(self, df):
+        rows = self._sorted_rows(df)
+        self.all_keys = [(due_date, order_id) for due_date, order_id, _ in rows]
+        self.open_keys = [(due_date, order_id) for due_date, order_id, open_ in rows if open_]
+        self.entries = {order_id: (due_date, open_) for due_date, order_id, open_ in rows}
+        self._changed()
+
+    def rows_inserted(self, df):
+        # Lotul se sortează o dată și se interclasează cu listele existente - O(n + k log k), nu k × insort
+        rows = self._sorted_rows(df)
+        for _, order_id, _ in rows:
+            self._remove(order_id)
+        self.all_keys = list(heapq.merge(self.all_keys, [(due_date, order_id) for due_date, order_id, _ in rows]))
+        self.open_keys = list(heapq.merge(self.open_keys,
+                                          [(due_date, order_id) for due_date, order_id, open_ in rows if open_]))
+        self.entries.update((order_id, (due_date, open_)) for due_date, order_id, open_ in rows)
+        self._changed()
+
+    @staticmethod
+    def _sorted_rows(df):
+        """(DueDate, OrderID, deschisă) sortate, pentru rândurile cu termen valid"""
+        if df.empty or 'DueDate' not in df.columns:
+            return []
+        due = pd.to_datetime(df['DueDate'], errors='coerce')
+        is_open = (df['Status'] != COMPLETED_STATUS) if 'Status' in df.columns else pd.Series(True, index=df.index)
+        valid = due.notna()
+        return sorted(zip(due[valid].tolist(), df.loc[valid, 'OrderID'].tolist(), is_open[valid].tolist()))
+
+    def row_updated(self, key, row):
+        self._remove(key)
+        self._add(row)
+        self._changed()
+
+    def rows_deleted(self, keys):
+        for key in keys:
+            self._remove(key)
+        self._changed()
+
+    def _add(self, row):
+        due_date = pd.to_datetime(row.get('DueDate'), errors='coerce')
+        if pd.isna(due_date):
+            return
+
+        order_id = row['OrderID']
+        open_ = row.get('Status') != COMPLETED_STATUS
+        bisect.insort(self.all_keys, (due_date, order_id))
+        if open_:
+            bisect.insort(self.open_keys, (due_date, order_id))
+        self.entries[order_id] = (due_date, open_)
+
+    def _remove(self, order_id):
+        entry = self.entries.pop(order_id, None)
+        if entry is None:
+            return
+
+        due_date, open_ = entry
+        self._discard(self.all_keys, (due_date, order_id))
+        if open_:
+            self._discard(self.open_keys, (due_date, order_id))
+
+    @staticmethod
+    def _discard(keys, key):
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def _keys(self, open_only):
+        if self.orders_repository is not None:
+            self.orders_repository.frame()      # Reindexare dacă tabelul a fost înlocuit
+        return self.open_keys if open_only else self.all_keys
+
+    # Interogări
+    def overdue_count(self, now=None, open_only=True):
+        """Numărul comenzilor cu DueDate < now - O(log n)"""
+        now = pd.Timestamp(now or datetime.now())
+        return bisect.bisect_left(self._keys(open_only), (now,))
+
+    def overdue(self, now=None, open_only=True):
+        """OrderID-urile întârziate, cele mai vechi termene primele"""
+        now = pd.Timestamp(now or datetime.now())
+        keys = self._keys(open_only)
+        return [order_id for _, order_id in keys[:bisect.bisect_left(keys, (now,))]]
+
+    def due_within(self, days, now=None, open_only=True):
+        """OrderID-urile cu termen în [now, now + days)"""
+        now = pd.Timestamp(now or datetime.now())
+        keys = self._keys(open_only)
+        first = bisect.bisect_left(keys, (now,))
+        last = bisect.bisect_left(keys, (now + timedelta(days=days),))
+        return [order_id for _, order_id in keys[first:last]]
+
+    def upcoming(self, count, now=None, open_only=True):
+        """Următoarele `count` termene ≥ now, ca (DueDate, OrderID)"""
+        now = pd.Timestamp(now or datetime.now())
+        keys = self._keys(open_only)
+        first = bisect.bisect_left(keys, (now,))
+        return keys[first:first + count]
+
+    def next_deadline(self, now=None):
+        """Cel mai apropiat termen viitor al unei comenzi deschise, ca (DueDate, OrderID), sau None"""
+        upcoming = self.upcoming(1, now)
+        return upcoming[0] if upcoming else None
+
+    # Evenimente
+    def add_deadline_listener(self, callback):
+        """callback(order_ids) - apelat cu comenzile deschise care tocmai au devenit întârziate"""
+        self.deadline_listeners.append(callback)
+
+    def fire_crossed(self, now=None):
+        """Raportează comenzile deschise cu termen în [checked_until, now)"""
+        now = pd.Timestamp(now or datetime.now())
+        keys = self._keys(True)
+        first = bisect.bisect_left(keys, (pd.Timestamp(self.checked_until),))
+        last = bisect.bisect_left(keys, (now,))
+        self.checked_until = now
+
+        crossed = [order_id for _, order_id in keys[first:last]]
+        if crossed:
+            for callback in self.deadline_listeners:
+                callback(crossed)
+        return crossed
@@ -0,0 +1,124 @@
+"""
+👀 File Watcher
+Detects external changes to the data files (mtime/size polling, confirmed by
+content hash) and diffs the new file against the last acknowledged one by
+primary key, so only the external edits are applied to memory
+"""
+
+import os
+import hashlib
+
+import pandas as pd
+
+
+def _read(path):
+    """((dimensiune, mtime, hash), conținut) pentru un fișier; (None, None) dacă lipsește"""
+    if not os.path.exists(path):
+        return None, None
+
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    return (stat.st_size, stat.st_mtime_ns, hashlib.blake2b(data, digest_size=16).hexdigest()), data
+
+
+def _fingerprint(path):
+    """(dimensiune, mtime, hash) pentru un fișier; None dacă lipsește"""
+    return _read(path)[0]
+
+
+class FileWatcher:
+    def __init__(self, sources, poll_interval_ms=2000):
+        self.sources = dict(sources)            # nume sursă → cale fișier
+        self.poll_interval_ms = poll_interval_ms
+        self.fingerprints = {}                  # nume sursă → (dimensiune, mtime, hash) confirmat
+        self.contents = {}                      # nume sursă → conținutul confirmat (baza diff-ului)
+        self.acknowledge_all()
+
+    def changed_sources(self):
+        """Sursele modificate de la ultima confirmare (hash-ul se calculează doar la mtime/size schimbat)"""
+        changed = []
+        for name, path in self.sources.items():
+            known = self.fingerprints.get(name)
+
+            if not os.path.exists(path):
+                if known is not None:
+                    changed.append(name)
+                continue
+
+            stat = os.stat(path)
+            if known is not None and (stat.st_size, stat.st_mtime_ns) == known[:2]:
+                continue
+
+            current = _fingerprint(path)
+            if known is None or current[2] != known[2]:
+                changed.append(name)
+            else:
+                # Doar mtime schimbat (touch) - conținut identic
+                self.fingerprints[name] = current
+
+        return changed
+
+    def acknowledge(self, name):
+        """Marchează starea curentă a sursei ca văzută (după reîncărcare sau scriere proprie)"""
+        self.fingerprints[name], self.contents[name] = _read(self.sources[name])
+
+    def baseline(self, name):
+        """Conținutul fișierului la ultima confirmare (None dacă nu exista)"""
+        return self.contents.get(name)
+
+    def acknowledge_all(self):
+        for name in self.sources:
+            self.acknowledge(name)
+
+
+def diff_by_key(current_df, new_df, key_column):
+    """Diferențele dintre tabelul din memorie și cel reîncărcat, după cheia primară
+
+    Întoarce (rânduri noi, {cheie: {coloană: valoare nouă}}, chei șterse).
+    """
+    new_df = new_df.drop_duplicates(key_column, keep='last')
+    current_keys = pd.Index(current_df[key_column].astype(object))
+    new_keys = pd.Index(new_df[key_column].astype(object))
+
+    inserted = new_df[~new_keys.isin(current_keys)]
+    deleted = list(current_keys[~current_keys.isin(new_keys)])
+
+    common = current_keys.intersection(new_keys)
+    columns = [column for column in new_df.columns if column in current_df.columns and column != key_column]
+
+    old = current_df.set_index(current_df[key_column].astype(object)).loc[common, columns].astype(object)
+    new = new_df.set_index(new_keys).loc[common, columns].astype(object)
+
+    # Celule diferite (valorile lipsă și textul gol sunt considerate egale - Excel nu le distinge)
+    old_blank = old.isna() | (old == '')
+    new_blank = new.isna() | (new == '')
+    differs = (old != new) & ~(old_blank & new_blank)
+
+    updated = {}
+    for key in differs.index[differs.any(axis=1)]:
+        changed_columns = differs.columns[differs.loc[key]]
+        updated[key] = {column: new.at[key, column] for column in changed_columns}
+
+    return inserted, updated, deleted
+
+
+def rebase_diff(current_df, old_df, new_df, key_column):
+    """Modificările externe (fișierul confirmat → fișierul nou) aplicabile peste tabelul din memorie
+
+    Fișierul e doar un export: rândurile create, modificate sau șterse în aplicație după
+    ultimul export nu sunt atinse. Întoarce (rânduri noi, {cheie: {coloană: valoare}}, chei șterse).
+    """
+    inserted, updated, deleted = diff_by_key(old_df, new_df, key_column)
+    current_keys = pd.Index(current_df[key_column].astype(object))
+
+    # Rândurile șterse sau modificate extern care nu mai există în memorie sunt ignorate
+    deleted = [key for key in deleted if key in current_keys]
+    updated = {key: changes for key, changes in updated.items() if key in current_keys}
+
+    # Un rând adăugat extern cu o cheie existentă în memorie devine actualizare (doar celulele diferite)
+    exists = pd.Index(inserted[key_column].astype(object)).isin(current_keys)
+    if exists.any():
+        _, conflicts, _ = diff_by_key(current_df, inserted[exists], key_column)
+        updated.update(conflicts)
+    return inserted[~exists], updated, deleted
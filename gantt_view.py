@@ -10,13 +10,20 @@ from datetime import datetime, timedelta
 import random
 import math
 
+import table_repository
+
 class GanttView:
-    def __init__(self, parent, production_lines_df, orders_df, schedule_df):
+    def __init__(self, parent, production_lines_df, orders_df, schedule_df, orders_repository=None):
         self.parent = parent
         self.production_lines_df = production_lines_df
         self.orders_df = orders_df
         self.schedule_df = schedule_df
 
+        # Căutare comenzi după OrderID prin index (fără scanarea tabelului la fiecare task)
+        if orders_repository is None:
+            orders_repository = table_repository.TableRepository('orders', lambda: self.orders_df)
+        self.orders_repo = orders_repository
+
         # Creează fereastra
         self.window = tk.Toplevel(parent)
         self.window.title("📊 Gantt Chart - Production Schedule")
@@ -423,10 +430,9 @@ class GanttView:
 
             # Găsește order info pentru afișare
             if not self.orders_df.empty:
-                order_matches = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
+                order_data = self.orders_repo.get(schedule_data['OrderID'])
 
-                if not order_matches.empty:
-                    order_data = order_matches.iloc[0]
+                if order_data is not None:
 
                     # Informații task
                     product_name = order_data['ProductName'][:10] + "..." if len(order_data['ProductName']) > 10 else order_data['ProductName']
@@ -637,8 +643,8 @@ class GanttView:
         """Desenează un singur task în Gantt"""
         try:
             # Convertește datele la datetime
-            start_date = pd.to_datetime(schedule_data['StartDateTime'])
-            end_date = pd.to_datetime(schedule_data['EndDateTime'])
+            start_date = schedule_data['StartDateTime']
+            end_date = schedule_data['EndDateTime']
 
             # Verifică dacă task-ul este în view
             view_end = self.view_start_date + timedelta(days=self.view_days)
@@ -661,10 +667,9 @@ class GanttView:
                 return
 
             # Găsește comanda asociată pentru culoare și info
-            order_info = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
+            order = self.orders_repo.get(schedule_data['OrderID'])
 
-            if not order_info.empty:
-                order = order_info.iloc[0]
+            if order is not None:
 
                 # Culoare bazată pe status sau prioritate
                 if schedule_data['Status'] in self.status_colors:
@@ -861,10 +866,9 @@ class GanttView:
             content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
             # Găsește order info
-            order_info = self.orders_df[self.orders_df['OrderID'] == schedule_data['OrderID']]
+            order = self.orders_repo.get(schedule_data['OrderID'])
 
-            if not order_info.empty:
-                order = order_info.iloc[0]
+            if order is not None:
 
                 # Order info
                 tk.Label(content_frame, text=f"📦 Product: {order['ProductName']}",
@@ -884,8 +888,8 @@ class GanttView:
                         font=('Segoe UI', 11, 'bold'),
                         fg='#00d4aa', bg='#1a1a2e').pack(anchor='w', pady=(20, 5))
 
-                start_time = pd.to_datetime(schedule_data['StartDateTime'])
-                end_time = pd.to_datetime(schedule_data['EndDateTime'])
+                start_time = schedule_data['StartDateTime']
+                end_time = schedule_data['EndDateTime']
 
                 tk.Label(content_frame, text=f"🚀 Start: {start_time.strftime('%d/%m/%Y %H:%M')}",
                         font=('Segoe UI', 10),
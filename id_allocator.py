@@ -0,0 +1,161 @@
+"""
+🔢 ID Allocator
+Persistent, monotonic ID sequences for orders (ORD-<year>-NNN), production
+lines (LINE-<letter>NN) and schedule entries (SCH-<year>-NNNNN). Allocation
+and bulk range reservation are O(1); the counters follow every ID that
+reaches the tables, so IDs typed in forms, imported or edited externally
+are never handed out again.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+LINE_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LINES_PER_LETTER = 99
+
+
+class YearlySequence:
+    """<prefix>-<an>-NNN - câte o secvență pe an"""
+
+    def __init__(self, prefix, width):
+        self.pattern = rf'^{prefix}-(\d{{4}})-(\d+)$'
+        self.prefix = prefix
+        self.width = width
+
+    def key(self, year):
+        return f"{self.prefix}-{year}"
+
+    def format(self, year, number):
+        return f"{self.prefix}-{year}-{number:0{self.width}d}"
+
+    def numbers(self, ids):
+        """Numărul maxim pentru fiecare secvență prezentă în ID-uri (vectorizat)"""
+        parts = pd.Series(ids, dtype=object).astype(str).str.extract(self.pattern).dropna()
+        if parts.empty:
+            return {}
+        maxima = parts[1].astype('int64').groupby(parts[0]).max()
+        return {self.key(year): int(number) for year, number in maxima.items()}
+
+
+class LineSequence:
+    """LINE-A01 ... LINE-A99, LINE-B01 ... - numărul secvenței e continuu peste litere"""
+
+    pattern = r'^LINE-([A-Z])(\d{2})$'
+
+    def key(self, year):
+        return 'LINE'
+
+    def format(self, year, number):
+        letter, offset = divmod(number - 1, LINES_PER_LETTER)
+        return f"LINE-{LINE_LETTERS[letter]}{offset + 1:02d}"
+
+    def numbers(self, ids):
+        parts = pd.Series(ids, dtype=object).astype(str).str.extract(self.pattern).dropna()
+        if parts.empty:
+            return {}
+        numbers = (parts[0].map(LINE_LETTERS.index) * LINES_PER_LETTER + parts[1].astype('int64'))
+        return {'LINE': int(numbers.max())}
+
+
+SEQUENCES = {
+    'orders': YearlySequence('ORD', 3),
+    'production_lines': LineSequence(),
+    'schedule': YearlySequence('SCH', 5)
+}
+
+
+class _TableObserver:
+    """Ascultă repository-ul unui tabel și avansează contoarele peste ID-urile apărute"""
+
+    def __init__(self, allocator, table_name):
+        self.allocator = allocator
+        self.table_name = table_name
+
+    def table_rebuilt(self, df):
+        self.rows_inserted(df)
+
+    def rows_inserted(self, df):
+        column = self.allocator.repositories[self.table_name].key_column
+        if column in df.columns and not df.empty:
+            self.allocator.observe(self.table_name, df[column])
+
+    def row_updated(self, key, row):
+        column = self.allocator.repositories[self.table_name].key_column
+        self.allocator.observe(self.table_name, [row.get(column, key)])
+
+    def rows_deleted(self, keys):
+        pass    # Numerele șterse nu se refolosesc
+
+
+class IdAllocator:
+    def __init__(self, state_path, repositories=None):
+        self.state_path = state_path
+        self.repositories = repositories or {}
+        self.counters = self._read_state()     # cheia secvenței → ultimul număr alocat/văzut
+        self._lock = threading.Lock()
+        self._synced = set()
+
+        for table_name in self.repositories:
+            if table_name in SEQUENCES:
+                self.repositories[table_name].add_listener(_TableObserver(self, table_name))
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return {key: int(value) for key, value in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.counters, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def observe(self, table_name, ids):
+        """Avansează contoarele peste ID-urile existente (nu coboară niciodată)"""
+        changed = False
+        with self._lock:
+            for key, number in SEQUENCES[table_name].numbers(ids).items():
+                if number > self.counters.get(key, 0):
+                    self.counters[key] = number
+                    changed = True
+            if changed:
+                self._write_state()
+
+    def _sync(self, table_name):
+        """Prima alocare dintr-un tabel vede toate ID-urile lui; după aceea listener-ul ține pasul"""
+        if table_name not in self._synced and table_name in self.repositories:
+            self.repositories[table_name].frame()
+            self._synced.add(table_name)
+
+    def peek(self, table_name, year=None):
+        """Următorul ID, fără a-l rezerva (de ex. pentru pre-completarea unui formular)"""
+        self._sync(table_name)
+        sequence = SEQUENCES[table_name]
+        year = year or datetime.now().year
+        return sequence.format(year, self.counters.get(sequence.key(year), 0) + 1)
+
+    def reserve(self, table_name, count=1, year=None):
+        """Rezervă un bloc de `count` ID-uri consecutive; contorul e salvat înainte de întoarcere"""
+        self._sync(table_name)
+        sequence = SEQUENCES[table_name]
+        year = year or datetime.now().year
+        key = sequence.key(year)
+
+        with self._lock:
+            start = self.counters.get(key, 0) + 1
+            self.counters[key] = start + count - 1
+            self._write_state()
+
+        return [sequence.format(year, number) for number in range(start, start + count)]
+
+    def next_id(self, table_name, year=None):
+        return self.reserve(table_name, 1, year)[0]
@@ -0,0 +1,120 @@
+"""
+🧩 Line Compatibility
+Precompiled product-type × production-line compatibility matrix, built once from
+the lines' ProductTypes column and the line_compatibility rules and combined with
+line Status. Rebuilt only when the lines table or the rules change.
+"""
+
+import numpy as np
+import pandas as pd
+
+import data_schema
+
+# Tip de produs care face o linie compatibilă cu orice comandă
+ANY_PRODUCT = 'All'
+
+
+def _split_product_types(value):
+    if not isinstance(value, str):
+        return []
+    return [product_type.strip() for product_type in value.split(',') if product_type.strip()]
+
+
+class CompatibilityMatrix:
+    def __init__(self, lines_repository, get_rules):
+        self.lines_repository = lines_repository
+        self.get_rules = get_rules              # Întoarce dict-ul curent din production_rules.json
+
+        self.product_types = []                 # cod tip produs → nume
+        self.type_codes = {}                    # nume → cod tip produs
+        self.line_ids = []                      # cod linie → LineID
+        self.matrix = np.zeros((1, 0), dtype=bool)  # [tip, linie]; ultimul rând = tip necunoscut
+
+        self._dirty = True
+        self._rules_ref = None
+        lines_repository.add_listener(self)
+
+    # Notificări de la TableRepository - orice schimbare a liniilor invalidează matricea
+    def table_rebuilt(self, df):
+        self._dirty = True
+
+    def rows_inserted(self, df):
+        self._dirty = True
+
+    def row_updated(self, key, row):
+        self._dirty = True
+
+    def rows_deleted(self, keys):
+        self._dirty = True
+
+    def _line_rules(self):
+        rules = self.get_rules() or {}
+        return rules.get('production_rules', {}).get('line_compatibility', {})
+
+    def _ensure(self):
+        """Frame-ul liniilor; matricea se recompilează doar dacă liniile sau regulile s-au schimbat"""
+        lines_df = self.lines_repository.frame()
+        line_rules = self._line_rules()
+        if self._dirty or line_rules is not self._rules_ref:
+            self.compile(lines_df, line_rules)
+        return lines_df
+
+    def compile(self, lines_df, line_rules):
+        """Construiește matricea booleană din coloana ProductTypes, reguli și Status"""
+        line_types = [_split_product_types(value) for value in lines_df.get('ProductTypes', pd.Series(dtype=object))]
+
+        product_types = list(data_schema.PRODUCT_TYPES)
+        for types in line_types + [list(line_rules)]:
+            product_types.extend(t for t in types if t != ANY_PRODUCT and t not in product_types)
+
+        self.product_types = product_types
+        self.type_codes = {product_type: code for code, product_type in enumerate(product_types)}
+        self.line_ids = lines_df['LineID'].astype(object).tolist() if 'LineID' in lines_df.columns else []
+        line_codes = {line_id: code for code, line_id in enumerate(self.line_ids)}
+
+        # Rândul suplimentar de la final primește codul -1 (tip necunoscut / lipsă)
+        matrix = np.zeros((len(product_types) + 1, len(self.line_ids)), dtype=bool)
+
+        for line_code, types in enumerate(line_types):
+            if ANY_PRODUCT in types:
+                matrix[:, line_code] = True
+            else:
+                matrix[[self.type_codes[t] for t in types], line_code] = True
+
+        for product_type, line_ids in line_rules.items():
+            line_positions = [line_codes[line_id] for line_id in line_ids if line_id in line_codes]
+            if product_type == ANY_PRODUCT:
+                matrix[:, line_positions] = True
+            else:
+                matrix[self.type_codes[product_type], line_positions] = True
+
+        if 'Status' in lines_df.columns:
+            matrix &= (lines_df['Status'] == 'Active').to_numpy(dtype=bool)
+
+        self.matrix = matrix
+        self._rules_ref = line_rules
+        self._dirty = False
+
+    def codes(self, product_types):
+        """Codurile tipurilor de produs (-1 pentru tipurile necunoscute)"""
+        return pd.Categorical(pd.Series(product_types, dtype=object), categories=self.product_types).codes
+
+    def line_mask(self, product_types):
+        """Masca booleană [comandă, linie] pentru o listă/Series de tipuri de produs (vectorizat)"""
+        self._ensure()
+        return self.matrix[self.codes(product_types)]
+
+    def compatible_positions(self, product_type):
+        """Pozițiile liniilor active compatibile cu un tip de produs"""
+        self._ensure()
+        code = self.type_codes.get(product_type, -1)
+        return np.flatnonzero(self.matrix[code])
+
+    def compatible_line_ids(self, product_type):
+        return [self.line_ids[position] for position in self.compatible_positions(product_type)]
+
+    def compatible_lines(self, product_type):
+        """Liniile compatibile ca listă de dict-uri (ordinea din tabel)"""
+        lines_df = self._ensure()
+        positions = self.compatible_positions(product_type)
+        return lines_df.iloc[positions].to_dict('records')
@@ -0,0 +1,159 @@
+"""
+🔧 Maintenance Windows
+Planned downtime per production line as blocked intervals: any number of
+windows per line, persisted to JSON, plus the line's MaintenanceScheduled
+date as a default window. The windows are subtracted from the line's shift
+calendar, so slot search, capacity and utilization skip them. A changed
+window reports the affected line and span for a local schedule repair.
+"""
+
+import os
+import json
+from datetime import timedelta
+
+import pandas as pd
+
+from shift_calendar import SHIFT_START_HOUR
+
+# Fereastra implicită pentru o dată MaintenanceScheduled fără oră
+DEFAULT_WINDOW_HOURS = 8
+
+# Separatorii din câmpul de editare: ferestre cu ';', început / sfârșit cu '..'
+WINDOW_SEPARATOR = ';'
+RANGE_SEPARATOR = '..'
+
+
+def default_window(date):
+    """Fereastra pentru o dată de mentenanță: de la ora din dată (sau începutul primului schimb)"""
+    start = pd.Timestamp(date)
+    if start == start.normalize():
+        start += timedelta(hours=SHIFT_START_HOUR)
+    return start, start + timedelta(hours=DEFAULT_WINDOW_HOURS)
+
+
+def parse_windows(text):
+    """'2025-08-01; 2025-08-15 06:00..2025-08-15 22:00' → [(start, end)] sortate"""
+    windows = []
+    for part in text.split(WINDOW_SEPARATOR):
+        part = part.strip()
+        if not part:
+            continue
+        if RANGE_SEPARATOR in part:
+            start, end = (pd.Timestamp(value.strip()) for value in part.split(RANGE_SEPARATOR, 1))
+            if end <= start:
+                raise ValueError(f"Maintenance window ends before it starts: {part}")
+            windows.append((start, end))
+        else:
+            windows.append(default_window(part))
+    return sorted(windows)
+
+
+def format_windows(windows):
+    return f"{WINDOW_SEPARATOR} ".join(
+        f"{start:%Y-%m-%d %H:%M}{RANGE_SEPARATOR}{end:%Y-%m-%d %H:%M}" for start, end in windows)
+
+
+class MaintenanceCalendar:
+    def __init__(self, state_path, lines_repository, calendar, on_change=None):
+        self.state_path = state_path
+        self.lines_repository = lines_repository
+        self.calendar = calendar            # shift_calendar.ShiftCalendar - ferestrele se scad din el
+        self.on_change = on_change          # on_change(line_id, calendar_anterior, început, sfârșit)
+
+        self.windows = self._read_state()   # LineID → [(start, end)] - ferestre explicite
+        self.implicit = {}                  # LineID → [(start, end)] - din MaintenanceScheduled
+
+        calendar.blocked_source = self
+        lines_repository.add_listener(self)
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return {line_id: [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in windows]
+                        for line_id, windows in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {line_id: [[start.isoformat(), end.isoformat()] for start, end in windows]
+                 for line_id, windows in self.windows.items()}
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    # Notificări de la TableRepository
+    def table_rebuilt(self, df):
+        self.implicit = {}
+        self.rows_inserted(df)
+        self.calendar.invalidate()
+
+    def rows_inserted(self, df):
+        if df.empty or 'MaintenanceScheduled' not in df.columns:
+            return
+        for line_id, date in zip(df['LineID'].tolist(), df['MaintenanceScheduled'].tolist()):
+            self.implicit[line_id] = [default_window(date)] if not pd.isna(date) else []
+            self.calendar.invalidate(line_id)
+
+    def row_updated(self, key, row):
+        date = row.get('MaintenanceScheduled')
+        implicit = [default_window(date)] if date is not None and not pd.isna(date) else []
+        if implicit != self.implicit.get(key, []):
+            previous, previous_calendar = self.for_line(key), self.calendar.line(key)
+            self.implicit[key] = implicit
+            self._changed(key, previous, previous_calendar)
+
+    def rows_deleted(self, keys):
+        for key in keys:
+            self.implicit.pop(key, None)
+            self.calendar.invalidate(key)
+
+    # Ferestre
+    def for_line(self, line_id):
+        """Ferestrele liniei: cele explicite, altfel cea din MaintenanceScheduled"""
+        self.lines_repository.frame()       # Reindexare dacă tabelul a fost înlocuit
+        return self.windows.get(line_id) or self.implicit.get(line_id, [])
+
+    def blocked_intervals(self, line_id):
+        """Ferestrele liniei în ns, pentru ShiftCalendar"""
+        return [(start.value, end.value) for start, end in self.for_line(line_id)]
+
+    def set_windows(self, line_id, windows):
+        """Înlocuiește ferestrele explicite ale unei linii (listă goală = revine la MaintenanceScheduled)"""
+        previous, previous_calendar = self.for_line(line_id), self.calendar.line(line_id)
+        windows = sorted((pd.Timestamp(start), pd.Timestamp(end)) for start, end in windows)
+        if windows:
+            self.windows[line_id] = windows
+        else:
+            self.windows.pop(line_id, None)
+        self._write_state()
+
+        if self.for_line(line_id) != previous:
+            self._changed(line_id, previous, previous_calendar)
+
+    def _changed(self, line_id, previous, previous_calendar):
+        """Recalculează calendarul liniei și raportează intervalul afectat (ferestre vechi ∪ noi)"""
+        self.calendar.invalidate(line_id)
+
+        changed = set(previous) ^ set(self.for_line(line_id))
+        if changed and self.on_change is not None:
+            start = min(window[0] for window in changed)
+            end = max(window[1] for window in changed)
+            self.on_change(line_id, previous_calendar, start, end)
+
+    def next_window(self, line_id, now):
+        """Prima fereastră care nu s-a terminat încă, sau None"""
+        now = pd.Timestamp(now)
+        return next((window for window in self.for_line(line_id) if window[1] > now), None)
+
+    def blocked_hours(self, line_id, t0, t1):
+        """Orele de mentenanță ale liniei în [t0, t1)"""
+        t0, t1 = pd.Timestamp(t0), pd.Timestamp(t1)
+        blocked = timedelta(0)
+        for start, end in self.for_line(line_id):
+            if start < t1 and end > t0:
+                blocked += min(end, t1) - max(start, t0)
+        return blocked.total_seconds() / 3600
@@ -0,0 +1,258 @@
+"""
+🔗 Order Dependencies
+Dependency DAG built from the orders' Dependencies column: adjacency sets,
+cycle detection and a topological order maintained incrementally
+(Pearce-Kelly) as orders are added, edited or deleted.
+"""
+
+import re
+from collections import deque
+
+import pandas as pd
+
+# Separatori acceptați în coloana Dependencies ("ORD-1, ORD-2" / "ORD-1;ORD-2")
+_SEPARATORS = re.compile(r'[,;\s]+')
+
+
+def parse_dependencies(value):
+    """Lista de OrderID-uri dintr-o celulă Dependencies (fără duplicate, ordinea păstrată)"""
+    if not isinstance(value, str):
+        return []
+    return list(dict.fromkeys(item for item in _SEPARATORS.split(value) if item))
+
+
+class DependencyGraph:
+    SNAPSHOT_FIELDS = ('prerequisites', 'dependents', 'declared', 'position', 'cyclic_edges', 'orders',
+                       '_next_position', '_order_cache')
+
+    def __init__(self, orders_repository=None):
+        self.orders_repository = orders_repository
+
+        self.prerequisites = {}     # OrderID → comenzile de care depinde (muchii din DAG)
+        self.dependents = {}        # OrderID → comenzile care depind de ea
+        self.declared = {}          # OrderID → dependențele declarate în tabel
+        self.position = {}          # OrderID → poziția în ordinea topologică
+        self.cyclic_edges = set()   # (prerequisite, dependent) respinse - ar închide un ciclu
+        self.orders = set()         # OrderID-urile existente în tabel
+
+        self._next_position = 0
+        self._order_cache = None
+
+        if orders_repository is not None:
+            orders_repository.add_listener(self)
+
+    # Notificări de la TableRepository
+    def table_rebuilt(self, df):
+        self.build(self._declared_from(df))
+
+    def rows_inserted(self, df):
+        for order_id, dependencies in self._declared_from(df).items():
+            self.set_dependencies(order_id, dependencies)
+
+    def row_updated(self, key, row):
+        order_id = row.get('OrderID', key)
+        if order_id != key:
+            self.remove_order(key)
+        self.set_dependencies(order_id, parse_dependencies(row.get('Dependencies')))
+
+    def rows_deleted(self, keys):
+        for key in keys:
+            self.remove_order(key)
+
+    @staticmethod
+    def _declared_from(df):
+        if df.empty or 'OrderID' not in df.columns:
+            return {}
+        dependencies = df['Dependencies'] if 'Dependencies' in df.columns else pd.Series('', index=df.index)
+        return {order_id: parse_dependencies(value)
+                for order_id, value in zip(df['OrderID'].tolist(), dependencies.tolist())}
+
+    def _sync(self):
+        if self.orders_repository is not None:
+            self.orders_repository.frame()
+
+    # Construire și actualizare
+    def _add_node(self, node):
+        if node not in self.position:
+            self.position[node] = self._next_position
+            self._next_position += 1
+            self.prerequisites[node] = set()
+            self.dependents[node] = set()
+            self._order_cache = None
+
+    def build(self, declared):
+        """Construiește graful complet (Kahn); muchiile din cicluri sunt apoi verificate una câte una"""
+        self.prerequisites, self.dependents, self.position = {}, {}, {}
+        self.cyclic_edges = set()
+        self.declared = {order_id: list(dependencies) for order_id, dependencies in declared.items()}
+        self.orders = set(declared)
+        self._next_position = 0
+        self._order_cache = None
+
+        nodes = dict.fromkeys(declared)
+        for dependencies in declared.values():
+            nodes.update(dict.fromkeys(dependencies))
+
+        in_degree = dict.fromkeys(nodes, 0)
+        outgoing = {node: [] for node in nodes}
+        for order_id, dependencies in declared.items():
+            for prerequisite in dependencies:
+                if prerequisite != order_id:
+                    outgoing[prerequisite].append(order_id)
+                    in_degree[order_id] += 1
+
+        queue = deque(node for node, degree in in_degree.items() if degree == 0)
+        while queue:
+            node = queue.popleft()
+            self._add_node(node)
+            for dependent in outgoing[node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        # Nodurile rămase sunt în (sau după) un ciclu - pozițiile lor vin după toate celelalte
+        for node in nodes:
+            self._add_node(node)
+
+        for order_id, dependencies in declared.items():
+            for prerequisite in dependencies:
+                self._add_edge(prerequisite, order_id)
+
+    def set_dependencies(self, order_id, dependencies):
+        """Înlocuiește dependențele unei comenzi (muchiile vechi sunt scoase, cele noi adăugate)"""
+        if order_id not in self.orders:
+            # Un nod deja referit (dependență lipsă) devine comandă - intră în ordinea topologică
+            self.orders.add(order_id)
+            self._order_cache = None
+        self._add_node(order_id)
+
+        old = set(self.declared.get(order_id, []))
+        self.declared[order_id] = list(dependencies)
+        new = set(dependencies)
+
+        for prerequisite in old - new:
+            self._remove_edge(prerequisite, order_id)
+            self._prune(prerequisite)
+        for prerequisite in dependencies:
+            if prerequisite not in old:
+                self._add_node(prerequisite)
+                self._add_edge(prerequisite, order_id)
+
+        if old - new:
+            self._retry_cyclic_edges()
+
+    def remove_order(self, order_id):
+        """Scoate dependențele comenzii; nodul rămâne doar dacă alte comenzi încă îl referă"""
+        self.orders.discard(order_id)
+        self._order_cache = None
+        prerequisites = self.declared.pop(order_id, [])
+        for prerequisite in prerequisites:
+            self._remove_edge(prerequisite, order_id)
+
+        for node in [order_id] + prerequisites:
+            self._prune(node)
+        self._retry_cyclic_edges()
+
+    def _prune(self, node):
+        """Scoate un nod care nu e comandă și nu mai e referit de nicio comandă"""
+        if node in self.position and node not in self.orders and not self.dependents[node] and \
+                not any(edge[0] == node for edge in self.cyclic_edges):
+            del self.position[node], self.prerequisites[node], self.dependents[node]
+            self._order_cache = None
+
+    def _remove_edge(self, prerequisite, dependent):
+        if (prerequisite, dependent) in self.cyclic_edges:
+            self.cyclic_edges.discard((prerequisite, dependent))
+        elif dependent in self.dependents.get(prerequisite, ()):
+            self.dependents[prerequisite].discard(dependent)
+            self.prerequisites[dependent].discard(prerequisite)
+
+    def _retry_cyclic_edges(self):
+        """După ștergerea unor muchii, unele muchii respinse pot să nu mai închidă un ciclu"""
+        for prerequisite, dependent in list(self.cyclic_edges):
+            self.cyclic_edges.discard((prerequisite, dependent))
+            self._add_edge(prerequisite, dependent)
+
+    def _add_edge(self, prerequisite, dependent):
+        """Adaugă muchia prerequisite → dependent, reordonând doar regiunea afectată (Pearce-Kelly)"""
+        if dependent in self.dependents[prerequisite]:
+            return True
+        if prerequisite == dependent:
+            self.cyclic_edges.add((prerequisite, dependent))
+            return False
+
+        lower, upper = self.position[dependent], self.position[prerequisite]
+        if lower < upper:
+            forward = self._reach(dependent, self.dependents, lambda node: self.position[node] <= upper)
+            if prerequisite in forward:
+                self.cyclic_edges.add((prerequisite, dependent))
+                return False
+
+            backward = self._reach(prerequisite, self.prerequisites, lambda node: self.position[node] >= lower)
+            affected = (sorted(backward, key=self.position.get) +
+                        sorted(forward, key=self.position.get))
+            slots = sorted(self.position[node] for node in affected)
+            self.position.update(zip(affected, slots))
+            self._order_cache = None
+
+        self.dependents[prerequisite].add(dependent)
+        self.prerequisites[dependent].add(prerequisite)
+        return True
+
+    @staticmethod
+    def _reach(start, adjacency, allowed):
+        """Nodurile accesibile din start (inclusiv) prin noduri care respectă `allowed`"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbour in adjacency[stack.pop()]:
+                if neighbour not in seen and allowed(neighbour):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return seen
+
+    # Interogări
+    def topological_order(self):
+        """OrderID-urile în ordinea de precedență (dependențele înaintea comenzilor dependente)"""
+        self._sync()
+        if self._order_cache is None:
+            self._order_cache = [node for node in sorted(self.position, key=self.position.get)
+                                 if node in self.orders]
+        return self._order_cache
+
+    def rank(self, order_ids):
+        """Poziția topologică pentru fiecare OrderID (pentru sortarea vectorizată a comenzilor)"""
+        self._sync()
+        return [self.position.get(order_id, -1) for order_id in order_ids]
+
+    def prerequisites_of(self, order_id):
+        self._sync()
+        return set(self.declared.get(order_id, []))
+
+    def dependents_of(self, order_id):
+        """Comenzile care depind direct de ea (doar muchiile acceptate în DAG)"""
+        self._sync()
+        return set(self.dependents.get(order_id, ()))
+
+    def ancestors(self, order_id):
+        """Toate comenzile de care depinde (direct sau indirect) - O(V + E)"""
+        self._sync()
+        if order_id not in self.position:
+            return set()
+        return self._reach(order_id, self.prerequisites, lambda node: True) - {order_id}
+
+    def descendants(self, order_id):
+        """Toate comenzile care depind de ea (direct sau indirect) - O(V + E)"""
+        self._sync()
+        if order_id not in self.position:
+            return set()
+        return self._reach(order_id, self.dependents, lambda node: True) - {order_id}
+
+    def missing_dependencies(self):
+        """Dependențele care referă comenzi inexistente"""
+        self._sync()
+        return {node for node in self.position if node not in self.orders}
+
+    def has_cycles(self):
+        self._sync()
+        return bool(self.cyclic_edges)
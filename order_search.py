@@ -0,0 +1,177 @@
+"""
+🔎 Order Search
+Inverted trigram index over the orders' text fields (ProductName, CustomerName,
+OrderID, Notes). Substring and prefix searches intersect sorted posting arrays
+and verify only the surviving candidates. Kept in step with order edits.
+"""
+
+from array import array
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ['ProductName', 'CustomerName', 'OrderID', 'Notes']
+
+# Marcaj de început de câmp - face ca prefixele de 1-2 caractere să aibă propriile trigrame
+_START = '\x02\x02'
+
+
+def normalize(value):
+    """Textul căutabil al unei valori (lowercase, fără spații la capete)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return str(value).lower().strip()
+
+
+def _trigrams(text):
+    padded = _START + text
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class OrderSearchIndex:
+    SNAPSHOT_FIELDS = ('postings', 'fields', 'keys', 'codes', 'dead', '_dirty')
+
+    def __init__(self, orders_repository=None, compact_ratio=1.0):
+        self.orders_repository = orders_repository
+        self.compact_ratio = compact_ratio      # Compactare când documentele moarte depășesc acest raport
+
+        self.postings = {}          # trigramă → array('I') de coduri document (crescătoare)
+        self.fields = []            # cod document → câmpurile normalizate (None = versiune ștearsă)
+        self.keys = []              # cod document → OrderID
+        self.codes = {}             # OrderID → codul documentului curent
+        self.dead = 0
+        self._dirty = True          # Construirea completă se face la prima căutare
+        self._source = None
+
+        if orders_repository is not None:
+            orders_repository.add_listener(self)
+
+    # Notificări de la TableRepository
+    def table_rebuilt(self, df):
+        self._dirty = True
+
+    def rows_inserted(self, df):
+        if not self._dirty:
+            self._add_frame(df)
+
+    def row_updated(self, key, row):
+        if not self._dirty:
+            self._remove(key)
+            self._add(row.get('OrderID', key), [normalize(row.get(field)) for field in SEARCH_FIELDS])
+
+    def rows_deleted(self, keys):
+        if not self._dirty:
+            for key in keys:
+                self._remove(key)
+
+    # Construire
+    def build(self, df):
+        """Indexează tot tabelul (normalizarea coloanelor se face vectorizat, o singură dată)"""
+        self.postings, self.fields, self.keys, self.codes = {}, [], [], {}
+        self.dead = 0
+        self._add_frame(df)
+        self._source = df
+        self._dirty = False
+
+    def _add_frame(self, df):
+        if df.empty or 'OrderID' not in df.columns:
+            return
+
+        columns = []
+        for field in SEARCH_FIELDS:
+            if field in df.columns:
+                column = df[field].astype(object)
+                columns.append(column.where(column.notna(), '').astype(str).str.lower().str.strip().tolist())
+            else:
+                columns.append([''] * len(df))
+
+        for key, fields in zip(df['OrderID'].tolist(), zip(*columns)):
+            self._add(key, list(fields))
+
+    def _add(self, key, fields):
+        if key in self.codes:
+            self._remove(key)
+
+        code = len(self.fields)
+        self.fields.append(tuple(fields))
+        self.keys.append(key)
+        self.codes[key] = code
+
+        grams = set()
+        for text in fields:
+            grams |= _trigrams(text)
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array('I')
+            posting.append(code)
+
+    def _remove(self, key):
+        """Versiunea veche rămâne în postări ca document mort până la compactare"""
+        code = self.codes.pop(key, None)
+        if code is None:
+            return
+
+        self.fields[code] = None
+        self.dead += 1
+        if self.dead > self.compact_ratio * max(1, len(self.codes)):
+            self._compact()
+
+    def _compact(self):
+        alive = [(self.keys[code], self.fields[code]) for code in sorted(self.codes.values())]
+        self.postings, self.fields, self.keys, self.codes = {}, [], [], {}
+        self.dead = 0
+        for key, fields in alive:
+            self._add(key, fields)
+
+    def _ensure(self):
+        if self.orders_repository is not None:
+            df = self.orders_repository.frame()
+            if self._dirty:
+                self.build(df)
+        elif self._dirty and self._source is not None:
+            self.build(self._source)
+
+    # Căutare
+    def _candidates(self, grams):
+        """Intersecția postărilor (cele mai scurte primele); gol dacă o trigramă lipsește"""
+        postings = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+
+        postings.sort(key=len)
+        result = np.frombuffer(postings[0], dtype=np.uint32)
+        for posting in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, np.frombuffer(posting, dtype=np.uint32), assume_unique=True)
+        # Lista eliberează view-urile peste array-uri (altfel nu mai pot primi coduri noi)
+        return result.tolist()
+
+    def search(self, term, prefix=False):
+        """OrderID-urile care conțin `term` (sau încep cu el, cu prefix=True) în oricare câmp"""
+        self._ensure()
+        term = normalize(term)
+        if not term:
+            return set(self.codes)
+
+        if prefix:
+            grams = _trigrams(term)
+            match = lambda text: text.startswith(term)
+        elif len(term) >= 3:
+            grams = {term[i:i + 3] for i in range(len(term) - 2)}
+            match = lambda text: term in text
+        else:
+            # Sub 3 caractere nu există trigramă - verificare directă pe textele normalizate
+            return {self.keys[code] for code in self.codes.values()
+                    if any(term in text for text in self.fields[code])}
+
+        result = set()
+        for code in self._candidates(grams):
+            fields = self.fields[code]
+            if fields is not None and any(match(text) for text in fields):
+                result.add(self.keys[code])
+        return result
@@ -11,12 +11,16 @@ import math
 import random
 
 class OrdersAnalytics:
-    def __init__(self, parent, orders_df, production_lines_df, schedule_df, production_metrics):
+    def __init__(self, parent, orders_df, production_lines_df, schedule_df, production_metrics, due_index=None,
+                 customers=None, products=None):
         self.parent = parent
         self.orders_df = orders_df
         self.production_lines_df = production_lines_df
         self.schedule_df = schedule_df
         self.production_metrics = production_metrics
+        self.due_index = due_index  # Index pe DueDate (opțional) - întârzieri fără scanare
+        self.customers = customers  # dimensions.Dimension pe CustomerName (opțional) - chei întregi
+        self.products = products    # dimensions.Dimension pe ProductName (opțional)
 
         # Creează fereastra
         self.window = tk.Toplevel(parent)
@@ -298,7 +302,16 @@ class OrdersAnalytics:
         top_customers = self.get_top_customers()
         self.create_top_customers_table(top_customers_frame, top_customers)
 
-        # 2. Customer Performance
+        # 2. Top Products
+        top_products_frame = tk.LabelFrame(customer_content, text="📦 Top Products",
+                                         bg='#16213e', fg='#00d4aa',
+                                         font=('Segoe UI', 12, 'bold'))
+        top_products_frame.pack(fill=tk.X, pady=(0, 20))
+
+        top_products = self.get_top_products()
+        self.create_top_customers_table(top_products_frame, top_products, 'ProductName', "Product")
+
+        # 3. Customer Performance
         customer_perf_frame = tk.LabelFrame(customer_content, text="📊 Customer Performance",
                                           bg='#16213e', fg='#00d4aa',
                                           font=('Segoe UI', 12, 'bold'))
@@ -392,7 +405,7 @@ class OrdersAnalytics:
             stats['completed'] = len(self.orders_df[self.orders_df['Progress'] == 100])
             stats['completion_rate'] = (stats['completed'] / stats['total_orders'] * 100) if stats['total_orders'] > 0 else 0
             stats['in_progress'] = len(self.orders_df[(self.orders_df['Progress'] > 0) & (self.orders_df['Progress'] < 100)])
-            stats['overdue'] = len(self.orders_df[pd.to_datetime(self.orders_df['DueDate']) < datetime.now()])
+            stats['overdue'] = self.count_overdue()
             stats['critical'] = len(self.orders_df[self.orders_df['Priority'] == 'Critical'])
             stats['avg_progress'] = self.orders_df['Progress'].mean()
 
@@ -402,7 +415,7 @@ class OrdersAnalytics:
             # Calculate efficiency based on completion rate and on-time delivery
             on_time_orders = len(self.orders_df[
                 (self.orders_df['Progress'] == 100) &
-                (pd.to_datetime(self.orders_df['DueDate']) >= datetime.now())
+                (self.orders_df['DueDate'] >= datetime.now())
             ])
             stats['efficiency'] = (on_time_orders / stats['total_orders'] * 100) if stats['total_orders'] > 0 else 0
 
@@ -416,12 +429,19 @@ class OrdersAnalytics:
                 'avg_progress': 0, 'total_value': 0, 'efficiency': 0
             }
 
+    def count_overdue(self):
+        """Comenzile cu termenul depășit (din indexul de termene, dacă există)"""
+        if self.due_index is not None:
+            return self.due_index.overdue_count(open_only=False)
+        return len(self.orders_df[self.orders_df['DueDate'] < datetime.now()])
+
     def get_status_distribution(self):
         """Obține distribuția statusurilor"""
         if self.orders_df.empty:
             return []
 
         status_counts = self.orders_df['Status'].value_counts()
+        status_counts = status_counts[status_counts > 0]
         colors = {
             'Planned': '#0078ff',
             'In Progress': '#ffa502',
@@ -440,6 +460,7 @@ class OrdersAnalytics:
             return []
 
         priority_counts = self.orders_df['Priority'].value_counts()
+        priority_counts = priority_counts[priority_counts > 0]
         colors = {
             'Critical': '#ff4757',
             'High': '#ff6b35',
@@ -474,7 +495,7 @@ class OrdersAnalytics:
             total_orders = len(self.orders_df)
 
             if len(completed_orders) > 0:
-                on_time_completed = len(completed_orders[pd.to_datetime(completed_orders['DueDate']) >= datetime.now()])
+                on_time_completed = len(completed_orders[completed_orders['DueDate'] >= datetime.now()])
                 on_time_rate = (on_time_completed / len(completed_orders)) * 100
             else:
                 on_time_rate = 0
@@ -482,7 +503,7 @@ class OrdersAnalytics:
             # Calculate average lead time (simulated)
             avg_lead_time = 8.5 + random.uniform(-2, 3)
 
-            overdue_count = len(self.orders_df[pd.to_datetime(self.orders_df['DueDate']) < datetime.now()])
+            overdue_count = self.count_overdue()
             overdue_rate = (overdue_count / total_orders * 100) if total_orders > 0 else 0
 
             # Trend analysis (simulated)
@@ -511,19 +532,40 @@ class OrdersAnalytics:
 
     def get_top_customers(self):
         """Obține top clienții"""
-        if self.orders_df.empty:
+        return self.get_top_by_dimension('CustomerName', 'CustomerKey', self.customers)
+
+    def get_top_products(self):
+        """Obține top produsele"""
+        return self.get_top_by_dimension('ProductName', 'ProductKey', self.products)
+
+    def dimension_keys(self, column, dimension):
+        """Cheile întregi ale comenzilor și numele lor - din dimensiune dacă e construită pe același tabel"""
+        if dimension is not None and dimension.orders_repository.frame() is self.orders_df:
+            return dimension.codes(), dimension.names
+
+        values = self.orders_df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        return values.cat.codes.to_numpy(), values.cat.categories
+
+    def get_top_by_dimension(self, column, key_name, dimension, limit=10):
+        """Top `limit` după numărul de comenzi - grupare pe chei întregi, numele se atașează doar la final"""
+        if self.orders_df.empty or column not in self.orders_df.columns:
             return []
 
-        customer_stats = self.orders_df.groupby('CustomerName').agg({
+        keys, names = self.dimension_keys(column, dimension)
+        stats = self.orders_df.groupby(pd.Series(keys, index=self.orders_df.index, name=key_name)).agg({
             'OrderID': 'count',
             'Progress': 'mean',
             'Quantity': 'sum'
         }).round(1)
 
-        customer_stats.columns = ['Orders', 'Avg_Progress', 'Total_Quantity']
-        customer_stats = customer_stats.sort_values('Orders', ascending=False).head(10)
+        stats.columns = ['Orders', 'Avg_Progress', 'Total_Quantity']
+        stats = stats[stats.index >= 0]
+        stats = stats.sort_values('Orders', ascending=False).head(limit)
+        stats.insert(0, column, [names[key] for key in stats.index])
 
-        return customer_stats.reset_index().to_dict('records')
+        return stats.reset_index(drop=True).to_dict('records')
 
     def generate_recommendations(self):
         """Generează recomandări"""
@@ -727,10 +769,10 @@ class OrdersAnalytics:
             tk.Label(table_frame, text=line['Status'],
                     font=('Segoe UI', 9), fg=status_color, bg='#16213e').grid(row=idx+1, column=3, padx=10, pady=2)
 
-    def create_top_customers_table(self, parent, customers_data):
-        """Creează tabelul cu top clienți"""
+    def create_top_customers_table(self, parent, customers_data, name_column='CustomerName', name_header="Customer"):
+        """Creează tabelul cu top clienți (sau top produse, cu name_column='ProductName')"""
         if not customers_data:
-            tk.Label(parent, text="No customer data available",
+            tk.Label(parent, text=f"No {name_header.lower()} data available",
                     font=('Segoe UI', 12), fg='#ff6b35', bg='#16213e').pack(pady=20)
             return
 
@@ -738,14 +780,14 @@ class OrdersAnalytics:
         table_frame.pack(fill=tk.X, padx=20, pady=20)
 
         # Headers
-        headers = ["Customer", "Orders", "Avg Progress", "Total Quantity"]
+        headers = [name_header, "Orders", "Avg Progress", "Total Quantity"]
         for i, header in enumerate(headers):
             tk.Label(table_frame, text=header, font=('Segoe UI', 10, 'bold'),
                     fg='#00d4aa', bg='#16213e').grid(row=0, column=i, padx=10, pady=5)
 
         # Data rows
         for idx, customer in enumerate(customers_data[:5]):
-            tk.Label(table_frame, text=customer['CustomerName'][:20],
+            tk.Label(table_frame, text=customer[name_column][:20],
                     font=('Segoe UI', 9), fg='#ffffff', bg='#16213e').grid(row=idx+1, column=0, padx=10, pady=2)
 
             tk.Label(table_frame, text=str(customer['Orders']),
@@ -806,8 +848,12 @@ class OrdersAnalytics:
         deadlines_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         # Get upcoming deadlines
-        future_orders = self.orders_df[pd.to_datetime(self.orders_df['DueDate']) > datetime.now()]
-        upcoming = future_orders.nsmallest(5, 'DueDate') if not future_orders.empty else pd.DataFrame()
+        if self.due_index is not None:
+            upcoming_ids = [order_id for _, order_id in self.due_index.upcoming(5, open_only=False)]
+            upcoming = self.orders_df[self.orders_df['OrderID'].isin(upcoming_ids)].sort_values('DueDate')
+        else:
+            future_orders = self.orders_df[self.orders_df['DueDate'] > datetime.now()]
+            upcoming = future_orders.nsmallest(5, 'DueDate') if not future_orders.empty else pd.DataFrame()
 
         if upcoming.empty:
             tk.Label(deadlines_frame, text="No upcoming deadlines",
@@ -817,7 +863,7 @@ class OrdersAnalytics:
                 deadline_item = tk.Frame(deadlines_frame, bg='#0f3460', relief='solid', bd=1)
                 deadline_item.pack(fill=tk.X, pady=5)
 
-                due_date = pd.to_datetime(order['DueDate'])
+                due_date = order['DueDate']
                 days_left = (due_date - datetime.now()).days
 
                 color = '#ff4757' if days_left <= 3 else '#ffa502' if days_left <= 7 else '#2ecc71'
@@ -910,7 +956,7 @@ class OrdersAnalytics:
 
                     if not self.orders_df.empty:
                         status_dist = self.orders_df['Status'].value_counts()
-                        for status, count in status_dist.items():
+                        for status, count in status_dist[status_dist > 0].items():
                             f.write(f"{status}: {count}\n")
 
                 messagebox.showinfo("Export Complete", f"Analytics exported to:\n{filename}")
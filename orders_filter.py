@@ -8,13 +8,22 @@ from tkinter import ttk, messagebox
 import pandas as pd
 from datetime import datetime, timedelta
 
+import order_search
+
 class OrdersFilter:
-    def __init__(self, parent, orders_df, production_lines_df, on_filter_applied):
+    def __init__(self, parent, orders_df, production_lines_df, on_filter_applied, search_index=None, due_index=None):
         self.parent = parent
         self.orders_df = orders_df
         self.production_lines_df = production_lines_df
         self.on_filter_applied = on_filter_applied  # Callback function
 
+        # Index de trigrame pentru căutare (primit de la aplicație sau construit local)
+        if search_index is None:
+            search_index = order_search.OrderSearchIndex()
+            search_index.build(orders_df)
+        self.search_index = search_index
+        self.due_index = due_index  # Index pe DueDate (opțional)
+
         # Creează fereastra
         self.window = tk.Toplevel(parent)
         self.window.title("🔍 Advanced Orders Filter")
@@ -594,33 +603,11 @@ class OrdersFilter:
         if search_term:
             print(f"🔍 Searching for: '{search_term}'")
 
-            # CASE-INSENSITIVE search cu spații îndepărtate
-            search_term_clean = search_term.lower().strip()
-
             try:
-                # Convertește toate coloanele la string și face lowercase
-                product_search = filtered_df['ProductName'].astype(str).str.lower().str.strip().str.contains(search_term_clean, case=False, na=False, regex=False)
-                customer_search = filtered_df['CustomerName'].astype(str).str.lower().str.strip().str.contains(search_term_clean, case=False, na=False, regex=False)
-                order_id_search = filtered_df['OrderID'].astype(str).str.lower().str.strip().str.contains(search_term_clean, case=False, na=False, regex=False)
-
-                # Verifică și Notes dacă există coloana
-                if 'Notes' in filtered_df.columns:
-                    notes_search = filtered_df['Notes'].astype(str).str.lower().str.strip().str.contains(search_term_clean, case=False, na=False, regex=False)
-                    search_mask = product_search | customer_search | order_id_search | notes_search
-                else:
-                    search_mask = product_search | customer_search | order_id_search
-
-                # DEBUG: Afișează rezultatele căutării
-                matches_found = search_mask.sum()
-                print(f"   Found {matches_found} matches")
-
-                if matches_found == 0:
-                    print("   🔍 Debug - Available data:")
-                    print(f"   ProductNames: {filtered_df['ProductName'].tolist()}")
-                    print(f"   CustomerNames: {filtered_df['CustomerName'].tolist()}")
-                    print(f"   OrderIDs: {filtered_df['OrderID'].tolist()}")
-
-                filtered_df = filtered_df[search_mask]
+                # Candidații vin din indexul de trigrame - fără normalizarea coloanelor la fiecare tastă
+                matching_ids = self.search_index.search(search_term)
+                filtered_df = filtered_df[filtered_df['OrderID'].isin(matching_ids)]
+                print(f"   Found {len(filtered_df)} matches")
 
             except Exception as e:
                 print(f"❌ Error in search: {e}")
@@ -662,21 +649,21 @@ class OrdersFilter:
 
             try:
                 if date_filter == "today":
-                    filtered_df = filtered_df[pd.to_datetime(filtered_df['OrderDate']).dt.date == today.date()]
+                    filtered_df = filtered_df[filtered_df['OrderDate'].dt.date == today.date()]
                 elif date_filter == "this_week":
                     week_start = today - timedelta(days=today.weekday())
-                    filtered_df = filtered_df[pd.to_datetime(filtered_df['OrderDate']) >= week_start]
+                    filtered_df = filtered_df[filtered_df['OrderDate'] >= week_start]
                 elif date_filter == "this_month":
                     month_start = today.replace(day=1)
-                    filtered_df = filtered_df[pd.to_datetime(filtered_df['OrderDate']) >= month_start]
+                    filtered_df = filtered_df[filtered_df['OrderDate'] >= month_start]
                 elif date_filter == "overdue":
-                    filtered_df = filtered_df[pd.to_datetime(filtered_df['DueDate']) < today]
+                    filtered_df = filtered_df[filtered_df['DueDate'] < today]
                 elif date_filter == "custom":
                     start_date = datetime.strptime(self.custom_start_date.get(), '%Y-%m-%d')
                     end_date = datetime.strptime(self.custom_end_date.get(), '%Y-%m-%d')
                     filtered_df = filtered_df[
-                        (pd.to_datetime(filtered_df['OrderDate']) >= start_date) &
-                        (pd.to_datetime(filtered_df['OrderDate']) <= end_date)
+                        (filtered_df['OrderDate'] >= start_date) &
+                        (filtered_df['OrderDate'] <= end_date)
                     ]
             except Exception as e:
                 print(f"❌ Error in date filtering: {e}")
@@ -684,7 +671,10 @@ class OrdersFilter:
         # 9. Overdue only filter
         if self.show_overdue_only.get():
             try:
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['DueDate']) < datetime.now()]
+                if self.due_index is not None:
+                    filtered_df = filtered_df[filtered_df['OrderID'].isin(self.due_index.overdue(open_only=False))]
+                else:
+                    filtered_df = filtered_df[filtered_df['DueDate'] < datetime.now()]
             except Exception as e:
                 print(f"❌ Error in overdue filtering: {e}")
 
@@ -706,6 +696,7 @@ class OrdersFilter:
 
                 # Status breakdown
                 status_breakdown = filtered_df['Status'].value_counts()
+                status_breakdown = status_breakdown[status_breakdown > 0]
                 status_text = " | ".join([f"{status}: {count}" for status, count in status_breakdown.head(3).items()])
 
                 self.results_text.set(
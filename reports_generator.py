@@ -11,7 +11,8 @@ import json
 import os
 
 class ReportsGenerator:
-    def __init__(self, parent, production_metrics, production_lines_df, orders_df, schedule_df, baseline_metrics, optimization_vars):
+    def __init__(self, parent, production_metrics, production_lines_df, orders_df, schedule_df, baseline_metrics, optimization_vars,
+                 history_loader=None):
         self.parent = parent
         self.production_metrics = production_metrics
         self.production_lines_df = production_lines_df
@@ -19,6 +20,7 @@ class ReportsGenerator:
         self.schedule_df = schedule_df
         self.baseline_metrics = baseline_metrics
         self.optimization_vars = optimization_vars
+        self.history_loader = history_loader  # Încarcă istoricul arhivat doar pentru perioade mai vechi
 
         # Creează fereastra principală
         self.window = tk.Toplevel(parent)
@@ -506,6 +508,30 @@ class ReportsGenerator:
             return {'total': 0, 'completed': 0, 'completion_rate': 0, 'in_progress': 0, 'overdue': 0,
                     'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
 
+    def get_report_schedule(self):
+        """Programările pentru perioada selectată (partițiile arhivate se încarcă la cerere)"""
+        days = {'last_week': 7, 'last_month': 30}.get(self.date_range.get())
+        if days is None or self.history_loader is None:
+            return self.schedule_df
+
+        end = datetime.now()
+        return self.history_loader(end - timedelta(days=days), end)
+
+    def calculate_schedule_stats(self, schedule_df):
+        """Calculează statistici programări pentru perioada raportului"""
+        if schedule_df.empty:
+            return {'period': self.date_range.get(), 'entries': 0, 'scheduled_hours': 0, 'by_status': {}}
+
+        durations = (schedule_df['EndDateTime'] - schedule_df['StartDateTime']).dt.total_seconds() / 3600
+        status_counts = schedule_df['Status'].value_counts()
+
+        return {
+            'period': self.date_range.get(),
+            'entries': len(schedule_df),
+            'scheduled_hours': round(float(durations.sum()), 1),
+            'by_status': {str(status): int(count) for status, count in status_counts.items() if count > 0}
+        }
+
     def calculate_recommendations(self):
         """Calculează recomandări"""
         recommendations = []
@@ -696,7 +722,8 @@ class ReportsGenerator:
                 'minimize_setup': self.optimization_vars['minimize_setup'].get()
             },
             'recommendations': self.calculate_recommendations(),
-            'order_statistics': self.calculate_order_stats()
+            'order_statistics': self.calculate_order_stats(),
+            'schedule_statistics': self.calculate_schedule_stats(self.get_report_schedule())
         }
 
         with open(filename, 'w', encoding='utf-8') as f:
@@ -718,6 +745,11 @@ class ReportsGenerator:
                 if hasattr(self, 'orders_df') and not self.orders_df.empty:
                     self.orders_df.to_excel(writer, sheet_name='Orders', index=False)
 
+                # Schedule Sheet - perioada selectată, inclusiv istoricul arhivat
+                schedule_df = self.get_report_schedule()
+                if not schedule_df.empty:
+                    schedule_df.to_excel(writer, sheet_name='Schedule', index=False)
+
                 # Summary Sheet
                 summary_data = {
                     'Metric': ['Total Orders', 'Active Lines', 'Overall Efficiency', 'On-Time Delivery'],
@@ -0,0 +1,96 @@
+"""
+💾 Save Worker
+Background persistence thread with write coalescing, off the Tk main thread
+"""
+
+import queue
+import threading
+import time
+
+
+class BackgroundSaveWorker:
+    def __init__(self, save_function, coalesce_delay=0.5):
+        self.save_function = save_function      # Apelată pe thread-ul worker cu snapshot-ul
+        self.coalesce_delay = coalesce_delay    # Fereastra de grupare a salvărilor în rafală
+
+        self.results = queue.Queue()            # Rezultate pentru UI (citite cu root.after)
+        self.lock = threading.Condition()
+        self.pending = None
+        self.saving = False
+        self.running = True
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def request_save(self, snapshot):
+        """Programează salvarea unui snapshot; cererile în rafală sunt unite într-o singură scriere"""
+        with self.lock:
+            if self.pending is None:
+                self.pending = dict(snapshot)
+            else:
+                # Tabelele mai noi le înlocuiesc pe cele vechi
+                self.pending.update(snapshot)
+            self.lock.notify_all()
+
+    @property
+    def is_dirty(self):
+        """Există modificări care nu au ajuns încă pe disc"""
+        with self.lock:
+            return self.pending is not None or self.saving
+
+    def poll_results(self):
+        """Rezultatele salvărilor terminate (non-blocking)"""
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def flush(self, timeout=30):
+        """Așteaptă până când toate salvările programate sunt scrise"""
+        deadline = time.time() + timeout
+        with self.lock:
+            while self.pending is not None or self.saving:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.lock.notify_all()
+                self.lock.wait(remaining)
+        return True
+
+    def stop(self, timeout=30):
+        """Scrie ce a rămas și oprește worker-ul"""
+        flushed = self.flush(timeout)
+        with self.lock:
+            self.running = False
+            self.lock.notify_all()
+        return flushed
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while self.pending is None and self.running:
+                    self.lock.wait()
+                if not self.running and self.pending is None:
+                    return
+
+            # Lasă rafala să se termine înainte de scriere
+            time.sleep(self.coalesce_delay)
+
+            with self.lock:
+                snapshot = self.pending
+                self.pending = None
+                self.saving = True
+
+            started = time.time()
+            try:
+                self.save_function(snapshot)
+                self.results.put(('ok', sorted(snapshot.keys()), time.time() - started))
+            except Exception as e:
+                print(f"❌ Eroare în worker-ul de salvare: {e}")
+                self.results.put(('error', str(e), time.time() - started))
+            finally:
+                with self.lock:
+                    self.saving = False
+                    self.lock.notify_all()
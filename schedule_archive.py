@@ -0,0 +1,143 @@
+"""
+🗄️ Schedule Archive
+Cold archive for completed and past schedule entries, partitioned by month.
+Only the active horizon stays in memory; archived months load lazily on demand.
+"""
+
+import os
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import storage_backend
+
+# Statusuri închise - pot fi arhivate imediat după terminare
+CLOSED_STATUSES = ('Completed', 'Cancelled')
+
+
+class ScheduleArchive:
+    def __init__(self, archive_dir, history_days=7, cache_partitions=6):
+        self.archive_dir = archive_dir
+        self.history_days = history_days            # Zile din trecut păstrate în setul activ
+        self.cache_partitions = cache_partitions    # Partiții lunare păstrate în memorie
+
+        # Parquet (compact) pentru arhivă; fallback Excel fără pyarrow
+        self.storage = storage_backend.create_storage_backend(archive_dir, preferred='parquet')
+        self.manifest_path = os.path.join(archive_dir, 'manifest.json')
+        self.manifest = self._read_manifest()
+        self._cache = OrderedDict()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _partition_name(month):
+        return f"schedule_{month}"
+
+    def horizon_start(self, now=None):
+        """Începutul orizontului activ - tot ce s-a terminat înainte e istoric"""
+        return (now or datetime.now()) - timedelta(days=self.history_days)
+
+    def cold_mask(self, schedule_df, now=None):
+        """Programările care pot fi mutate în arhivă"""
+        if schedule_df.empty:
+            return pd.Series(False, index=schedule_df.index)
+
+        now = now or datetime.now()
+        ended = schedule_df['EndDateTime'] < now
+        closed = schedule_df['Status'].isin(CLOSED_STATUSES)
+        stale = schedule_df['EndDateTime'] < self.horizon_start(now)
+        return (ended & closed) | stale
+
+    def archive_cold(self, schedule_df, now=None):
+        """Mută programările istorice în partițiile lunare și întoarce setul activ"""
+        mask = self.cold_mask(schedule_df, now)
+        if not mask.any():
+            return schedule_df, 0
+
+        cold_df = schedule_df[mask]
+        months = cold_df['StartDateTime'].dt.strftime('%Y-%m')
+
+        for month, month_df in cold_df.groupby(months):
+            self._append_partition(month, month_df)
+
+        self._write_manifest()
+        print(f"🗄️ {len(cold_df)} programări arhivate în {months.nunique()} partiții lunare")
+        return schedule_df[~mask].reset_index(drop=True), len(cold_df)
+
+    def _append_partition(self, month, month_df):
+        """Adaugă rânduri într-o partiție lunară (ultima versiune a unui ScheduleID câștigă)"""
+        existing = self.load_month(month)
+        if existing is not None:
+            month_df = pd.concat([existing, month_df], ignore_index=True)
+            month_df = month_df.drop_duplicates('ScheduleID', keep='last').reset_index(drop=True)
+
+        self.storage.save_table(self._partition_name(month), month_df)
+        self._cache.pop(month, None)
+
+        self.manifest[month] = {
+            'rows': len(month_df),
+            'min_start': month_df['StartDateTime'].min().isoformat(),
+            'max_end': month_df['EndDateTime'].max().isoformat()
+        }
+
+    def load_month(self, month):
+        """Încarcă o partiție lunară (cu cache LRU)"""
+        if month in self._cache:
+            self._cache.move_to_end(month)
+            return self._cache[month]
+
+        if month not in self.manifest or not self.storage.exists(self._partition_name(month)):
+            return None
+
+        df = self.storage.load_table(self._partition_name(month))
+        for column in storage_backend.DATE_COLUMNS['schedule']:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+
+        self._cache[month] = df
+        while len(self._cache) > self.cache_partitions:
+            self._cache.popitem(last=False)
+        return df
+
+    def months_in_range(self, start=None, end=None):
+        """Partițiile care se suprapun cu [start, end] - decis doar din manifest"""
+        months = []
+        for month, info in sorted(self.manifest.items()):
+            if start is not None and pd.Timestamp(info['max_end']) < pd.Timestamp(start):
+                continue
+            if end is not None and pd.Timestamp(info['min_start']) > pd.Timestamp(end):
+                continue
+            months.append(month)
+        return months
+
+    def load_range(self, start=None, end=None):
+        """Programările arhivate suprapuse cu intervalul cerut"""
+        frames = [self.load_month(month) for month in self.months_in_range(start, end)]
+        frames = [df for df in frames if df is not None and not df.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df['EndDateTime'] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df['StartDateTime'] <= pd.Timestamp(end)
+        return df[mask].reset_index(drop=True)
+
+    @property
+    def archived_rows(self):
+        return sum(info['rows'] for info in self.manifest.values())
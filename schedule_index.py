@@ -0,0 +1,207 @@
+"""
+⏱️ Schedule Index
+Per-line interval index over schedule entries: sorted start times with bisect
+for overlap, start-window, first-gap and busy-hours queries in O(log n + k).
+Kept in step with the schedule repository on insert, update and delete, and
+with the schedule append buffer, so queries see new entries before a commit.
+"""
+
+import bisect
+from datetime import timedelta
+
+import pandas as pd
+
+ACTIVE_STATUSES = ('Scheduled', 'In Progress')
+
+
+def _timestamp(value):
+    return pd.Timestamp(value) if value is not None else None
+
+
+class LineIntervals:
+    """Intervalele unei linii, sortate după (start, ScheduleID)"""
+
+    def __init__(self):
+        self.keys = []              # (start, ScheduleID) - sortate, pentru bisect
+        self.entries = []           # (start, end, ScheduleID, status) - paralel cu keys
+        self.max_duration = timedelta(0)
+
+    def add(self, start, end, schedule_id, status):
+        key = (start, schedule_id)
+        position = bisect.bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.entries.insert(position, (start, end, schedule_id, status))
+        self.max_duration = max(self.max_duration, end - start)
+
+    def remove(self, start, schedule_id):
+        key = (start, schedule_id)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+            del self.entries[position]
+
+    def _from(self, t):
+        """Primul interval care poate încă acoperi momentul t (start ≥ t - durata maximă)"""
+        if t is None:
+            return 0
+        return bisect.bisect_left(self.keys, (t - self.max_duration,))
+
+    def overlapping(self, t0, t1, statuses=None):
+        """Intervalele care se suprapun cu [t0, t1) (None = nelimitat), în ordinea startului"""
+        result = []
+        for position in range(self._from(t0), len(self.entries)):
+            start, end, schedule_id, status = self.entries[position]
+            if t1 is not None and start >= t1:
+                break
+            if (t0 is None or end > t0) and (not statuses or status in statuses):
+                result.append(self.entries[position])
+        return result
+
+    def starting_in(self, t0, t1, statuses=None):
+        """Intervalele care încep în [t0, t1)"""
+        first = bisect.bisect_left(self.keys, (t0,))
+        last = bisect.bisect_left(self.keys, (t1,))
+        return [entry for entry in self.entries[first:last] if not statuses or entry[3] in statuses]
+
+    def preceding(self, t, statuses=None):
+        """Intervalul care se termină cel mai târziu până la t (lucrarea anterioară de pe linie), sau None"""
+        best = None
+        for position in range(bisect.bisect_left(self.keys, (t,)) - 1, -1, -1):
+            start, end, schedule_id, status = self.entries[position]
+            # Intervalele care încep mai devreme nu se pot termina după cel găsit
+            if best is not None and start + self.max_duration <= best[1]:
+                break
+            if end <= t and (not statuses or status in statuses) and (best is None or end > best[1]):
+                best = self.entries[position]
+        return best
+
+    def first_gap(self, after, duration, statuses=None):
+        """Primul moment ≥ after urmat de un gol de cel puțin `duration`"""
+        current = after
+        for position in range(self._from(after), len(self.entries)):
+            start, end, schedule_id, status = self.entries[position]
+            if end <= current or (statuses and status not in statuses):
+                continue
+            if start > current and start - current >= duration:
+                return current
+            current = max(current, end)
+        return current
+
+
+class ScheduleIntervalIndex:
+    """Index pe linii pentru programări; ascultă modificările din repository-ul schedule"""
+
+    SNAPSHOT_FIELDS = ('lines', 'locations')
+
+    def __init__(self, repository, store=None):
+        self.repository = repository
+        self.store = store          # schedule_store.ScheduleStore - intrările încă necomise
+        self.lines = {}             # LineID → LineIntervals
+        self.locations = {}         # ScheduleID → (LineID, start)
+        repository.add_listener(self)
+        if store is not None:
+            store.add_listener(self)
+
+    # Notificări de la TableRepository
+    def table_rebuilt(self, df):
+        self.lines = {}
+        self.locations = {}
+        self.rows_inserted(df)
+        if self.store is not None and self.store.pending:
+            self.rows_inserted(self.store.to_frame())
+
+    def rows_inserted(self, df):
+        if df.empty:
+            return
+
+        df = df.sort_values('StartDateTime')
+        for schedule_id, line_id, start, end, status in zip(
+                df['ScheduleID'].tolist(), df['LineID'].tolist(),
+                df['StartDateTime'].tolist(), df['EndDateTime'].tolist(), df['Status'].tolist()):
+            self._add(schedule_id, line_id, start, end, status)
+
+    def row_updated(self, key, row):
+        self._remove(key)
+        self._add(row['ScheduleID'], row['LineID'], row['StartDateTime'], row['EndDateTime'], row['Status'])
+
+    def rows_deleted(self, keys):
+        for key in keys:
+            self._remove(key)
+
+    # Notificare de la ScheduleStore
+    def entry_buffered(self, entry):
+        self._add(entry.ScheduleID, entry.LineID, entry.StartDateTime, entry.EndDateTime, entry.Status)
+
+    def _add(self, schedule_id, line_id, start, end, status):
+        # O intrare din buffer reapare la commit - nu se dublează
+        self._remove(schedule_id)
+
+        # Programările fără interval complet nu ocupă linia
+        if pd.isna(start) or pd.isna(end):
+            return
+
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        self.lines.setdefault(line_id, LineIntervals()).add(start, end, schedule_id, status)
+        self.locations[schedule_id] = (line_id, start)
+
+    def _remove(self, schedule_id):
+        location = self.locations.pop(schedule_id, None)
+        if location is not None:
+            line_id, start = location
+            self.lines[line_id].remove(start, schedule_id)
+
+    def _line(self, line_id):
+        self.repository.frame()     # Reindexare dacă tabelul a fost înlocuit din afară
+        return self.lines.get(line_id)
+
+    # Interogări
+    def overlapping(self, line_id, t0=None, t1=None, statuses=None):
+        """ScheduleID-urile de pe linie care se suprapun cu [t0, t1), în ordinea startului"""
+        line = self._line(line_id)
+        if line is None:
+            return []
+        return [entry[2] for entry in line.overlapping(_timestamp(t0), _timestamp(t1), statuses)]
+
+    def intervals(self, line_id, t0=None, t1=None, statuses=None):
+        """(start, end, ScheduleID, status) pentru programările liniei care se suprapun cu [t0, t1)"""
+        line = self._line(line_id)
+        if line is None:
+            return []
+        return line.overlapping(_timestamp(t0), _timestamp(t1), statuses)
+
+    def starting_in(self, line_id, t0, t1, statuses=None):
+        """ScheduleID-urile de pe linie care încep în [t0, t1)"""
+        line = self._line(line_id)
+        if line is None:
+            return []
+        return [entry[2] for entry in line.starting_in(pd.Timestamp(t0), pd.Timestamp(t1), statuses)]
+
+    def first_gap(self, line_id, after, duration=timedelta(0), statuses=ACTIVE_STATUSES):
+        """Primul start ≥ after la care linia e liberă cel puțin `duration`"""
+        line = self._line(line_id)
+        if line is None:
+            return pd.Timestamp(after)
+        return line.first_gap(pd.Timestamp(after), pd.Timedelta(duration), statuses)
+
+    def preceding(self, line_id, t, statuses=ACTIVE_STATUSES):
+        """ScheduleID-ul programării de pe linie care se termină ultima până la t, sau None"""
+        line = self._line(line_id)
+        entry = line.preceding(pd.Timestamp(t), statuses) if line is not None else None
+        return entry[2] if entry is not None else None
+
+    def busy_hours(self, line_id, t0, t1, statuses=None, calendar=None):
+        """Orele programate pe linie în fereastra [t0, t1) (intervalele tăiate la fereastră);
+        cu `calendar` (ShiftCalendar) se numără doar orele de lucru"""
+        t0, t1 = pd.Timestamp(t0), pd.Timestamp(t1)
+        line = self._line(line_id)
+        if line is None:
+            return 0.0
+
+        if calendar is not None:
+            return sum(calendar.working_hours(line_id, max(start, t0), min(end, t1))
+                       for start, end, schedule_id, status in line.overlapping(t0, t1, statuses))
+
+        busy = timedelta(0)
+        for start, end, schedule_id, status in line.overlapping(t0, t1, statuses):
+            busy += min(end, t1) - max(start, t0)
+        return busy.total_seconds() / 3600
@@ -0,0 +1,316 @@
+"""
+🩹 Schedule Repair
+Incremental rescheduling: given a delta (order added, order removed, order
+moved to another line, duration changed, line down, line calendar changed)
+only the affected line
+suffixes and the dependent orders are re-timed; every other booking stays
+where it is. Each repair reports exactly which entries moved.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from schedule_index import ACTIVE_STATUSES
+
+# Programările în curs nu se mută - doar cele viitoare
+MOVABLE_STATUSES = ('Scheduled',)
+
+_NS_PER_HOUR = 3600 * 10 ** 9
+
+
+class RepairResult:
+    def __init__(self):
+        self.moved = []             # (ScheduleID, LineID, start vechi, sfârșit vechi, start nou, sfârșit nou)
+        self.added = []             # ScheduleID-uri noi
+        self.removed = []           # ScheduleID-uri șterse
+        self.orders = []            # OrderID-uri actualizate (AssignedLine / Status)
+        self.unscheduled = {}       # OrderID → motiv (comenzi care nu au mai încăput nicăieri)
+        self.elapsed = 0.0
+
+    def __len__(self):
+        return len(self.moved) + len(self.added) + len(self.removed)
+
+    def changes(self, schedule_repository, orders_repository):
+        """(tabel, operație, rând) de jurnalizat: programările mutate / adăugate / șterse și comenzile atinse"""
+        changes = []
+        for schedule_id in dict.fromkeys([moved[0] for moved in self.moved] + self.added):
+            row = schedule_repository.get(schedule_id)
+            if row is not None:
+                changes.append(('schedule', 'upsert', row.to_dict()))
+        changes.extend(('schedule', 'delete', {'ScheduleID': schedule_id}) for schedule_id in self.removed)
+        for order_id in dict.fromkeys(self.orders):
+            row = orders_repository.get(order_id)
+            if row is not None:
+                changes.append(('orders', 'upsert', row.to_dict()))
+        return changes
+
+    def report(self):
+        lines = [f"🩹 {len(self.moved)} moved, {len(self.added)} added, {len(self.removed)} removed "
+                 f"({self.elapsed * 1000:.1f} ms)"]
+        lines += [f"   {schedule_id} ({line_id}): {old_start:%d/%m %H:%M} → {new_start:%d/%m %H:%M}"
+                  for schedule_id, line_id, old_start, _, new_start, _ in self.moved]
+        lines += [f"   ⛔ {order_id}: {reason}" for order_id, reason in self.unscheduled.items()]
+        return "\n".join(lines)
+
+
+class ScheduleRepairer:
+    SNAPSHOT_FIELDS = ('bookings', 'booking_orders')
+
+    def __init__(self, repositories, schedule_index, calendar, dependencies=None,
+                 create_scheduler=None, id_allocator=None, schedule_store=None):
+        self.schedule_repository = repositories['schedule']
+        self.orders_repository = repositories['orders']
+        self.lines_repository = repositories['production_lines']
+        self.schedule_index = schedule_index
+        self.calendar = calendar                    # shift_calendar.ShiftCalendar
+        self.dependencies = dependencies            # order_dependencies.DependencyGraph
+        self.create_scheduler = create_scheduler    # Întoarce un scheduling_engine.BatchScheduler
+        self.id_allocator = id_allocator
+        self.schedule_store = schedule_store        # Buffer-ul programărilor noi, comis înainte de reparare
+
+        self.bookings = {}                          # OrderID → {ScheduleID}
+        self.booking_orders = {}                    # ScheduleID → OrderID
+        self.schedule_repository.add_listener(self)
+
+    # Notificări de la TableRepository - index OrderID → programări
+    def table_rebuilt(self, df):
+        self.bookings, self.booking_orders = {}, {}
+        self.rows_inserted(df)
+
+    def rows_inserted(self, df):
+        if df.empty:
+            return
+        for schedule_id, order_id in zip(df['ScheduleID'].tolist(), df['OrderID'].tolist()):
+            self._link(schedule_id, order_id)
+
+    def row_updated(self, key, row):
+        self._unlink(key)
+        self._link(row['ScheduleID'], row['OrderID'])
+
+    def rows_deleted(self, keys):
+        for key in keys:
+            self._unlink(key)
+
+    def _link(self, schedule_id, order_id):
+        self.bookings.setdefault(order_id, set()).add(schedule_id)
+        self.booking_orders[schedule_id] = order_id
+
+    def _unlink(self, schedule_id):
+        order_id = self.booking_orders.pop(schedule_id, None)
+        if order_id is not None:
+            self.bookings[order_id].discard(schedule_id)
+
+    def _active_bookings(self, order_id):
+        """(ScheduleID, LineID, start, end, status) pentru programările active ale unei comenzi"""
+        self.schedule_repository.frame()
+        result = []
+        for schedule_id in sorted(self.bookings.get(order_id, ())):
+            row = self.schedule_repository.get(schedule_id)
+            if row['Status'] in ACTIVE_STATUSES and not pd.isna(row['StartDateTime']) and not pd.isna(row['EndDateTime']):
+                result.append((schedule_id, row['LineID'], pd.Timestamp(row['StartDateTime']).value,
+                               pd.Timestamp(row['EndDateTime']).value, row['Status']))
+        return result
+
+    def _release(self, order_id):
+        """Cel mai devreme start permis de dependențe: sfârșitul programărilor comenzilor de care depinde"""
+        release = 0
+        if self.dependencies is not None and order_id is not None:
+            for prerequisite in self.dependencies.prerequisites_of(order_id):
+                for _, _, _, end, _ in self._active_bookings(prerequisite):
+                    release = max(release, end)
+        return release
+
+    # Delte
+    def order_added(self, order_id):
+        """Plasează o comandă nouă / neprogramată (motorul de programare, doar pentru ea)"""
+        return self.orders_added([order_id])
+
+    def orders_added(self, order_ids):
+        """Plasează comenzile noi / neprogramate într-o singură rulare a motorului de programare"""
+        return self._run(lambda result: self._place(list(order_ids), result))
+
+    def line_changed(self, order_id, line_id):
+        """AssignedLine s-a schimbat: programările viitoare ale comenzii trec pe linia nouă, din primul gol
+        de după vechiul start (golurile lăsate pe liniile vechi se închid); fără linie, comanda revine în Planned"""
+        line_id = '' if pd.isna(line_id) else line_id
+
+        def repair(result):
+            bookings = self._active_bookings(order_id)
+            moving = [booking for booking in bookings if booking[4] in MOVABLE_STATUSES and booking[1] != line_id]
+            if line_id and bookings and not moving:
+                return
+
+            work, after = 0, None
+            for schedule_id, old_line, start, end, status in moving:
+                after = start if after is None else min(after, start)
+                work += self.calendar.between_ns(old_line, start, end)
+                self.schedule_repository.delete([schedule_id])
+                result.removed.append(schedule_id)
+                self._reflow(old_line, start, end, start, result)
+
+            if not line_id:
+                self.orders_repository.update(order_id, {'AssignedLine': '', 'Status': 'Planned'})
+                result.orders.append(order_id)
+                return
+            if not moving:
+                # Comandă fără programări: durata vine din estimare
+                hours = pd.to_numeric(self.orders_repository.get_value(order_id, 'EstimatedHours'), errors='coerce')
+                if pd.isna(hours) or hours <= 0:
+                    result.unscheduled[order_id] = "Missing estimated hours"
+                    return
+                work = int(hours * _NS_PER_HOUR)
+            self._place_on_line(order_id, line_id, work, result, after)
+        return self._run(repair)
+
+    def order_removed(self, order_id):
+        """Șterge programările comenzii; programările lipite de ele pe linie avansează în golul rămas"""
+        def repair(result):
+            for schedule_id, line_id, start, end, status in self._active_bookings(order_id):
+                self.schedule_repository.delete([schedule_id])
+                result.removed.append(schedule_id)
+                self._reflow(line_id, start, end, start, result)
+        return self._run(repair)
+
+    def duration_changed(self, order_id, old_hours, new_hours):
+        """Durata comenzii s-a schimbat: sfârșitul programării se mută, restul liniei și dependenții urmează"""
+        def repair(result):
+            delta = int((float(new_hours) - float(old_hours)) * _NS_PER_HOUR)
+            for schedule_id, line_id, start, end, status in self._active_bookings(order_id):
+                work = max(0, self.calendar.between_ns(line_id, start, end) + delta)
+                new_end = self.calendar.add_ns(line_id, start, work)
+                self._move(schedule_id, line_id, start, end, start, new_end, result)
+                self._reflow(line_id, start, end, new_end, result, skip={schedule_id})
+        return self._run(repair)
+
+    def line_down(self, line_id, since=None):
+        """Linia nu mai e activă: programările ei viitoare sunt mutate pe alte linii compatibile"""
+        def repair(result):
+            since_ns = pd.Timestamp(since or datetime.now()).value
+            affected = [(schedule_id, self.booking_orders.get(schedule_id))
+                        for start, end, schedule_id, status in
+                        self.schedule_index.intervals(line_id, pd.Timestamp(since_ns), None, MOVABLE_STATUSES)
+                        if start.value >= since_ns]
+            if not affected:
+                return
+
+            self.schedule_repository.delete([schedule_id for schedule_id, _ in affected])
+            result.removed.extend(schedule_id for schedule_id, _ in affected)
+            order_ids = [order_id for _, order_id in affected if order_id is not None]
+            for order_id in order_ids:
+                # Și comenzile care nu mai încap nicăieri rămân în rezultat (jurnalizate ca Planned)
+                self.orders_repository.update(order_id, {'AssignedLine': '', 'Status': 'Planned'})
+                result.orders.append(order_id)
+            self._place(order_ids, result)
+        return self._run(repair)
+
+    def repair_line(self, line_id, since, until, previous_calendar):
+        """Calendarul liniei s-a schimbat (mentenanță): programările din `since` se re-plasează pe calendarul nou,
+        cu durata de lucru măsurată pe calendarul anterior"""
+        return self._run(lambda result: self._reflow(
+            line_id, pd.Timestamp(since).value, None, None, result,
+            until=pd.Timestamp(until).value, work_calendar=previous_calendar))
+
+    def _run(self, repair):
+        started = datetime.now()
+        if self.schedule_store is not None:
+            self.schedule_store.commit(self.schedule_repository)
+        result = RepairResult()
+        repair(result)
+        result.elapsed = (datetime.now() - started).total_seconds()
+        return result
+
+    # Re-plasare
+    def _place(self, order_ids, result):
+        """Plasează comenzile cu motorul de programare și inserează programările"""
+        # Tot tabelul de comenzi (tipul ultimei programări a liniei contează pentru setup); lotul = order_ids
+        placed = self.create_scheduler().run(
+            self.orders_repository.frame(), self.schedule_repository.frame(), self.lines_repository.frame(),
+            order_ids=order_ids)
+        result.unscheduled.update(placed.unscheduled)
+        if placed.schedule_df.empty:
+            return
+
+        schedule = placed.entries(self.id_allocator.reserve('schedule', len(placed.schedule_df)), 'Repair')
+        self.schedule_repository.insert(schedule)
+        result.added.extend(schedule['ScheduleID'].tolist())
+        for order_id, line_id, end in zip(schedule['OrderID'].tolist(), schedule['LineID'].tolist(),
+                                          schedule['EndDateTime'].tolist()):
+            self.orders_repository.update(order_id, {'AssignedLine': line_id, 'Status': 'Scheduled'})
+            result.orders.append(order_id)
+            self._push_dependents(order_id, pd.Timestamp(end).value, result)
+
+    def _place_on_line(self, order_id, line_id, work, result, after=None):
+        """Programează comanda pe o linie dată, în primul gol de după `after` (implicit acum) și dependențe"""
+        now = datetime.now()
+        after = max(pd.Timestamp(now).value, after or 0, self._release(order_id))
+        start, end = self.calendar.fit_ns(self.schedule_index, line_id, after, work)
+        schedule_id = self.id_allocator.reserve('schedule', 1)[0]
+        self.schedule_repository.insert([{
+            'ScheduleID': schedule_id, 'OrderID': order_id, 'LineID': line_id,
+            'StartDateTime': pd.Timestamp(start), 'EndDateTime': pd.Timestamp(end), 'Status': 'Scheduled',
+            'ActualStart': pd.NaT, 'ActualEnd': pd.NaT, 'ScheduledBy': 'Repair', 'LastModified': now
+        }])
+        result.added.append(schedule_id)
+        self.orders_repository.update(order_id, {'AssignedLine': line_id, 'Status': 'Scheduled'})
+        result.orders.append(order_id)
+        self._push_dependents(order_id, end, result)
+
+    def _move(self, schedule_id, line_id, start, end, new_start, new_end, result):
+        if (new_start, new_end) == (start, end):
+            return
+        self.schedule_repository.update(schedule_id, {
+            'StartDateTime': pd.Timestamp(new_start),
+            'EndDateTime': pd.Timestamp(new_end),
+            'LastModified': datetime.now()
+        })
+        result.moved.append((schedule_id, line_id, pd.Timestamp(start), pd.Timestamp(end),
+                             pd.Timestamp(new_start), pd.Timestamp(new_end)))
+        if new_end > end:
+            self._push_dependents(self.booking_orders.get(schedule_id), new_end, result)
+
+    def _reflow(self, line_id, since, old_end, new_end, result, skip=(), until=None, work_calendar=None):
+        """Re-temporizează sufixul liniei din `since`: programările lipite de cea schimbată (fără timp de lucru
+        între ele) o urmează, cele suprapuse sunt împinse; prima programare rămasă pe loc (după `until`)
+        oprește repararea"""
+        line_calendar = self.calendar.line(line_id)
+        work_calendar = work_calendar or line_calendar
+        for _, _, schedule_id, status in self.schedule_index.intervals(line_id, pd.Timestamp(since), None,
+                                                                       ACTIVE_STATUSES):
+            if schedule_id in skip:
+                continue
+            # Poziția curentă (o programare din sufix poate fi fost deja împinsă ca dependent)
+            start = pd.Timestamp(self.schedule_repository.get_value(schedule_id, 'StartDateTime')).value
+            end = pd.Timestamp(self.schedule_repository.get_value(schedule_id, 'EndDateTime')).value
+            # Fără calendar schimbat, doar programările de după cea modificată formează sufixul
+            if old_end is not None and start < since:
+                continue
+            if status not in MOVABLE_STATUSES:
+                new_end = end if new_end is None else max(new_end, end)
+                old_end = end
+                continue
+
+            chained = old_end is not None and line_calendar.between(old_end, start) == 0
+            target = new_end if chained else max(start, new_end if new_end is not None else start)
+            target = max(target, self._release(self.booking_orders.get(schedule_id)))
+
+            new_start = self.calendar.next_working_ns(line_id, target)
+            moved_end = self.calendar.add_ns(line_id, new_start, work_calendar.between(start, end))
+            if (new_start, moved_end) == (start, end) and (until is None or start >= until):
+                break
+
+            self._move(schedule_id, line_id, start, end, new_start, moved_end, result)
+            old_end, new_end = end, moved_end
+
+    def _push_dependents(self, order_id, end, result):
+        """Comenzile care depind de order_id și încep înainte de noul ei sfârșit sunt împinse după el"""
+        if self.dependencies is None or order_id is None:
+            return
+        for dependent in self.dependencies.dependents_of(order_id):
+            for schedule_id, line_id, start, booked_end, status in self._active_bookings(dependent):
+                if status not in MOVABLE_STATUSES or start >= end:
+                    continue
+                new_start = self.calendar.next_working_ns(line_id, end)
+                new_end = self.calendar.add_ns(line_id, new_start, self.calendar.between_ns(line_id, start, booked_end))
+                self._move(schedule_id, line_id, start, booked_end, new_start, new_end, result)
+                self._reflow(line_id, start, booked_end, new_end, result, skip={schedule_id})
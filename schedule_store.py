@@ -0,0 +1,129 @@
+"""
+📥 Schedule Store
+Append buffer for new schedule entries: growable typed column arrays with
+amortized O(1) appends, committed to the schedule table in one batch only
+when a consumer asks for the DataFrame. Listeners (the interval index) see
+buffered entries immediately, without a commit.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['ScheduleID', 'OrderID', 'LineID', 'StartDateTime', 'EndDateTime', 'Status',
+           'ActualStart', 'ActualEnd', 'ScheduledBy', 'LastModified']
+DATE_COLUMNS = ['StartDateTime', 'EndDateTime', 'ActualStart', 'ActualEnd', 'LastModified']
+
+
+class ScheduleEntry:
+    """Intrare de programare compactă (fără __dict__ per instanță)"""
+    __slots__ = COLUMNS
+
+    def __init__(self, **values):
+        for column in COLUMNS:
+            setattr(self, column, values.get(column))
+
+    @classmethod
+    def from_dict(cls, row):
+        return cls(**{column: row.get(column) for column in COLUMNS})
+
+    def to_dict(self):
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def __repr__(self):
+        return f"ScheduleEntry({self.ScheduleID}, {self.OrderID} on {self.LineID})"
+
+
+def _to_datetime64(value):
+    if value is None or value == '' or pd.isna(value):
+        return np.datetime64('NaT', 'ns')
+    return pd.Timestamp(value).to_datetime64()
+
+
+class ScheduleStore:
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.columns = {column: self._empty(column, capacity) for column in COLUMNS}
+        self.positions = {}         # ScheduleID → poziția în buffer
+        self.listeners = []         # Notificați la fiecare intrare nouă (entry_buffered)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    @staticmethod
+    def _empty(column, capacity):
+        if column in DATE_COLUMNS:
+            return np.full(capacity, np.datetime64('NaT', 'ns'))
+        return np.empty(capacity, dtype=object)
+
+    @property
+    def pending(self):
+        return self.size
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        """Dublează capacitatea - costul copierii se amortizează la O(1) pe inserare"""
+        capacity = 2 * len(self.columns['ScheduleID'])
+        for column, values in self.columns.items():
+            grown = self._empty(column, capacity)
+            grown[:self.size] = values[:self.size]
+            self.columns[column] = grown
+
+    def append(self, entry):
+        """Adaugă o intrare (ScheduleEntry sau dict); întoarce poziția în buffer"""
+        if isinstance(entry, dict):
+            entry = ScheduleEntry.from_dict(entry)
+
+        if self.size == len(self.columns['ScheduleID']):
+            self._grow()
+
+        position = self.size
+        for column in COLUMNS:
+            value = getattr(entry, column)
+            self.columns[column][position] = _to_datetime64(value) if column in DATE_COLUMNS else value
+        self.positions[entry.ScheduleID] = position
+        self.size += 1
+
+        for listener in self.listeners:
+            listener.entry_buffered(entry)
+        return position
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def entry(self, position):
+        """Intrarea de la o poziție din buffer"""
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        values = {column: self.columns[column][position] for column in COLUMNS}
+        for column in DATE_COLUMNS:
+            values[column] = pd.Timestamp(values[column]) if not pd.isna(values[column]) else None
+        return ScheduleEntry(**values)
+
+    def get_value(self, schedule_id, column, default=None):
+        """Valoarea unei coloane pentru o intrare din buffer, sau default"""
+        position = self.positions.get(schedule_id)
+        return self.columns[column][position] if position is not None else default
+
+    def to_frame(self):
+        """Intrările din buffer ca DataFrame (o singură construcție vectorizată)"""
+        return pd.DataFrame({column: values[:self.size].copy() for column, values in self.columns.items()})
+
+    def clear(self):
+        for column, values in self.columns.items():
+            values[:self.size] = self._empty(column, self.size)
+        self.positions = {}
+        self.size = 0
+
+    def commit(self, repository):
+        """Scrie toate intrările din buffer în tabel printr-o singură inserare; întoarce DataFrame-ul lor"""
+        if not self.size:
+            return None
+
+        # Buffer-ul se golește doar după o inserare reușită - altfel intrările rămân pentru următorul commit
+        frame = self.to_frame()
+        repository.insert(frame)
+        self.clear()
+        return frame
@@ -0,0 +1,426 @@
+"""
+🧮 Scheduling Engine
+Finite-capacity list scheduler: places every unscheduled order at once on a
+compatible active line, after its dependencies and around existing bookings.
+Dispatch order is priority weight, then due date; each order goes to the line
+where production can start earliest after the changeover from the work that
+precedes it there (ties to the more efficient line). High-volume lines are then
+resequenced into product campaigns.
+Durations are working time on the line's shift calendar.
+"""
+
+import heapq
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from schedule_index import ACTIVE_STATUSES
+
+DEFAULT_PRIORITY_WEIGHTS = {'Critical': 100, 'High': 75, 'Medium': 50, 'Low': 25}
+
+# Comenzile care nu mai trebuie programate
+CLOSED_ORDER_STATUSES = ('Completed',)
+
+# Liniile cu cel puțin atâtea comenzi noi trec prin gruparea pe campanii de produs
+CAMPAIGN_MIN_ORDERS = 4
+
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_HOUR = 3600 * 10 ** 9
+_NO_DUE_DATE = np.iinfo('int64').max
+_NEVER = np.iinfo('int64').max
+
+
+class ScheduleResult:
+    def __init__(self, schedule_df, unscheduled, summary):
+        self.schedule_df = schedule_df      # Intrările noi (fără ScheduleID - alocat la salvare)
+        self.unscheduled = unscheduled      # OrderID → motiv
+        self.summary = summary              # Întârzieri, makespan, utilizare
+
+    @property
+    def assignments(self):
+        """OrderID → LineID pentru comenzile programate"""
+        return dict(zip(self.schedule_df['OrderID'], self.schedule_df['LineID']))
+
+    def entries(self, schedule_ids, scheduled_by='Auto-Scheduler', now=None):
+        """Rândurile complete pentru tabelul schedule, cu ScheduleID-urile rezervate"""
+        schedule = self.schedule_df.copy()
+        schedule.insert(0, 'ScheduleID', list(schedule_ids))
+        schedule['Status'] = 'Scheduled'
+        schedule['ActualStart'] = pd.NaT
+        schedule['ActualEnd'] = pd.NaT
+        schedule['ScheduledBy'] = scheduled_by
+        schedule['LastModified'] = now or datetime.now()
+        return schedule
+
+    def report(self):
+        summary = self.summary
+        return (f"📋 Scheduled: {summary['scheduled']:,} orders\n"
+                f"⛔ Not scheduled: {summary['unscheduled']:,}\n"
+                f"⏰ Late: {summary['tardy_orders']:,} "
+                f"(total {summary['total_tardiness_hours']:.1f}h, max {summary['max_tardiness_hours']:.1f}h)\n"
+                f"🔧 Changeovers: {summary['setup_hours']:.1f}h\n"
+                f"📏 Makespan: {summary['makespan_hours']:.1f}h\n"
+                f"🏭 Avg. line utilization: {summary['avg_utilization']:.1f}%\n"
+                f"⏱️ Time: {summary['elapsed']:.2f}s")
+
+
+def unscheduled_mask(orders_df):
+    """Comenzile fără linie asignată sau încă în Planned (și necompletate)"""
+    assigned = orders_df['AssignedLine'].astype(object)
+    mask = assigned.isna() | (assigned == '') | (orders_df['Status'] == 'Planned')
+    return mask & ~orders_df['Status'].isin(CLOSED_ORDER_STATUSES)
+
+
+class _Batch:
+    """Starea unei rulări: comenzile lotului, liniile în ordinea eficienței, plasările"""
+
+    def __init__(self, order_ids, now_ns):
+        self.order_ids = order_ids
+        self.now_ns = now_ns
+        count = len(order_ids)
+        self.line = np.full(count, -1, dtype='int64')       # poziția liniei (în ordinea eficienței)
+        self.start = np.zeros(count, dtype='int64')
+        self.end = np.zeros(count, dtype='int64')
+        self.setup = np.zeros(count, dtype='int64')         # schimbarea de fabricație înaintea comenzii
+        self.work = np.zeros(count, dtype='int64')          # timp de lucru ocupat (setup + producție + control)
+        self.release = np.zeros(count, dtype='int64')       # cel mai devreme start permis de dependențe
+        self.placed = []                                    # indicii comenzilor, în ordinea plasării
+        self.placed_end = {}                                # OrderID → sfârșitul plasării din lot
+
+
+class BatchScheduler:
+    def __init__(self, compatibility, dependencies, schedule_index, priority_weights=None,
+                 setup_model=None, campaign_min_orders=CAMPAIGN_MIN_ORDERS, calendar=None):
+        self.compatibility = compatibility          # line_compatibility.CompatibilityMatrix
+        self.dependencies = dependencies            # order_dependencies.DependencyGraph
+        self.schedule_index = schedule_index        # schedule_index.ScheduleIntervalIndex
+        self.priority_weights = priority_weights or DEFAULT_PRIORITY_WEIGHTS
+        self.setup_model = setup_model              # setup_times.SetupModel (None = fără setup)
+        self.campaign_min_orders = campaign_min_orders
+        self.calendar = calendar                    # shift_calendar.ShiftCalendar (None = timp continuu)
+
+    def run(self, orders_df, schedule_df, lines_df, now=None, order_ids=None):
+        """Programează comenzile neprogramate din orders_df (doar cele din order_ids, dacă e dat)"""
+        started = datetime.now()
+        now = pd.Timestamp(now or started)
+
+        mask = unscheduled_mask(orders_df)
+        if order_ids is not None:
+            mask &= orders_df['OrderID'].isin(list(order_ids))
+        orders = orders_df[mask]
+        order_ids = orders['OrderID'].tolist()
+        position = {order_id: i for i, order_id in enumerate(order_ids)}
+        b = _Batch(order_ids, now.value)
+
+        hours = pd.to_numeric(orders['EstimatedHours'], errors='coerce').to_numpy(dtype='float64')
+        b.durations = np.where(np.isfinite(hours) & (hours > 0), hours * _NS_PER_HOUR, 0).astype('int64')
+        due = pd.to_datetime(orders['DueDate'], errors='coerce')
+        b.due_ns = np.where(due.notna(), due.to_numpy(dtype='datetime64[ns]').astype('int64'), _NO_DUE_DATE)
+        weights = orders['Priority'].astype(object).map(self.priority_weights).fillna(0).to_numpy()
+        b.product_types = orders['ProductType'].astype(object).to_numpy()
+
+        # Compatibilitate + Status liniei, pentru toate comenzile într-o singură operație
+        mask = self.compatibility.line_mask(b.product_types)
+        line_ids = self.compatibility.line_ids
+
+        # Liniile sunt încercate în ordinea eficienței - argmin alege astfel linia mai eficientă la egalitate
+        efficiency = lines_df.set_index('LineID')['Efficiency'].reindex(line_ids).fillna(0).to_numpy()
+        line_order = np.argsort(-efficiency, kind='stable')
+        b.mask = mask[:, line_order]
+        b.line_ids = [line_ids[i] for i in line_order]
+        b.frontier = np.full(len(line_order), b.now_ns, dtype='int64')
+        self._prepare_setup(b, orders_df, schedule_df)
+        self._prepare_bookings(b, orders_df, schedule_df)
+
+        # Sfârșitul programărilor existente ale fiecărei comenzi (pentru dependențele deja programate)
+        b.booked_end = {}
+        if not schedule_df.empty:
+            ends = schedule_df.groupby(schedule_df['OrderID'].astype(object))['EndDateTime'].max()
+            b.booked_end = {order_id: end.value for order_id, end in ends.items() if not pd.isna(end)}
+
+        # Dependențe din lot: o comandă devine disponibilă după ce toate dependențele ei au fost plasate
+        waiting = np.zeros(len(order_ids), dtype='int64')
+        b.dependents = {}
+        for i, order_id in enumerate(order_ids):
+            for prerequisite in self.dependencies.prerequisites_of(order_id):
+                if prerequisite in position and prerequisite != order_id:
+                    waiting[i] += 1
+                    b.dependents.setdefault(prerequisite, []).append(i)
+
+        ready = [(-weights[i], b.due_ns[i], order_id, i) for i, order_id in enumerate(order_ids) if waiting[i] == 0]
+        heapq.heapify(ready)
+
+        blocked = {}
+        unscheduled = {}
+        while ready:
+            _, _, order_id, i = heapq.heappop(ready)
+
+            reason = blocked.get(i)
+            if reason is None:
+                reason = self._place(b, i)
+            if reason is not None:
+                unscheduled[order_id] = reason
+
+            for dependent in b.dependents.get(order_id, []):
+                if reason is not None:
+                    blocked.setdefault(dependent, f"Dependency {order_id} not scheduled")
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, (-weights[dependent], b.due_ns[dependent], order_ids[dependent], dependent))
+
+        # Ce a rămas așteaptă o dependență care nu devine niciodată disponibilă (ciclu)
+        for i in np.flatnonzero(waiting > 0):
+            unscheduled[order_ids[i]] = "Dependency cycle"
+
+        if self.setup_model is not None:
+            self._sequence_campaigns(b)
+
+        placed = np.array(b.placed, dtype='int64')
+        schedule = pd.DataFrame({
+            'OrderID': [order_ids[i] for i in placed],
+            'LineID': [b.line_ids[line] for line in b.line[placed]],
+            'StartDateTime': pd.to_datetime(b.start[placed]),
+            'EndDateTime': pd.to_datetime(b.end[placed])
+        })
+        active = self.compatibility.matrix[:, line_order].any(axis=0)
+        active_line_ids = [line_id for line_id, is_active in zip(b.line_ids, active) if is_active]
+        summary = self._summary(schedule, b, placed, unscheduled, active_line_ids, now)
+        summary['elapsed'] = (datetime.now() - started).total_seconds()
+        return ScheduleResult(schedule, unscheduled, summary)
+
+    def _prepare_setup(self, b, orders_df, schedule_df):
+        """Codurile tipurilor și timpii de setup / control pe fiecare linie"""
+        lines = len(b.line_ids)
+        # Ultimul tip plasat de lot pe fiecare linie și sfârșitul acelei plasări (-1 = niciuna)
+        b.batch_end = np.full(lines, -1, dtype='int64')
+        if self.setup_model is None:
+            b.codes = np.zeros(len(b.order_ids), dtype='int64')
+            b.transition = np.zeros((1, 1))
+            b.setup_ns = b.quality_ns = np.zeros(lines)
+            b.idle_code = 0
+            b.last_code = np.zeros(lines, dtype='int64')
+            return
+
+        model = self.setup_model
+        b.codes = model.codes(b.product_types)
+        b.transition = model.transition
+        positions = np.array([model.line_positions.get(line_id, -1) for line_id in b.line_ids], dtype='int64')
+        known = positions >= 0
+        b.setup_ns = np.where(known, model.setup_minutes[positions] * _NS_PER_MINUTE, 0)
+        b.quality_ns = np.where(known, model.quality_minutes[positions] * _NS_PER_MINUTE, 0)
+        b.idle_code = model.idle_code
+        b.last_code = np.full(lines, model.idle_code, dtype='int64')
+
+    def _prepare_bookings(self, b, orders_df, schedule_df):
+        """Programările active existente: unde se termină ultima pe fiecare linie și ce tip lucrează fiecare"""
+        lines = len(b.line_ids)
+        b.booked_until = np.zeros(lines, dtype='int64')
+        b.booked_code = np.full(lines, b.idle_code, dtype='int64')
+        b.booking_codes, b.booking_ends = {}, {}
+        active = schedule_df[schedule_df['Status'].isin(ACTIVE_STATUSES) & schedule_df['EndDateTime'].notna()]
+        if active.empty:
+            return
+
+        ends = active.groupby(active['LineID'].astype(object))['EndDateTime'].max().reindex(b.line_ids)
+        b.booked_until = np.where(ends.notna(), ends.to_numpy(dtype='datetime64[ns]').astype('int64'), 0)
+        if self.setup_model is None:
+            return
+
+        # Schimbarea de fabricație pornește de la tipul programării care precede efectiv slotul
+        order_types = orders_df.set_index('OrderID')['ProductType'].astype(object)
+        codes = self.setup_model.codes(active['OrderID'].astype(object).map(order_types))
+        schedule_ids = active['ScheduleID'].astype(object)
+        b.booking_codes = dict(zip(schedule_ids, codes))
+        b.booking_ends = dict(zip(schedule_ids, active['EndDateTime'].to_numpy(dtype='datetime64[ns]').astype('int64')))
+        last = active.groupby(active['LineID'].astype(object))['EndDateTime'].idxmax()
+        line_codes = dict(zip(last.index, (b.booking_codes[schedule_id] for schedule_id in schedule_ids[last])))
+        b.booked_code = np.array([line_codes.get(line_id, b.idle_code) for line_id in b.line_ids], dtype='int64')
+
+    def _place(self, b, i):
+        """Plasează o comandă; întoarce motivul dacă nu poate fi programată"""
+        duration = b.durations[i]
+        if duration <= 0:
+            return "Missing estimated hours"
+
+        candidates = np.flatnonzero(b.mask[i])
+        if not len(candidates):
+            return "No compatible active line"
+
+        release = b.now_ns
+        for prerequisite in self.dependencies.prerequisites_of(b.order_ids[i]):
+            if prerequisite in b.placed_end:
+                release = max(release, b.placed_end[prerequisite])
+            else:
+                release = max(release, b.booked_end.get(prerequisite, b.now_ns))
+
+        # Linia câștigătoare e cea pe care producția poate începe cel mai devreme, după schimbarea de fabricație.
+        # Pe liniile fără programări existente după `earliest` slotul începe chiar la `earliest`,
+        # după ultima lucrare de pe linie (a lotului sau cea existentă) - calculul vectorizat e exact
+        earliest = np.maximum(b.frontier[candidates], release)
+        free = b.booked_until[candidates] <= earliest
+        previous = np.where(b.booked_until[candidates] > b.batch_end[candidates],
+                            b.booked_code[candidates], b.last_code[candidates])
+        setup = (b.setup_ns[candidates] * b.transition[previous, b.codes[i]]).astype('int64')
+        production_start = self._production_start(b, candidates, earliest, setup)
+        best = (_NEVER, len(candidates))
+        if free.all():
+            choice = int(np.argmin(production_start))
+            best = (production_start[choice], choice)
+        elif free.any():
+            choice = int(np.argmin(np.where(free, production_start, _NEVER)))
+            best = (production_start[choice], choice)
+
+        # Pe liniile ocupate după `earliest` slotul real vine din indexul de intervale; sunt încercate
+        # în ordinea unei limite inferioare (setup-ul minim) și doar cât mai pot bate linia aleasă
+        fitted = {}
+        busy = np.flatnonzero(~free)
+        if len(busy):
+            lowest = (b.setup_ns[candidates[busy]] * b.transition[:, b.codes[i]].min()).astype('int64')
+            bound = self._production_start(b, candidates[busy], earliest[busy], lowest)
+            for k in np.argsort(bound, kind='stable'):
+                if (bound[k], busy[k]) >= best:
+                    break
+                line = candidates[busy[k]]
+                batch_previous = (b.batch_end[line], b.last_code[line]) if b.batch_end[line] >= 0 else None
+                slot = self._fit_order(b, i, line, earliest[busy[k]], batch_previous)
+                fitted[busy[k]] = slot
+                best = min(best, (slot[4], busy[k]))
+
+        choice = best[1]
+        line = candidates[choice]
+        if choice in fitted:
+            start, end, line_setup, work, _ = fitted[choice]
+        else:
+            # Programările existente ale liniei sunt ocolite prin indexul de intervale
+            line_setup = setup[choice]
+            work = line_setup + duration + int(b.quality_ns[line])
+            start, end = self._fit(b, line, earliest[choice], work)
+
+        b.line[i], b.start[i], b.end[i] = line, start, end
+        b.setup[i], b.work[i], b.release[i] = line_setup, work, release
+        b.frontier[line] = b.batch_end[line] = end
+        b.last_code[line] = b.codes[i]
+        b.placed_end[b.order_ids[i]] = end
+        b.placed.append(i)
+        return None
+
+    def _production_start(self, b, lines, after, setup):
+        """Vectorizat: momentul în care producția poate începe pe fiecare linie după `after` și setup"""
+        if self.calendar is None:
+            return after + setup
+        return self.calendar.add_after_ns(b.line_ids, lines, after, setup)
+
+    def _fit_order(self, b, i, line, after, batch_previous):
+        """(start, sfârșit, setup, lucru, start producție) pentru comanda i în primul gol ≥ after de pe linie;
+        setup-ul pornește de la lucrarea care precede slotul găsit (batch_previous = (sfârșit, tip) din lot)"""
+        while True:
+            previous = self._preceding_code(b, line, after, batch_previous)
+            setup = int(b.setup_ns[line] * b.transition[previous, b.codes[i]])
+            work = setup + b.durations[i] + int(b.quality_ns[line])
+            start, end = self._fit(b, line, after, work)
+            # Slotul a sărit peste o programare - schimbarea se recalculează de la noua lucrare anterioară
+            if start == after or self._preceding_code(b, line, start, batch_previous) == previous:
+                break
+            after = start
+        if self.calendar is None:
+            production_start = start + setup
+        else:
+            production_start = self.calendar.add_ns(b.line_ids[line], start, setup)
+        return start, end, setup, work, production_start
+
+    def _preceding_code(self, b, line, t, batch_previous):
+        """Tipul lucrării care se termină ultima până la t pe linie: plasarea din lot sau programarea existentă"""
+        if self.setup_model is None:
+            return b.idle_code
+        schedule_id = self.schedule_index.preceding(b.line_ids[line], pd.Timestamp(int(t)))
+        booked_end = b.booking_ends.get(schedule_id)
+        if batch_previous is not None and (booked_end is None or batch_previous[0] >= booked_end):
+            return batch_previous[1]
+        return b.booking_codes.get(schedule_id, b.idle_code)
+
+    def _fit(self, b, line, after, work):
+        """(start, sfârșit) în ns: primul gol ≥ after în care încape `work` timp de lucru pe linie"""
+        line_id = b.line_ids[line]
+        if self.calendar is not None:
+            return self.calendar.fit_ns(self.schedule_index, line_id, int(after), int(work))
+
+        start = self.schedule_index.first_gap(line_id, pd.Timestamp(int(after)), pd.Timedelta(int(work))).value
+        return start, start + work
+
+    def _sequence_campaigns(self, b):
+        """Pe liniile cu multe comenzi noi, grupează produsele de același tip (mai puține schimbări),
+        doar dacă nicio comandă nu întârzie mai mult decât înainte"""
+        placed = np.array(b.placed, dtype='int64')
+        for line in np.unique(b.line[placed]) if len(placed) else []:
+            members = placed[b.line[placed] == line]
+            members = members[np.argsort(b.start[members], kind='stable')]
+            if len(members) < self.campaign_min_orders:
+                continue
+            # Sfârșiturile comenzilor cu dependenți în lot nu au voie să se mute
+            if any(b.order_ids[i] in b.dependents for i in members):
+                continue
+
+            sequence = members[self.setup_model.campaigns(b.product_types[members], b.due_ns[members])]
+            if np.array_equal(sequence, members):
+                continue
+
+            timing = self._retime(b, line, sequence)
+            old = self._cost(b, members, b.setup[members], b.end[members])
+            new = self._cost(b, sequence, timing['setup'], timing['end'])
+            if new[0] < old[0] and new[1] <= old[1] and new[2] <= old[2]:
+                b.start[sequence], b.end[sequence] = timing['start'], timing['end']
+                b.setup[sequence], b.work[sequence] = timing['setup'], timing['work']
+                b.frontier[line] = timing['end'][-1]
+
+    def _retime(self, b, line, sequence):
+        """Recalculează start / sfârșit / setup pentru o ordine nouă a comenzilor pe linie"""
+        timing = {key: np.zeros(len(sequence), dtype='int64') for key in ('start', 'end', 'setup', 'work')}
+        current, previous = b.now_ns, None
+        for k, i in enumerate(sequence):
+            start, end, setup, work, _ = self._fit_order(b, i, line, max(current, b.release[i]), previous)
+            timing['start'][k], timing['end'][k], timing['setup'][k], timing['work'][k] = start, end, setup, work
+            current, previous = end, (end, b.codes[i])
+        return timing
+
+    @staticmethod
+    def _cost(b, orders, setup, ends):
+        """(setup total, comenzi întârziate, întârziere totală) pentru o variantă de secvență"""
+        dues = b.due_ns[orders]
+        tardiness = np.where(dues != _NO_DUE_DATE, np.maximum(0, ends - dues), 0)
+        return int(setup.sum()), int((tardiness > 0).sum()), int(tardiness.sum())
+
+    def _summary(self, schedule, b, placed, unscheduled, line_ids, now):
+        ends = b.end[placed]
+        dues = b.due_ns[placed]
+
+        has_due = dues != _NO_DUE_DATE
+        tardiness = np.where(has_due, np.maximum(0, ends - dues), 0) / _NS_PER_HOUR
+        horizon_end = pd.Timestamp(int(ends.max())) if len(ends) else now
+        horizon_hours = max((horizon_end - now).total_seconds() / 3600, 0)
+
+        # Utilizare pe orizontul [now, makespan], în timp de lucru: programări existente + cele noi
+        new_hours = (schedule.assign(hours=b.work[placed] / _NS_PER_HOUR)
+                     .groupby('LineID')['hours'].sum()) if len(ends) else pd.Series(dtype='float64')
+        utilization = {}
+        for line_id in line_ids:
+            if self.calendar is not None:
+                available = self.calendar.working_hours(line_id, now, horizon_end)
+            else:
+                available = horizon_hours
+            if available > 0:
+                busy = (self.schedule_index.busy_hours(line_id, now, horizon_end, calendar=self.calendar)
+                        + new_hours.get(line_id, 0.0))
+                utilization[line_id] = min(100.0, busy / available * 100)
+
+        return {
+            'scheduled': len(ends),
+            'unscheduled': len(unscheduled),
+            'tardy_orders': int((tardiness > 0).sum()),
+            'total_tardiness_hours': float(tardiness.sum()),
+            'max_tardiness_hours': float(tardiness.max()) if len(tardiness) else 0.0,
+            'makespan_hours': horizon_hours,
+            'setup_hours': float(b.setup[placed].sum() / _NS_PER_HOUR),
+            'line_utilization': utilization,
+            'avg_utilization': float(np.mean(list(utilization.values()))) if utilization else 0.0
+        }
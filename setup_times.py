@@ -0,0 +1,193 @@
+"""
+🔧 Setup Times
+Sequence-dependent changeover model: a product-type transition matrix built
+from the setup_complexity rules (same type, different type, material,
+tooling) times each line's SetupTime_Minutes, plus the per-order quality
+check. Also groups like products into campaigns to cut total changeover.
+"""
+
+import numpy as np
+import pandas as pd
+
+import data_schema
+
+DEFAULT_SETUP_COMPLEXITY = {
+    'same_product_type': 1.0,
+    'different_product_type': 1.5,
+    'different_material': 2.0,
+    'different_tooling': 2.5
+}
+
+# Materialul și sculele fiecărui tip de produs (suprascrise de capacity_rules.product_process)
+DEFAULT_PRODUCT_PROCESS = {
+    'Electronics': {'material': 'Electronic', 'tooling': 'Assembly'},
+    'Medical': {'material': 'Polymer', 'tooling': 'Assembly'},
+    'Automotive': {'material': 'Metal', 'tooling': 'Machining'},
+    'Precision': {'material': 'Metal', 'tooling': 'Machining'},
+    'Heavy': {'material': 'Metal', 'tooling': 'Welding'},
+    'Package': {'material': 'Cardboard', 'tooling': 'Packaging'}
+}
+
+
+class SetupModel:
+    def __init__(self, lines_repository, get_rules):
+        self.lines_repository = lines_repository
+        self.get_rules = get_rules              # Întoarce dict-ul curent din production_rules.json
+
+        self.product_types = []                 # cod tip produs → nume
+        self.type_codes = {}                    # nume → cod tip produs
+        self.transition = np.ones((2, 2))       # [tip anterior, tip următor] → multiplicator setup
+        self.line_positions = {}                # LineID → poziție
+        self.setup_minutes = np.zeros(0)        # SetupTime_Minutes pe poziție
+        self.quality_minutes = np.zeros(0)      # QualityCheckTime_Minutes pe poziție (0 dacă nu e obligatoriu)
+
+        self._dirty = True
+        self._rules_ref = None
+        lines_repository.add_listener(self)
+
+    # Notificări de la TableRepository - orice schimbare a liniilor invalidează modelul
+    def table_rebuilt(self, df):
+        self._dirty = True
+
+    def rows_inserted(self, df):
+        self._dirty = True
+
+    def row_updated(self, key, row):
+        self._dirty = True
+
+    def rows_deleted(self, keys):
+        self._dirty = True
+
+    def _ensure(self):
+        """Frame-ul liniilor; modelul se recompilează doar dacă liniile sau regulile s-au schimbat"""
+        lines_df = self.lines_repository.frame()
+        rules = self.get_rules() or {}
+        if self._dirty or rules is not self._rules_ref:
+            self.compile(lines_df, rules)
+        return lines_df
+
+    def compile(self, lines_df, rules):
+        """Construiește matricea de tranziție între tipuri și timpii de setup / control pe linie"""
+        capacity_rules = rules.get('capacity_rules', {})
+        complexity = {**DEFAULT_SETUP_COMPLEXITY, **capacity_rules.get('setup_complexity', {})}
+        process = {**DEFAULT_PRODUCT_PROCESS, **capacity_rules.get('product_process', {})}
+
+        product_types = list(data_schema.PRODUCT_TYPES)
+        product_types.extend(t for t in process if t not in product_types)
+        self.product_types = product_types
+        self.type_codes = {product_type: code for code, product_type in enumerate(product_types)}
+
+        materials = np.array([process.get(t, {}).get('material', t) for t in product_types], dtype=object)
+        tooling = np.array([process.get(t, {}).get('tooling', t) for t in product_types], dtype=object)
+
+        # Regula cea mai severă câștigă: sculă diferită > material diferit > tip diferit
+        count = len(product_types)
+        transition = np.full((count + 2, count + 2), complexity['different_product_type'], dtype='float64')
+        transition[:count, :count][materials[:, None] != materials[None, :]] = complexity['different_material']
+        transition[:count, :count][tooling[:, None] != tooling[None, :]] = complexity['different_tooling']
+        transition[np.arange(count), np.arange(count)] = complexity['same_product_type']
+        # Penultimul cod = tip necunoscut; ultimul = linie fără lucrare anterioară (setup de bază)
+        transition[self.idle_code, :] = complexity['same_product_type']
+        self.transition = transition
+
+        self.line_positions = {line_id: position for position, line_id in
+                               enumerate(lines_df['LineID'].astype(object).tolist())} if 'LineID' in lines_df.columns else {}
+        self.setup_minutes = self._minutes(lines_df, 'SetupTime_Minutes')
+        quality_mandatory = rules.get('production_rules', {}).get('constraints', {}).get('quality_check_mandatory', True)
+        self.quality_minutes = self._minutes(lines_df, 'QualityCheckTime_Minutes') * bool(quality_mandatory)
+
+        self._rules_ref = rules
+        self._dirty = False
+
+    @staticmethod
+    def _minutes(lines_df, column):
+        if column not in lines_df.columns:
+            return np.zeros(len(lines_df))
+        return pd.to_numeric(lines_df[column], errors='coerce').fillna(0).to_numpy(dtype='float64')
+
+    @property
+    def unknown_code(self):
+        return len(self.product_types)
+
+    @property
+    def idle_code(self):
+        return len(self.product_types) + 1
+
+    def codes(self, product_types):
+        """Codurile tipurilor de produs (tipurile necunoscute / lipsă → unknown_code)"""
+        self._ensure()
+        codes = pd.Categorical(pd.Series(product_types, dtype=object), categories=self.product_types).codes
+        return np.where(codes < 0, self.unknown_code, codes)
+
+    def type_code(self, product_type):
+        """Codul unui tip de produs; None = linia nu are lucrare anterioară"""
+        self._ensure()
+        if product_type is None:
+            return self.idle_code
+        return self.type_codes.get(product_type, self.unknown_code)
+
+    def _position(self, line_id):
+        self._ensure()
+        return self.line_positions.get(line_id)
+
+    # Interogări
+    def changeover_minutes(self, line_id, from_type, to_type):
+        """Minutele de schimbare a fabricației pe linie de la from_type (None = linie liberă) la to_type"""
+        position = self._position(line_id)
+        if position is None:
+            return 0.0
+        multiplier = self.transition[self.type_code(from_type), self.type_code(to_type)]
+        return float(multiplier * self.setup_minutes[position])
+
+    def changeover(self, line_id, from_type, to_type):
+        return pd.Timedelta(minutes=self.changeover_minutes(line_id, from_type, to_type))
+
+    def quality_check(self, line_id):
+        """Controlul de calitate după fiecare comandă pe linie"""
+        position = self._position(line_id)
+        return pd.Timedelta(minutes=float(self.quality_minutes[position]) if position is not None else 0)
+
+    def sequence_minutes(self, line_id, product_types, previous_type=None):
+        """Minutele de setup înaintea fiecărei comenzi dintr-o secvență pe linie (vectorizat)"""
+        codes = self.codes(product_types)
+        position = self._position(line_id)
+        if position is None or not len(codes):
+            return np.zeros(len(codes))
+        previous = np.concatenate(([self.type_code(previous_type)], codes[:-1]))
+        return self.transition[previous, codes] * self.setup_minutes[position]
+
+    def schedule_changeovers(self, schedule_df, order_types):
+        """Minutele de setup ale fiecărei programări față de precedenta de pe aceeași linie (aliniat cu schedule_df)"""
+        self._ensure()
+        if schedule_df.empty:
+            return pd.Series(0.0, index=schedule_df.index)
+
+        df = schedule_df[['LineID', 'OrderID', 'StartDateTime']].sort_values(['LineID', 'StartDateTime'])
+        codes = pd.Series(self.codes(df['OrderID'].astype(object).map(order_types)), index=df.index)
+        line_ids = df['LineID'].astype(object)
+
+        previous = codes.groupby(line_ids).shift(1).fillna(self.idle_code).astype('int64')
+        positions = line_ids.map(self.line_positions)
+        known = positions.notna().to_numpy()
+        setup = np.zeros(len(df))
+        setup[known] = self.setup_minutes[positions[known].astype('int64').to_numpy()]
+
+        minutes = self.transition[previous.to_numpy(), codes.to_numpy()] * setup
+        return pd.Series(minutes, index=df.index).reindex(schedule_df.index)
+
+    def changeover_hours(self, schedule_df, order_types, t0, t1):
+        """Orele de setup pe linie pentru programările care încep în [t0, t1)"""
+        if schedule_df.empty:
+            return pd.Series(dtype='float64')
+        minutes = self.schedule_changeovers(schedule_df, order_types)
+        starts = schedule_df['StartDateTime']
+        in_window = (starts >= pd.Timestamp(t0)) & (starts < pd.Timestamp(t1))
+        return minutes[in_window].groupby(schedule_df.loc[in_window, 'LineID'].astype(object)).sum() / 60
+
+    def campaigns(self, product_types, due_ns):
+        """Ordinea comenzilor grupate pe tip de produs: campaniile după cel mai apropiat termen,
+        în interiorul campaniei după termen"""
+        codes = self.codes(product_types)
+        due_ns = np.asarray(due_ns, dtype='int64')
+        campaign_due = pd.Series(due_ns).groupby(codes).transform('min').to_numpy()
+        return np.lexsort((due_ns, codes, campaign_due))
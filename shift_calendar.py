@@ -0,0 +1,326 @@
+"""
+📅 Shift Calendar
+Working-time calendar built from production_config (hours per day, days per
+week) and the shift constraints: working intervals are precomputed over the
+horizon as NumPy arrays with cumulative working time, so "add N working
+hours to t" and "working time between t0 and t1" are O(log n) searchsorted
+lookups. Each line has its own calendar: the base shifts minus the line's
+blocked intervals (maintenance windows). For many lines at once the calendars
+are stacked into padded matrices and searched in one vectorized pass.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Primul schimb începe la această oră; schimburile zilei sunt consecutive
+SHIFT_START_HOUR = 6
+
+# Orizontul precalculat (se extinde automat când o interogare iese din el)
+HORIZON_PAST_DAYS = 60
+HORIZON_FUTURE_DAYS = 730
+
+_NS_PER_HOUR = 3600 * 10 ** 9
+
+# Completarea rândurilor mai scurte din StackedWorkingTime (mai mare decât orice moment real)
+_PAD = np.iinfo('int64').max
+
+
+def _ns(value):
+    return pd.Timestamp(value).value
+
+
+class WorkingTime:
+    """Intervale de lucru disjuncte și sortate, cu timpul de lucru cumulat la începutul fiecăruia"""
+
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts, dtype='int64')
+        self.ends = np.asarray(ends, dtype='int64')
+        self.cumulative = np.concatenate(([0], np.cumsum(self.ends - self.starts)))
+
+    def before(self, t):
+        """Timpul de lucru (ns) de la începutul orizontului până la t"""
+        i = np.searchsorted(self.starts, t, side='right') - 1
+        if i < 0:
+            return 0
+        return int(self.cumulative[i] + min(t, self.ends[i]) - self.starts[i])
+
+    def between(self, t0, t1):
+        return max(0, self.before(t1) - self.before(t0))
+
+    def add(self, t, duration):
+        """Momentul în care se acumulează `duration` ns de lucru pornind din t; None dacă iese din orizont"""
+        target = self.before(t) + duration
+        if duration <= 0:
+            return t
+        k = np.searchsorted(self.cumulative, target, side='left') - 1
+        if k >= len(self.starts):
+            return None
+        return int(self.starts[k] + target - self.cumulative[k])
+
+    def next_working(self, t):
+        """Primul moment de lucru ≥ t; None dacă iese din orizont"""
+        i = np.searchsorted(self.ends, t, side='right')
+        if i >= len(self.starts):
+            return None
+        return int(max(t, self.starts[i]))
+
+    def without(self, blocked):
+        """Calendarul fără intervalele blocate [(start, end)] în ns"""
+        starts, ends = self.starts, self.ends
+        for block_start, block_end in sorted(blocked):
+            first = np.searchsorted(ends, block_start, side='right')
+            last = np.searchsorted(starts, block_end, side='left')
+            if first >= last:
+                continue
+
+            # Intervalele atinse se taie: rămân bucățile dinainte și de după blocare
+            pieces_start, pieces_end = [], []
+            if starts[first] < block_start:
+                pieces_start.append(starts[first])
+                pieces_end.append(block_start)
+            if ends[last - 1] > block_end:
+                pieces_start.append(block_end)
+                pieces_end.append(ends[last - 1])
+
+            starts = np.concatenate((starts[:first], np.array(pieces_start, dtype='int64'), starts[last:]))
+            ends = np.concatenate((ends[:first], np.array(pieces_end, dtype='int64'), ends[last:]))
+        return WorkingTime(starts, ends)
+
+
+class StackedWorkingTime:
+    """Calendarele mai multor linii aplatizate rând cu rând (lățime fixă, completate cu _PAD), pentru
+    interogări vectorizate pe un set de linii: cheile rând × span + valoare permit un singur
+    np.searchsorted pentru toate liniile."""
+
+    def __init__(self, calendars):
+        self.width = max((len(calendar.starts) for calendar in calendars), default=0) + 1
+        self.sizes = np.array([len(calendar.starts) for calendar in calendars], dtype='int64')
+
+        # + un element de completare la final, ca indicii „după ultimul rând” să rămână valizi
+        cells = len(calendars) * self.width + 1
+        self.starts = np.full(cells, _PAD, dtype='int64')
+        self.ends = np.full(cells, _PAD, dtype='int64')
+        self.cumulative = np.full(cells, _PAD, dtype='int64')
+        for row, calendar in enumerate(calendars):
+            first, size = row * self.width, len(calendar.starts)
+            self.starts[first:first + size] = calendar.starts
+            self.ends[first:first + size] = calendar.ends
+            self.cumulative[first:first + size + 1] = calendar.cumulative
+
+        # Valorile reale devin 0..span-1 față de bază; completarea primește cheia maximă a rândului
+        used = [calendar for calendar in calendars if len(calendar.starts)]
+        self.time_base = min((int(calendar.starts[0]) for calendar in used), default=0)
+        last_end = max((int(calendar.ends[-1]) for calendar in used), default=0)
+        last_work = max((int(calendar.cumulative[-1]) for calendar in used), default=0)
+        self.span = max(last_end - self.time_base, last_work) + 1
+
+        # Multe linii × orizont lung nu încap în int64 - cheile se rotunjesc la `quantum` ns
+        # (căutarea dă o margine inferioară, corectată apoi pe valorile exacte)
+        self.quantum = 1
+        while len(calendars) * (self.span // self.quantum + 2) > np.iinfo('int64').max:
+            self.quantum *= 2
+        self.key_span = self.span // self.quantum + 2
+        self.keys = {
+            'ends': self._keys(self.ends, self.time_base),
+            'cumulative': self._keys(self.cumulative, 0)
+        }
+
+    def _keys(self, values, base):
+        """Cheile sortate: rând × key_span + (valoare - bază) // quantum; completarea → ultima cheie a rândului"""
+        rows = np.arange(len(values)) // self.width
+        real = values != _PAD
+        local = np.where(real, (np.where(real, values, base) - base) // self.quantum, self.key_span - 1)
+        return rows * self.key_span + local
+
+    def _search(self, name, row_keys, values, side):
+        """Indicele (aplatizat) dat de np.searchsorted pe rândul fiecărei valori"""
+        values_flat = self.ends if name == 'ends' else self.cumulative
+        base = self.time_base if name == 'ends' else 0
+        local = np.minimum(np.maximum(values - base, 0), self.span - 1) // self.quantum
+        found = np.searchsorted(self.keys[name], row_keys + local, 'left')
+
+        # Valorile din aceeași treaptă de rotunjire sunt depășite pe valorile exacte (completarea le oprește)
+        while True:
+            probe = values_flat[found]
+            behind = ((probe <= values) if side == 'right' else (probe < values)) & (probe != _PAD)
+            if not behind.any():
+                return found
+            found = found + behind
+
+    def add_after(self, rows, t, duration):
+        """(next_working(t) + duration timp de lucru, în orizont?) pe fiecare rând -
+        ca WorkingTime.add(WorkingTime.next_working(t), duration)"""
+        row_keys = rows * self.key_span
+        row_ends = rows * self.width + self.sizes[rows]
+
+        i = self._search('ends', row_keys, t, 'right')
+        start = np.maximum(t, self.starts[i])
+
+        # start e în intervalul i - timpul de lucru până la el vine direct din suma cumulată
+        target = self.cumulative[i] + (start - self.starts[i]) + duration
+        k = self._search('cumulative', row_keys, target, 'left') - 1
+        end = self.starts[k] + (target - self.cumulative[k])
+
+        inside = (i < row_ends) & ((k < row_ends) | (duration <= 0))
+        return np.where(duration <= 0, start, end), inside
+
+
+class ShiftCalendar:
+    def __init__(self, get_config, get_rules):
+        self.get_config = get_config        # Întoarce production_config
+        self.get_rules = get_rules          # Întoarce dict-ul curent din production_rules.json
+
+        self.horizon = (0, 0)               # [început, sfârșit) în ns
+        self.base = WorkingTime([], [])
+        self.lines = {}                     # LineID → WorkingTime (calendarele proprii ale liniilor)
+        self.blocked_source = None          # Obiect cu blocked_intervals(line_id) → [(start, end)] în ns
+        self.version = 0                    # Crește la fiecare build / invalidate (calendarele stivuite expiră)
+        self._stacked = None                # (lista LineID-urilor, versiune, StackedWorkingTime)
+        self._rules_ref = None
+
+    def daily_window(self):
+        """(ora de început, ore de lucru pe zi) din config, limitate de regulile de schimb"""
+        config = self.get_config() or {}
+        constraints = (self.get_rules() or {}).get('production_rules', {}).get('constraints', {})
+
+        hours = float(config.get('work_hours_per_day', 16))
+        hours = min(hours, float(constraints.get('max_continuous_hours', hours)))
+        if hours < 24:
+            hours = min(hours, 24 - float(constraints.get('min_break_between_shifts', 0)))
+        return SHIFT_START_HOUR, max(0.0, hours)
+
+    def _ensure(self, *times):
+        """Recalculează orizontul dacă regulile s-au schimbat sau un moment cerut iese din el"""
+        rules = self.get_rules()
+        start, end = self.horizon
+        if rules is self._rules_ref and (not times or (start <= min(times) and max(times) < end)):
+            return
+
+        now = _ns(datetime.now())
+        covered = [start, end] if rules is self._rules_ref and end > start else []
+        start = min([now - HORIZON_PAST_DAYS * 24 * _NS_PER_HOUR] + covered + list(times))
+        end = max([now + HORIZON_FUTURE_DAYS * 24 * _NS_PER_HOUR] + covered + [t + 24 * _NS_PER_HOUR for t in times])
+        self.build(start, end)
+        self._rules_ref = rules
+
+    def build(self, start, end):
+        """Intervalele de lucru ale fiecărei zile lucrătoare din [start, end) - vectorizat"""
+        days = pd.date_range(pd.Timestamp(start).normalize() - timedelta(days=1), pd.Timestamp(end).normalize(), freq='D')
+        days_per_week = int((self.get_config() or {}).get('days_per_week', 6))
+        days = days[days.weekday < days_per_week]
+
+        start_hour, hours = self.daily_window()
+        starts = days.asi8 + int(start_hour * _NS_PER_HOUR)
+        ends = starts + int(hours * _NS_PER_HOUR)
+
+        # Intervalele lipite (program 24h) se unesc într-unul singur
+        if len(starts) and hours > 0:
+            breaks = np.flatnonzero(starts[1:] > ends[:-1])
+            starts = np.concatenate((starts[:1], starts[breaks + 1]))
+            ends = np.concatenate((ends[breaks], ends[-1:]))
+        else:
+            starts = ends = np.zeros(0, dtype='int64')
+
+        self.base = WorkingTime(starts, ends)
+        self.horizon = (int(days.asi8[0]) if len(days) else start, end)
+        self.lines = {}
+        self.version += 1
+
+    def line(self, line_id):
+        """Calendarul de lucru al unei linii (construit la prima cerere, păstrat până la invalidare)"""
+        self._ensure()
+        calendar = self.lines.get(line_id)
+        if calendar is None:
+            blocked = self.blocked_source.blocked_intervals(line_id) if self.blocked_source is not None else []
+            calendar = self.base.without(blocked) if blocked else self.base
+            self.lines[line_id] = calendar
+        return calendar
+
+    def invalidate(self, line_id=None):
+        """Calendarul unei linii (sau al tuturor) se reconstruiește la următoarea cerere"""
+        if line_id is None:
+            self.lines = {}
+        else:
+            self.lines.pop(line_id, None)
+        self.version += 1
+
+    def stacked(self, line_ids):
+        """Calendarele liniilor stivuite - refolosite pentru aceeași listă line_ids până la build / invalidate"""
+        self._ensure()
+        return self._stacked_lines(line_ids)
+
+    def _stacked_lines(self, line_ids):
+        # Aceeași listă de linii (același obiect) și nicio invalidare de la construire - se refolosește
+        if self._stacked is not None and self._stacked[0] is line_ids and self._stacked[1] == self.version:
+            return self._stacked[2]
+        self._stacked = (line_ids, self.version, StackedWorkingTime([self.line(line_id) for line_id in line_ids]))
+        return self._stacked[2]
+
+    # Interogări în ns (folosite de motorul de programare)
+    def add_ns(self, line_id, t, duration):
+        self._ensure(t)
+        result = self.line(line_id).add(t, duration)
+        while result is None:
+            # Orizontul nu ajunge - se extinde cu durata cerută (în timp calendaristic, cu marjă)
+            self._ensure(t, self.horizon[1] + max(duration * 4, 7 * 24 * _NS_PER_HOUR))
+            result = self.line(line_id).add(t, duration)
+        return result
+
+    def next_working_ns(self, line_id, t):
+        self._ensure(t)
+        result = self.line(line_id).next_working(t)
+        while result is None:
+            self._ensure(t, self.horizon[1] + 7 * 24 * _NS_PER_HOUR)
+            result = self.line(line_id).next_working(t)
+        return result
+
+    def add_after_ns(self, line_ids, rows, t, durations):
+        """Vectorizat pe linii: add_ns(next_working_ns(t[k]), durations[k]) pe linia line_ids[rows[k]]"""
+        rows = np.asarray(rows, dtype='int64')
+        t, durations = np.asarray(t, dtype='int64'), np.asarray(durations, dtype='int64')
+        if not len(t):
+            return t
+        self._ensure(int(t.min()), int(t.max()))
+        end, inside = self._stacked_lines(line_ids).add_after(rows, t, durations)
+        if inside.all():
+            return end
+
+        # Rar: rezultatul iese din orizont - calea scalară îl extinde
+        for k in np.flatnonzero(~inside):
+            line_id = line_ids[rows[k]]
+            end[k] = self.add_ns(line_id, self.next_working_ns(line_id, int(t[k])), int(durations[k]))
+        return end
+
+    def between_ns(self, line_id, t0, t1):
+        self._ensure(t0, t1)
+        return self.line(line_id).between(t0, t1)
+
+    # Interogări cu Timestamp / timedelta
+    def add(self, line_id, t, duration):
+        """t + `duration` timp de lucru pe linie"""
+        return pd.Timestamp(self.add_ns(line_id, _ns(t), pd.Timedelta(duration).value))
+
+    def next_working(self, line_id, t):
+        return pd.Timestamp(self.next_working_ns(line_id, _ns(t)))
+
+    def working_hours(self, line_id, t0, t1):
+        """Orele de lucru ale liniei în [t0, t1)"""
+        return self.between_ns(line_id, _ns(t0), _ns(t1)) / _NS_PER_HOUR
+
+    def fit(self, schedule_index, line_id, after, duration):
+        """Primul (start, sfârșit) ≥ after în care `duration` timp de lucru încape pe linie fără
+        suprapunere cu programările existente"""
+        start, end = self.fit_ns(schedule_index, line_id, _ns(after), pd.Timedelta(duration).value)
+        return pd.Timestamp(start), pd.Timestamp(end)
+
+    def fit_ns(self, schedule_index, line_id, after, duration):
+        """Ca fit, cu momente și durată în ns (folosit de motorul de programare)"""
+        start = self.next_working_ns(line_id, after)
+        while True:
+            end = self.add_ns(line_id, start, duration)
+            gap = schedule_index.first_gap(line_id, pd.Timestamp(start), pd.Timedelta(end - start)).value
+            if gap == start:
+                return start, end
+            start = self.next_working_ns(line_id, gap)
@@ -0,0 +1,92 @@
+"""
+⚡ Snapshot Cache
+Binary warm-start snapshot of the normalized tables, their indexes and derived metrics,
+keyed by size, mtime and content hash of every source file
+"""
+
+import os
+import pickle
+import hashlib
+
+import pandas as pd
+
+# Se incrementează când se schimbă structura snapshot-ului sau schema tabelelor
+CACHE_VERSION = 2
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Hash-ul conținutului unui fișier (blake2b, citit în bucăți)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotCache:
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+
+    def fingerprint(self, source_files):
+        """Amprenta fișierelor sursă: dimensiune, mtime și hash (fișierele lipsă contează și ele)"""
+        fingerprint = {}
+        for path in source_files:
+            if not os.path.exists(path):
+                fingerprint[path] = None
+                continue
+            stat = os.stat(path)
+            fingerprint[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_digest(path)}
+        return fingerprint
+
+    def _source_unchanged(self, path, stored):
+        """Dimensiune + mtime identice → valid; mtime schimbat → decide hash-ul"""
+        if stored is None:
+            return not os.path.exists(path)
+        if not os.path.exists(path):
+            return False
+
+        stat = os.stat(path)
+        if stat.st_size != stored['size']:
+            return False
+        if stat.st_mtime_ns == stored['mtime_ns']:
+            return True
+        return file_digest(path) == stored['hash']
+
+    def load(self, source_files):
+        """Încarcă snapshot-ul dacă toate sursele sunt neschimbate, altfel None"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+        if snapshot.get('version') != CACHE_VERSION or snapshot.get('pandas') != pd.__version__:
+            return None
+
+        fingerprint = snapshot.get('fingerprint', {})
+        if sorted(fingerprint) != sorted(source_files):
+            return None
+
+        for path in source_files:
+            if not self._source_unchanged(path, fingerprint[path]):
+                return None
+
+        return snapshot['payload']
+
+    def save(self, source_files, payload):
+        """Scrie atomic snapshot-ul împreună cu amprenta surselor"""
+        snapshot = {
+            'version': CACHE_VERSION,
+            'pandas': pd.__version__,
+            'fingerprint': self.fingerprint(source_files),
+            'payload': payload
+        }
+
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+
+    def invalidate(self):
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
@@ -0,0 +1,161 @@
+"""
+🗄️ SQLite Store
+Embedded SQLite repository with indexes for the hot lookup patterns
+(OrderID, LineID, Status, StartDateTime) and a DataFrame-compatible read API
+"""
+
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from storage_backend import StorageBackend, prepare_typed_frame, DATE_COLUMNS
+from change_journal import PRIMARY_KEYS
+
+# Indexuri secundare pentru tiparele de acces din aplicație
+SECONDARY_INDEXES = {
+    'production_lines': [('Status',)],
+    'orders': [('Status',), ('DueDate',), ('AssignedLine',)],
+    'schedule': [('LineID', 'StartDateTime'), ('OrderID',), ('Status',), ('StartDateTime',)]
+}
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _sql_type(dtype):
+    """Tipul SQLite pentru un dtype pandas"""
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _sql_value(value):
+    """Convertește o valoare pandas/numpy într-o valoare SQLite"""
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime(DATETIME_FORMAT)
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+class SQLiteStorage(StorageBackend):
+    """Backend SQLite - scrieri la nivel de rând și interogări indexate"""
+
+    name = 'sqlite'
+    extension = '.sqlite'
+    supports_row_updates = True
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.db_path = os.path.join(self.data_dir, f"manufacturing{self.extension}")
+        self.lock = threading.Lock()
+        # Statement-urile parametrizate sunt păstrate compilate în cache-ul conexiunii
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._columns = {}
+
+    def table_path(self, table_name):
+        """Toate tabelele sunt în același fișier de bază de date"""
+        return f"{self.db_path}:{table_name}"
+
+    def source_files(self):
+        """Baza de date și fișierul WAL asociat"""
+        return [self.db_path, f"{self.db_path}-wal"]
+
+    def exists(self, table_name):
+        row = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        ).fetchone()
+        return row is not None
+
+    def load_table(self, table_name):
+        with self.lock:
+            return pd.read_sql_query(f'SELECT * FROM "{table_name}"', self.conn)
+
+    def save_table(self, table_name, df):
+        """Rescrie complet un tabel într-o singură tranzacție"""
+        typed_df = prepare_typed_frame(table_name, df)
+        key_column = PRIMARY_KEYS[table_name]
+        columns = list(typed_df.columns)
+
+        column_defs = []
+        for column in columns:
+            column_type = 'TEXT' if column in DATE_COLUMNS[table_name] else _sql_type(typed_df[column].dtype)
+            primary = ' PRIMARY KEY' if column == key_column else ''
+            column_defs.append(f'"{column}" {column_type}{primary}')
+
+        placeholders = ', '.join('?' for _ in columns)
+        quoted_columns = ', '.join(f'"{column}"' for column in columns)
+        rows = [tuple(_sql_value(value) for value in record)
+                for record in typed_df.itertuples(index=False, name=None)]
+
+        with self.lock, self.conn:
+            self.conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            self.conn.execute(f'CREATE TABLE "{table_name}" ({", ".join(column_defs)})')
+            self.conn.executemany(
+                f'INSERT OR REPLACE INTO "{table_name}" ({quoted_columns}) VALUES ({placeholders})', rows)
+
+            for index_columns in SECONDARY_INDEXES.get(table_name, []):
+                if all(column in columns for column in index_columns):
+                    index_name = f"idx_{table_name}_{'_'.join(index_columns)}"
+                    self.conn.execute(
+                        f'CREATE INDEX "{index_name}" ON "{table_name}" '
+                        f'({", ".join(chr(34) + c + chr(34) for c in index_columns)})')
+
+        self._columns[table_name] = columns
+
+    def _table_columns(self, table_name):
+        if table_name not in self._columns:
+            info = self.conn.execute(f'PRAGMA table_info("{table_name}")').fetchall()
+            self._columns[table_name] = [row['name'] for row in info]
+        return self._columns[table_name]
+
+    def apply_change(self, table_name, op, row):
+        """Aplică o modificare de rând direct în baza de date (upsert/delete)"""
+        key_column = PRIMARY_KEYS[table_name]
+
+        with self.lock, self.conn:
+            if op == 'delete':
+                self.conn.execute(f'DELETE FROM "{table_name}" WHERE "{key_column}" = ?',
+                                  (_sql_value(row[key_column]),))
+                return True
+
+            columns = [column for column in self._table_columns(table_name) if column in row]
+            placeholders = ', '.join('?' for _ in columns)
+            quoted_columns = ', '.join(f'"{column}"' for column in columns)
+            self.conn.execute(
+                f'INSERT OR REPLACE INTO "{table_name}" ({quoted_columns}) VALUES ({placeholders})',
+                tuple(_sql_value(row[column]) for column in columns))
+        return True
+
+    # Interogări indexate
+
+    def get_row(self, table_name, key):
+        """Căutare punctuală după cheia primară"""
+        key_column = PRIMARY_KEYS[table_name]
+        with self.lock:
+            row = self.conn.execute(
+                f'SELECT * FROM "{table_name}" WHERE "{key_column}" = ?', (key,)).fetchone()
+        return dict(row) if row else None
+
+    def get_order(self, order_id):
+        return self.get_row('orders', order_id)
+
+    def get_line(self, line_id):
+        return self.get_row('production_lines', line_id)
+
+    def orders_by_status(self, status):
+        with self.lock:
+            rows = self.conn.execute('SELECT * FROM "orders" WHERE "Status" = ?', (status,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
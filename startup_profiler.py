@@ -0,0 +1,29 @@
+"""
+⏱️ Startup Profiler
+Instrumented startup timeline - records each startup phase and prints where the time goes
+"""
+
+import time
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []        # (etapă, durată ms, timp cumulat ms)
+
+    def mark(self, phase):
+        """Marchează sfârșitul unei etape de pornire"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000, (now - self.started) * 1000))
+        self.last = now
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def report(self):
+        """Afișează timeline-ul de pornire"""
+        print("⏱️ Startup timeline:")
+        for phase, duration, total in self.phases:
+            print(f"   {total:8.1f} ms  (+{duration:7.1f} ms)  {phase}")
+        return self.phases
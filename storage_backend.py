@@ -0,0 +1,181 @@
+"""
+💾 Storage Backend
+Pluggable columnar storage for production tables (Arrow IPC / Parquet)
+Excel is kept only as an import/export format
+"""
+
+import os
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Tabelele gestionate de aplicație
+TABLE_NAMES = ('production_lines', 'orders', 'schedule')
+
+# Coloane care trebuie stocate ca datetime64 (tipizate, nu text)
+DATE_COLUMNS = {
+    'production_lines': [],
+    'orders': ['OrderDate', 'DueDate'],
+    'schedule': ['StartDateTime', 'EndDateTime', 'ActualStart', 'ActualEnd', 'LastModified']
+}
+
+
+def prepare_typed_frame(table_name, df):
+    """Pregătește un DataFrame pentru stocare columnară cu tipuri consistente"""
+    typed_df = df.reset_index(drop=True).copy()
+
+    for column in DATE_COLUMNS.get(table_name, []):
+        if column in typed_df.columns:
+            typed_df[column] = pd.to_datetime(typed_df[column].replace('', None), errors='coerce')
+
+    # Coloanele object cu tipuri mixte (ex: '' și numere) devin text
+    for column in typed_df.columns:
+        if typed_df[column].dtype == object:
+            non_null = typed_df[column].dropna()
+            if not non_null.map(lambda value: isinstance(value, str)).all():
+                typed_df[column] = typed_df[column].map(lambda value: value if pd.isna(value) else str(value))
+
+    return typed_df
+
+
+class StorageBackend:
+    """Interfața comună pentru backend-urile de stocare"""
+
+    name = 'base'
+    extension = ''
+    supports_row_updates = False
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def table_path(self, table_name):
+        """Calea fișierului pentru un tabel"""
+        return os.path.join(self.data_dir, f"{table_name}{self.extension}")
+
+    def temp_path(self, path):
+        """Fișierul temporar pentru scrierea atomică - păstrează extensia (orders.tmp.xlsx)"""
+        if self.extension and path.endswith(self.extension):
+            return f"{path[:-len(self.extension)]}.tmp{self.extension}"
+        return f"{path}.tmp"
+
+    def exists(self, table_name):
+        """Verifică dacă tabelul există în store"""
+        return os.path.exists(self.table_path(table_name))
+
+    def source_files(self):
+        """Fișierele de pe disc care conțin datele store-ului"""
+        return [self.table_path(table_name) for table_name in TABLE_NAMES]
+
+    def load_table(self, table_name):
+        """Încarcă un tabel ca DataFrame"""
+        raise NotImplementedError
+
+    def save_table(self, table_name, df):
+        """Salvează atomic un tabel (scriere în fișier temporar + replace)"""
+        path = self.table_path(table_name)
+        tmp_path = self.temp_path(path)
+        self._write(table_name, prepare_typed_frame(table_name, df), tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write(self, table_name, df, path):
+        raise NotImplementedError
+
+    def apply_change(self, table_name, op, row):
+        """Modificare la nivel de rând - suportată doar de backend-urile tranzacționale"""
+        return False
+
+    def import_from_excel(self, table_name, excel_file):
+        """Importă un tabel dintr-un fișier Excel în store"""
+        df = pd.read_excel(excel_file)
+        self.save_table(table_name, df)
+        return len(df)
+
+    def export_to_excel(self, table_name, excel_file, df=None):
+        """Exportă un tabel din store într-un fișier Excel"""
+        if df is None:
+            df = self.load_table(table_name)
+        df.to_excel(excel_file, index=False)
+        return len(df)
+
+
+class ArrowIPCStorage(StorageBackend):
+    """Backend Arrow IPC (Feather v2) - citire/scriere rapidă, memory-mapped"""
+
+    name = 'arrow'
+    extension = '.arrow'
+
+    def load_table(self, table_name):
+        table = feather.read_table(self.table_path(table_name), memory_map=True)
+        return table.to_pandas()
+
+    def _write(self, table_name, df, path):
+        feather.write_feather(df, path)
+
+
+class ParquetStorage(StorageBackend):
+    """Backend Parquet - fișiere compacte, potrivit pentru arhivare"""
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def load_table(self, table_name):
+        return parquet.read_table(self.table_path(table_name)).to_pandas()
+
+    def _write(self, table_name, df, path):
+        parquet.write_table(_arrow_table(df), path)
+
+
+class ExcelStorage(StorageBackend):
+    """Backend Excel - folosit doar când pyarrow nu este instalat"""
+
+    name = 'excel'
+    extension = '.xlsx'
+
+    def load_table(self, table_name):
+        return pd.read_excel(self.table_path(table_name))
+
+    def _write(self, table_name, df, path):
+        # openpyxl are nevoie de extensia .xlsx - temp_path o păstrează pentru fișierul temporar
+        df.to_excel(path, index=False, engine='openpyxl')
+
+
+def _arrow_table(df):
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def create_storage_backend(data_dir, preferred='arrow'):
+    """Creează backend-ul de stocare preferat (arrow, parquet, sqlite, excel), cu fallback pe Excel"""
+    if preferred == 'sqlite':
+        import sqlite_store
+        return sqlite_store.SQLiteStorage(data_dir)
+
+    if preferred == 'excel' or not PYARROW_AVAILABLE:
+        if preferred != 'excel':
+            print("⚠️ pyarrow nu este instalat - folosesc stocarea Excel (pip install pyarrow)")
+        return ExcelStorage(data_dir)
+
+    if preferred == 'parquet':
+        return ParquetStorage(data_dir)
+
+    return ArrowIPCStorage(data_dir)
+
+
+def migrate_excel_to_store(storage, excel_files):
+    """Migrare one-shot: importă fișierele Excel existente pentru tabelele lipsă din store"""
+    migrated = {}
+
+    for table_name, excel_file in excel_files.items():
+        if storage.exists(table_name) or not os.path.exists(excel_file):
+            continue
+
+        migrated[table_name] = storage.import_from_excel(table_name, excel_file)
+        print(f"📦 Migrat {excel_file} → {storage.table_path(table_name)} ({migrated[table_name]} rânduri)")
+
+    return migrated
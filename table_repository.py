@@ -0,0 +1,192 @@
+"""
+🔑 Table Repository
+Primary-key hash index (OrderID / LineID / ScheduleID → row label) over an
+in-memory table, kept consistent on insert, update and delete.
+Secondary indexes register as listeners and receive the same changes;
+those declaring SNAPSHOT_FIELDS can be saved and restored with the table.
+"""
+
+import weakref
+
+import pandas as pd
+
+import data_schema
+from change_journal import PRIMARY_KEYS
+
+
+class TableRepository:
+    def __init__(self, table_name, get_frame, set_frame=None):
+        self.table_name = table_name
+        self.key_column = PRIMARY_KEYS[table_name]
+        self.get_frame = get_frame          # Întoarce DataFrame-ul curent al tabelului
+        self.set_frame = set_frame          # Înlocuiește DataFrame-ul (inserări/ștergeri)
+
+        self.labels = {}                    # cheie primară → eticheta rândului
+        self.listeners = []                 # Indexuri secundare notificate la fiecare modificare
+        self._frame_ref = None              # DataFrame-ul pentru care e construit indexul
+        self._frame_size = 0
+
+    def add_listener(self, listener):
+        """Înregistrează un index secundar (table_rebuilt, rows_inserted, row_updated, rows_deleted)"""
+        self.listeners.append(listener)
+        # Indexul complet se construiește la primul acces (tabelul poate să nu fie încă încărcat)
+        self._frame_ref = None
+
+    def frame(self):
+        """DataFrame-ul curent, cu indexurile sincronizate"""
+        return self._sync()
+
+    def _sync(self):
+        """DataFrame-ul curent; indexul se reconstruiește doar dacă tabelul a fost înlocuit din afară"""
+        df = self.get_frame()
+        indexed = self._frame_ref() if self._frame_ref is not None else None
+        if indexed is not df or len(df) != self._frame_size:
+            self.rebuild(df)
+        return df
+
+    def rebuild(self, df=None, notify=True):
+        """Reconstruiește indexul complet (o singură trecere vectorizată)"""
+        if df is None:
+            df = self.get_frame()
+
+        if self.key_column in df.columns:
+            self.labels = dict(zip(df[self.key_column].astype(object).tolist(), df.index.tolist()))
+        else:
+            self.labels = {}
+        self._remember(df)
+
+        if notify:
+            for listener in self.listeners:
+                listener.table_rebuilt(df)
+
+    def export_state(self):
+        """Indexul cheii primare + câmpurile SNAPSHOT_FIELDS ale indexurilor secundare (pentru snapshot)"""
+        df = self._sync()
+        return {
+            'size': len(df),
+            'labels': self.labels,
+            'listeners': [(type(listener).__name__,
+                           {field: getattr(listener, field) for field in listener.SNAPSHOT_FIELDS}
+                           if hasattr(listener, 'SNAPSHOT_FIELDS') else None)
+                          for listener in self.listeners]
+        }
+
+    def restore_state(self, df, state):
+        """Adoptă df cu indexurile din snapshot; False (și reconstruire completă) dacă starea nu se potrivește"""
+        listeners = state.get('listeners', []) if state else []
+        if (not state or state.get('size') != len(df) or
+                [name for name, _ in listeners] != [type(listener).__name__ for listener in self.listeners]):
+            self.rebuild(df)
+            return False
+
+        self.labels = state['labels']
+        self._remember(df)
+        for listener, (_, fields) in zip(self.listeners, listeners):
+            if fields is None:
+                listener.table_rebuilt(df)      # Index ieftin, fără stare salvată
+                continue
+            for field, value in fields.items():
+                setattr(listener, field, value)
+        return True
+
+    def _remember(self, df):
+        self._frame_ref = weakref.ref(df)
+        self._frame_size = len(df)
+
+    def __contains__(self, key):
+        self._sync()
+        return key in self.labels
+
+    def __len__(self):
+        return len(self._sync())
+
+    def keys(self):
+        self._sync()
+        return self.labels.keys()
+
+    def label(self, key):
+        """Eticheta rândului pentru o cheie primară, sau None"""
+        self._sync()
+        return self.labels.get(key)
+
+    def get(self, key):
+        """Rândul (Series) pentru o cheie primară, sau None"""
+        df = self._sync()
+        label = self.labels.get(key)
+        return df.loc[label] if label is not None else None
+
+    def get_value(self, key, column, default=None):
+        df = self._sync()
+        label = self.labels.get(key)
+        return df.at[label, column] if label is not None else default
+
+    def update(self, key, values):
+        """Actualizează coloanele unui rând existent; întoarce rândul ca dict"""
+        df = self._sync()
+        label = self.labels.get(key)
+        if label is None:
+            raise KeyError(f"{self.key_column} {key} not found")
+
+        for column, value in values.items():
+            data_schema.set_value(df, label, column, value)
+
+        # Cheia primară schimbată - mută intrarea din index
+        new_key = values.get(self.key_column, key)
+        if new_key != key:
+            del self.labels[key]
+            self.labels[new_key] = label
+
+        row = df.loc[label].to_dict()
+        for listener in self.listeners:
+            listener.row_updated(key, row)
+        return row
+
+    def update_many(self, keys, values):
+        """Actualizează coloane pe multe rânduri deodată (valori scalare sau liste aliniate cu keys)"""
+        df = self._sync()
+        labels = [self.labels[key] for key in keys]
+
+        for column, column_values in values.items():
+            data_schema.set_values(df, labels, column, column_values)
+
+        # Multe rânduri schimbate - indexurile secundare se reconstruiesc o singură dată
+        self.rebuild(df)
+        return len(labels)
+
+    def insert(self, rows):
+        """Adaugă rânduri (listă de dict-uri sau DataFrame) și indexează doar rândurile noi"""
+        df = self._sync()
+        old_size = len(df)
+        contiguous = df.index.equals(pd.RangeIndex(old_size))
+
+        new_df = data_schema.append_rows(self.table_name, df, rows)
+        self.set_frame(new_df)
+
+        if contiguous:
+            # Rândurile vechi își păstrează etichetele (0..n-1) - se adaugă doar cele noi
+            new_keys = new_df[self.key_column].iloc[old_size:].astype(object).tolist()
+            self.labels.update(zip(new_keys, range(old_size, len(new_df))))
+            self._remember(new_df)
+            for listener in self.listeners:
+                listener.rows_inserted(new_df.iloc[old_size:])
+        else:
+            self.rebuild(new_df)
+
+        return new_df
+
+    def delete(self, keys):
+        """Șterge rândurile cu cheile date; întoarce numărul de rânduri șterse"""
+        df = self._sync()
+        keys = [key for key in keys if key in self.labels]
+        if not keys:
+            return 0
+
+        new_df = df.drop(index=[self.labels[key] for key in keys]).reset_index(drop=True)
+        self.set_frame(new_df)
+        for listener in self.listeners:
+            listener.rows_deleted(keys)
+
+        # Pozițiile se decalează după ștergere - reindexare completă (indexurile secundare nu depind de ele)
+        self.rebuild(new_df, notify=False)
+        return len(keys)
+
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Modulele aplicației sunt la rădăcina repository-ului (fără pachet instalabil)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_schema          # noqa: E402
+import table_repository     # noqa: E402
+
+
+class Tables:
+    """Tabelele în memorie cu câte un TableRepository, ca în ManufacturingScheduler"""
+
+    def __init__(self, frames):
+        self.frames = {name: data_schema.normalize_frame(name, pd.DataFrame(rows))
+                       for name, rows in frames.items()}
+        self.repositories = {
+            name: table_repository.TableRepository(
+                name, lambda name=name: self.frames[name],
+                lambda df, name=name: self.frames.__setitem__(name, df))
+            for name in self.frames
+        }
+
+    def __getitem__(self, name):
+        return self.repositories[name]
+
+
+@pytest.fixture
+def make_tables():
+    return Tables
@@ -0,0 +1,112 @@
+import pytest
+
+import order_dependencies
+from order_dependencies import DependencyGraph
+
+
+def assert_topological(graph):
+    """Fiecare muchie acceptată merge înainte în ordinea topologică"""
+    for dependent, prerequisites in graph.prerequisites.items():
+        for prerequisite in prerequisites:
+            assert graph.position[prerequisite] < graph.position[dependent]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('ORD-1, ORD-2', ['ORD-1', 'ORD-2']),
+    ('ORD-1;ORD-2 ORD-1', ['ORD-1', 'ORD-2']),
+    ('', []),
+    (None, []),
+    (float('nan'), []),
+])
+def test_parse_dependencies(value, expected):
+    assert order_dependencies.parse_dependencies(value) == expected
+
+
+def test_build_orders_prerequisites_first():
+    graph = DependencyGraph()
+    graph.build({'C': ['B'], 'B': ['A'], 'A': []})
+    assert graph.topological_order() == ['A', 'B', 'C']
+    assert graph.ancestors('C') == {'A', 'B'}
+    assert graph.descendants('A') == {'B', 'C'}
+    assert not graph.has_cycles()
+
+
+def test_edge_closing_a_cycle_is_rejected():
+    graph = DependencyGraph()
+    graph.build({'A': [], 'B': ['A'], 'C': ['B']})
+
+    graph.set_dependencies('A', ['C'])
+    assert graph.cyclic_edges == {('C', 'A')}
+    assert graph.has_cycles()
+    assert graph.topological_order() == ['A', 'B', 'C']
+    # Dependența rămâne declarată, dar nu intră în DAG
+    assert graph.prerequisites_of('A') == {'C'}
+    assert graph.dependents_of('C') == set()
+    assert_topological(graph)
+
+
+def test_self_dependency_is_rejected():
+    graph = DependencyGraph()
+    graph.build({'A': ['A']})
+    assert graph.cyclic_edges == {('A', 'A')}
+    assert graph.topological_order() == ['A']
+
+
+def test_cyclic_edge_is_retried_after_an_edge_is_removed():
+    graph = DependencyGraph()
+    graph.build({'A': ['C'], 'B': ['A'], 'C': ['B']})
+    assert len(graph.cyclic_edges) == 1
+    assert_topological(graph)
+
+    # C nu mai depinde de B - ciclul se rupe, muchia respinsă intră în DAG
+    graph.set_dependencies('C', [])
+    assert not graph.has_cycles()
+    assert graph.topological_order() == ['C', 'A', 'B']
+    assert_topological(graph)
+
+
+def test_cyclic_edge_is_retried_after_an_order_is_removed():
+    graph = DependencyGraph()
+    graph.build({'A': [], 'B': ['A'], 'C': ['B']})
+    graph.set_dependencies('A', ['C'])
+    assert graph.has_cycles()
+
+    graph.remove_order('B')
+    assert not graph.has_cycles()
+    assert graph.dependents_of('C') == {'A'}
+    assert graph.topological_order() == ['C', 'A']
+    # B e încă referit de C - rămâne ca dependență lipsă
+    assert graph.missing_dependencies() == {'B'}
+    assert_topological(graph)
+
+
+def test_incremental_edges_reorder_only_when_needed():
+    graph = DependencyGraph()
+    graph.build({'A': [], 'B': [], 'C': [], 'D': []})
+    graph.set_dependencies('A', ['D'])
+    graph.set_dependencies('B', ['A'])
+    assert graph.topological_order().index('D') < graph.topological_order().index('A') < \
+        graph.topological_order().index('B')
+    assert_topological(graph)
+
+
+def test_follows_the_orders_repository(make_tables):
+    tables = make_tables({'orders': [
+        {'OrderID': 'ORD-1', 'Dependencies': None},
+        {'OrderID': 'ORD-2', 'Dependencies': 'ORD-1'},
+    ]})
+    orders = tables['orders']
+    graph = DependencyGraph(orders)
+    assert graph.topological_order() == ['ORD-1', 'ORD-2']
+
+    orders.update('ORD-1', {'Dependencies': 'ORD-2'})
+    assert graph.cyclic_edges == {('ORD-2', 'ORD-1')}
+
+    orders.delete(['ORD-2'])
+    assert not graph.has_cycles()
+    assert graph.topological_order() == ['ORD-1']
+    assert graph.missing_dependencies() == {'ORD-2'}
+
+    orders.insert([{'OrderID': 'ORD-2', 'Dependencies': ''}])
+    assert graph.topological_order() == ['ORD-2', 'ORD-1']
+    assert graph.missing_dependencies() == set()
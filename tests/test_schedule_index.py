@@ -0,0 +1,97 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import schedule_index
+import schedule_store
+
+DAY = pd.Timestamp('2026-03-02')
+
+
+def at(hours):
+    return DAY + pd.Timedelta(hours=hours)
+
+
+def entry(schedule_id, line_id, start, end, status='Scheduled'):
+    return {'ScheduleID': schedule_id, 'OrderID': f"ORD-{schedule_id}", 'LineID': line_id,
+            'StartDateTime': at(start), 'EndDateTime': at(end), 'Status': status}
+
+
+@pytest.fixture
+def env(make_tables):
+    tables = make_tables({'schedule': [
+        entry('SCH-1', 'LINE-A', 8, 10),
+        entry('SCH-2', 'LINE-A', 10, 12),
+        entry('SCH-3', 'LINE-A', 13, 14),
+        entry('SCH-4', 'LINE-A', 16, 18, 'Completed'),
+        entry('SCH-5', 'LINE-B', 9, 11),
+    ]})
+    store = schedule_store.ScheduleStore()
+    return SimpleNamespace(schedule=tables['schedule'], store=store,
+                           index=schedule_index.ScheduleIntervalIndex(tables['schedule'], store))
+
+
+def test_overlapping_is_half_open(env):
+    assert env.index.overlapping('LINE-A', at(9), at(13)) == ['SCH-1', 'SCH-2']
+    assert env.index.overlapping('LINE-A', at(10), at(10.5)) == ['SCH-2']
+    assert env.index.overlapping('LINE-A', at(12), at(13)) == []
+
+
+def test_overlapping_filters_by_line_and_status(env):
+    assert env.index.overlapping('LINE-B', at(0), at(24)) == ['SCH-5']
+    assert env.index.overlapping('LINE-A', at(15), None) == ['SCH-4']
+    assert env.index.overlapping('LINE-A', at(15), None, schedule_index.ACTIVE_STATUSES) == []
+    assert env.index.overlapping('LINE-X', at(0), at(24)) == []
+
+
+def test_overlapping_sees_long_intervals_started_earlier(env):
+    env.schedule.insert([entry('SCH-6', 'LINE-C', -48, 48), entry('SCH-7', 'LINE-C', 1, 2)])
+    assert env.index.overlapping('LINE-C', at(20), at(21)) == ['SCH-6']
+
+
+def test_first_gap_skips_gaps_that_are_too_short(env):
+    assert env.index.first_gap('LINE-A', at(6), timedelta(hours=2)) == at(6)
+    assert env.index.first_gap('LINE-A', at(8), timedelta(hours=1)) == at(12)
+    assert env.index.first_gap('LINE-A', at(8), timedelta(hours=2)) == at(14)
+
+
+def test_first_gap_ignores_closed_entries(env):
+    # SCH-4 e Completed - nu ocupă linia
+    assert env.index.first_gap('LINE-A', at(14), timedelta(hours=4)) == at(14)
+    assert env.index.first_gap('LINE-Z', at(3), timedelta(hours=4)) == at(3)
+
+
+def test_preceding_and_busy_hours(env):
+    assert env.index.preceding('LINE-A', at(13)) == 'SCH-2'
+    assert env.index.preceding('LINE-A', at(8)) is None
+    assert env.index.busy_hours('LINE-A', at(9), at(13.5)) == pytest.approx(3.5)
+
+
+def test_updates_and_deletes_move_intervals(env):
+    schedule = env.schedule
+    schedule.update('SCH-2', {'LineID': 'LINE-B', 'StartDateTime': at(11), 'EndDateTime': at(12)})
+    assert env.index.overlapping('LINE-A', at(8), at(13)) == ['SCH-1']
+    assert env.index.overlapping('LINE-B', at(8), at(13)) == ['SCH-5', 'SCH-2']
+
+    schedule.delete(['SCH-1'])
+    assert env.index.first_gap('LINE-A', at(8), timedelta(hours=5)) == at(8)
+
+
+def test_buffered_entries_are_visible_without_commit(env):
+    env.store.append(entry('SCH-9', 'LINE-A', 12, 13))
+    assert env.index.overlapping('LINE-A', at(11), at(14)) == ['SCH-2', 'SCH-9', 'SCH-3']
+    assert env.index.first_gap('LINE-A', at(8), timedelta(hours=1)) == at(14)
+    assert env.store.pending == 1
+
+    # Commit-ul inserează intrarea în tabel - fără dublură în index
+    env.store.commit(env.schedule)
+    assert env.store.pending == 0
+    assert env.index.overlapping('LINE-A', at(11), at(14)) == ['SCH-2', 'SCH-9', 'SCH-3']
+
+
+def test_rebuild_keeps_buffered_entries(env):
+    env.store.append(entry('SCH-9', 'LINE-B', 12, 13))
+    env.schedule.rebuild()
+    assert env.index.overlapping('LINE-B', at(0), at(24)) == ['SCH-5', 'SCH-9']
@@ -0,0 +1,169 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import change_journal
+import id_allocator
+import line_compatibility
+import order_dependencies
+import schedule_index
+import schedule_repair
+import schedule_store
+import scheduling_engine
+import shift_calendar
+
+# Programările sunt în viitor - repararea pornește din momentul curent
+T0 = pd.Timestamp.now().floor('h') + pd.Timedelta(days=1)
+
+
+def at(hours):
+    return T0 + pd.Timedelta(hours=hours)
+
+
+def line(line_id, product_types, efficiency):
+    return {'LineID': line_id, 'Status': 'Active', 'ProductTypes': product_types, 'Efficiency': efficiency,
+            'SetupTime_Minutes': 0, 'QualityCheckTime_Minutes': 0}
+
+
+def order(order_id, product_type, hours, line_id, status='Scheduled'):
+    return {'OrderID': order_id, 'ProductType': product_type, 'EstimatedHours': hours, 'Priority': 'Medium',
+            'DueDate': at(72), 'Status': status, 'AssignedLine': line_id, 'Dependencies': None}
+
+
+def booking(schedule_id, order_id, line_id, start, end, status='Scheduled'):
+    return {'ScheduleID': schedule_id, 'OrderID': order_id, 'LineID': line_id, 'Status': status,
+            'StartDateTime': at(start), 'EndDateTime': at(end), 'ScheduledBy': 'System'}
+
+
+@pytest.fixture
+def env(make_tables, tmp_path):
+    tables = make_tables({
+        'production_lines': [line('LINE-A', 'Electronics,Heavy', 0.9), line('LINE-B', 'Electronics', 0.8)],
+        'orders': [order('ORD-1', 'Electronics', 4, 'LINE-A'),
+                   order('ORD-2', 'Heavy', 2, 'LINE-A'),
+                   order('ORD-3', 'Electronics', 3, 'LINE-B'),
+                   order('ORD-4', 'Electronics', 3, 'LINE-A', 'In Progress'),
+                   order('ORD-5', 'Electronics', 1, 'LINE-A')],
+        'schedule': [booking('SCH-1', 'ORD-4', 'LINE-A', -2, 1, 'In Progress'),
+                     booking('SCH-2', 'ORD-1', 'LINE-A', 2, 6),
+                     booking('SCH-3', 'ORD-2', 'LINE-A', 6, 8),
+                     booking('SCH-4', 'ORD-3', 'LINE-B', 0, 3)],
+    })
+    config, rules = {'work_hours_per_day': 24, 'days_per_week': 7}, {}
+    calendar = shift_calendar.ShiftCalendar(lambda: config, lambda: rules)
+    store = schedule_store.ScheduleStore()
+    index = schedule_index.ScheduleIntervalIndex(tables['schedule'], store)
+    compatibility = line_compatibility.CompatibilityMatrix(tables['production_lines'], lambda: rules)
+    dependencies = order_dependencies.DependencyGraph(tables['orders'])
+    repairer = schedule_repair.ScheduleRepairer(
+        tables.repositories, index, calendar, dependencies,
+        lambda: scheduling_engine.BatchScheduler(compatibility, dependencies, index, calendar=calendar),
+        id_allocator.IdAllocator(str(tmp_path / "id_sequences.json"), tables.repositories), store)
+
+    # ORD-5 e încă doar în buffer-ul de programări (necomisă)
+    store.append(booking('SCH-5', 'ORD-5', 'LINE-A', 9, 10))
+    return SimpleNamespace(tables=tables, index=index, store=store, repairer=repairer,
+                           journal_path=str(tmp_path / "changes.journal"))
+
+
+@pytest.fixture
+def repaired(env):
+    env.tables['production_lines'].update('LINE-A', {'Status': 'Inactive'})
+    return env.repairer.line_down('LINE-A', since=T0)
+
+
+def test_line_down_removes_future_bookings_only(env, repaired):
+    assert repaired.removed == ['SCH-2', 'SCH-3', 'SCH-5']
+    assert env.store.pending == 0
+    schedule = env.tables['schedule']
+    assert 'SCH-1' in schedule and 'SCH-4' in schedule
+    assert not any(schedule_id in schedule for schedule_id in repaired.removed)
+    # Doar programarea în lucru (începută înainte de `since`) rămâne pe linie
+    assert env.index.overlapping('LINE-A', T0, None) == ['SCH-1']
+
+
+def test_line_down_replaces_compatible_orders(env, repaired):
+    schedule, orders = env.tables['schedule'], env.tables['orders']
+    assert len(repaired.added) == 2
+    placed = {schedule.get_value(schedule_id, 'OrderID'): schedule_id for schedule_id in repaired.added}
+    assert sorted(placed) == ['ORD-1', 'ORD-5']
+
+    for order_id, schedule_id in placed.items():
+        assert schedule.get_value(schedule_id, 'LineID') == 'LINE-B'
+        assert orders.get_value(order_id, 'AssignedLine') == 'LINE-B'
+        assert orders.get_value(order_id, 'Status') == 'Scheduled'
+
+    # Fără suprapuneri pe linia care a preluat comenzile
+    intervals = env.index.intervals('LINE-B', T0 - pd.Timedelta(days=2), None)
+    assert len(intervals) == 3
+    for (_, end, _, _), (start, _, _, _) in zip(intervals, intervals[1:]):
+        assert end <= start
+
+
+def test_line_down_records_orders_that_could_not_be_replaced(env, repaired):
+    assert repaired.unscheduled == {'ORD-2': "No compatible active line"}
+    assert sorted(dict.fromkeys(repaired.orders)) == ['ORD-1', 'ORD-2', 'ORD-5']
+
+    orders = env.tables['orders']
+    assert orders.get_value('ORD-2', 'Status') == 'Planned'
+    assert orders.get_value('ORD-2', 'AssignedLine') == ''
+
+
+def test_line_down_journal_contents(env, repaired):
+    schedule, orders = env.tables['schedule'], env.tables['orders']
+    journal = change_journal.ChangeJournal(env.journal_path)
+    for table_name, op, row in repaired.changes(schedule, orders):
+        journal.append(table_name, op, row)
+    entries = journal.read_entries()
+    journal.close()
+
+    assert [(entry['table'], entry['op'], entry['key']) for entry in entries] == (
+        [('schedule', 'upsert', schedule_id) for schedule_id in repaired.added] +
+        [('schedule', 'delete', schedule_id) for schedule_id in ['SCH-2', 'SCH-3', 'SCH-5']] +
+        [('orders', 'upsert', order_id) for order_id in ['ORD-1', 'ORD-2', 'ORD-5']])
+
+    rows = {entry['key']: entry['row'] for entry in entries if entry['op'] == 'upsert'}
+    assert rows['ORD-2']['Status'] == 'Planned'
+    assert rows['ORD-1']['AssignedLine'] == 'LINE-B'
+    assert all(rows[schedule_id]['LineID'] == 'LINE-B' for schedule_id in repaired.added)
+
+
+def test_line_down_without_bookings_changes_nothing(env):
+    env.repairer.line_down('LINE-A', since=T0)
+    again = env.repairer.line_down('LINE-A', since=T0)
+    assert len(again) == 0
+    assert again.orders == [] and again.changes(env.tables['schedule'], env.tables['orders']) == []
+
+
+def test_line_changed_moves_bookings_to_the_new_line(env):
+    env.tables['orders'].update('ORD-1', {'AssignedLine': 'LINE-B'})
+    result = env.repairer.line_changed('ORD-1', 'LINE-B')
+    schedule = env.tables['schedule']
+
+    assert result.removed == ['SCH-2'] and len(result.added) == 1
+    added = result.added[0]
+    assert schedule.get_value(added, 'LineID') == 'LINE-B'
+    # Nu mai devreme de vechiul start (+2h): primul gol de 4h pe LINE-B e după SCH-4
+    assert schedule.get_value(added, 'StartDateTime') == at(3)
+    assert schedule.get_value(added, 'EndDateTime') == at(7)
+    # Golul lăsat pe LINE-A se închide: SCH-3 (lipită de SCH-2) urcă în locul ei
+    assert schedule.get_value('SCH-3', 'StartDateTime') == at(2)
+
+
+def test_line_changed_without_a_line_returns_the_order_to_planned(env):
+    result = env.repairer.line_changed('ORD-3', None)
+    assert result.removed == ['SCH-4'] and result.added == []
+    assert env.tables['orders'].get_value('ORD-3', 'Status') == 'Planned'
+    assert env.tables['orders'].get_value('ORD-3', 'AssignedLine') == ''
+
+
+def test_orders_added_places_new_planned_orders(env):
+    env.tables['orders'].insert([order('ORD-6', 'Electronics', 2, '', 'Planned'),
+                                 order('ORD-7', 'Heavy', 1, '', 'Planned')])
+    result = env.repairer.orders_added(['ORD-6', 'ORD-7'])
+    assert len(result.added) == 2 and result.unscheduled == {}
+
+    orders = env.tables['orders']
+    assert orders.get_value('ORD-7', 'AssignedLine') == 'LINE-A'
+    assert all(orders.get_value(order_id, 'Status') == 'Scheduled' for order_id in ['ORD-6', 'ORD-7'])
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import line_compatibility
+import order_dependencies
+import schedule_index
+import scheduling_engine
+import shift_calendar
+
+NOW = pd.Timestamp('2026-03-02 08:00')     # luni
+
+
+def line(line_id, product_types, efficiency, status='Active'):
+    return {'LineID': line_id, 'Status': status, 'ProductTypes': product_types, 'Efficiency': efficiency,
+            'SetupTime_Minutes': 0, 'QualityCheckTime_Minutes': 0}
+
+
+def order(order_id, product_type, hours, priority='Medium', dependencies=None, status='Planned', line_id=''):
+    return {'OrderID': order_id, 'ProductType': product_type, 'EstimatedHours': hours, 'Priority': priority,
+            'DueDate': NOW + pd.Timedelta(days=7), 'Status': status, 'AssignedLine': line_id,
+            'Dependencies': dependencies}
+
+
+@pytest.fixture
+def env(make_tables):
+    tables = make_tables({
+        'production_lines': [line('LINE-A', 'Electronics,Heavy', 0.9), line('LINE-B', 'Electronics', 0.8),
+                             line('LINE-C', 'Medical', 0.9, 'Inactive')],
+        'orders': [order('ORD-1', 'Electronics', 4, 'High'),
+                   order('ORD-2', 'Heavy', 2, dependencies='ORD-1'),
+                   order('ORD-3', 'Medical', 3),
+                   order('ORD-4', 'Electronics', 0),
+                   order('ORD-5', 'Electronics', 5, status='Scheduled', line_id='LINE-A')],
+        'schedule': [{'ScheduleID': 'SCH-1', 'OrderID': 'ORD-5', 'LineID': 'LINE-A', 'Status': 'Scheduled',
+                      'StartDateTime': NOW, 'EndDateTime': NOW + pd.Timedelta(hours=5)}],
+    })
+    index = schedule_index.ScheduleIntervalIndex(tables['schedule'])
+    scheduler = scheduling_engine.BatchScheduler(
+        line_compatibility.CompatibilityMatrix(tables['production_lines'], lambda: {}),
+        order_dependencies.DependencyGraph(tables['orders']), index)
+    return SimpleNamespace(tables=tables, scheduler=scheduler, index=index)
+
+
+def run(env, **kwargs):
+    tables = env.tables
+    result = env.scheduler.run(tables['orders'].frame(), tables['schedule'].frame(),
+                               tables['production_lines'].frame(), now=NOW, **kwargs)
+    return result, result.schedule_df.set_index('OrderID')
+
+
+def test_places_only_open_orders_on_compatible_active_lines(env):
+    result, placed = run(env)
+    assert sorted(placed.index) == ['ORD-1', 'ORD-2']
+    assert placed.at['ORD-2', 'LineID'] == 'LINE-A'
+    assert result.unscheduled == {'ORD-3': "No compatible active line", 'ORD-4': "Missing estimated hours"}
+
+
+def test_avoids_existing_schedule_entries(env):
+    _, placed = run(env)
+    # LINE-A e ocupată până la 13:00 de SCH-1
+    for order_id, row in placed.iterrows():
+        overlapping = env.index.overlapping(row['LineID'], row['StartDateTime'], row['EndDateTime'])
+        assert overlapping == [], order_id
+    assert placed.at['ORD-2', 'StartDateTime'] >= NOW + pd.Timedelta(hours=5)
+
+
+def test_dependents_start_after_their_prerequisites(env):
+    env.tables['orders'].update('ORD-2', {'ProductType': 'Electronics'})
+    _, placed = run(env)
+    assert placed.at['ORD-2', 'StartDateTime'] >= placed.at['ORD-1', 'EndDateTime']
+
+
+def test_order_ids_restricts_the_batch(env):
+    result, placed = run(env, order_ids=['ORD-2', 'ORD-5'])
+    # ORD-5 e deja programată; ORD-1 (nu e în lot) nu condiționează plasarea lui ORD-2
+    assert list(placed.index) == ['ORD-2']
+    assert placed.at['ORD-2', 'StartDateTime'] == NOW + pd.Timedelta(hours=5)
+    assert result.unscheduled == {}
+
+
+def test_calendar_keeps_work_inside_shifts(env):
+    config, rules = {'work_hours_per_day': 8, 'days_per_week': 5}, {}
+    env.scheduler.calendar = shift_calendar.ShiftCalendar(lambda: config, lambda: rules)
+    _, placed = run(env)
+    # Schimb 06:00-14:00: ORD-1 încape azi pe LINE-B; ORD-2 (doar LINE-A) are o oră după SCH-1, restul mâine
+    assert placed.at['ORD-1', 'LineID'] == 'LINE-B'
+    assert placed.at['ORD-1', 'EndDateTime'] == NOW + pd.Timedelta(hours=4)
+    assert placed.at['ORD-2', 'StartDateTime'] == NOW + pd.Timedelta(hours=5)
+    assert placed.at['ORD-2', 'EndDateTime'] == pd.Timestamp('2026-03-03 07:00')
+    for start, end in zip(placed['StartDateTime'], placed['EndDateTime']):
+        assert pd.Timedelta(hours=6) <= start - start.normalize() < pd.Timedelta(hours=14)
+        assert pd.Timedelta(hours=6) < end - end.normalize() <= pd.Timedelta(hours=14)
+
+
+
+def test_prefers_a_free_line_over_a_booked_more_efficient_one(env):
+    tables = env.tables
+    tables['production_lines'].update('LINE-A', {'Efficiency': 0.95})
+    tables['orders'].insert([order('ORD-6', 'Electronics', 2, status='Scheduled', line_id='LINE-A')])
+    tables['schedule'].insert([{'ScheduleID': 'SCH-2', 'OrderID': 'ORD-6', 'LineID': 'LINE-A', 'Status': 'Scheduled',
+                                'StartDateTime': NOW + pd.Timedelta(hours=5),
+                                'EndDateTime': NOW + pd.Timedelta(days=7)}])
+    tables['orders'].update('ORD-1', {'EstimatedHours': 2, 'DueDate': NOW + pd.Timedelta(hours=24)})
+    result, placed = run(env, order_ids=['ORD-1'])
+    # LINE-A e ocupată o săptămână - comanda merge pe LINE-B, la timp
+    assert placed.at['ORD-1', 'LineID'] == 'LINE-B'
+    assert placed.at['ORD-1', 'StartDateTime'] == NOW
+    assert result.summary['tardy_orders'] == 0
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shift_calendar
+from shift_calendar import WorkingTime
+
+HOUR = 3600 * 10 ** 9
+
+
+def ns(value):
+    return pd.Timestamp(value).value
+
+
+@pytest.fixture
+def shifts():
+    # Două schimburi 06:00-22:00, luni și marți
+    return WorkingTime([ns('2026-03-02 06:00'), ns('2026-03-03 06:00')],
+                       [ns('2026-03-02 22:00'), ns('2026-03-03 22:00')])
+
+
+def test_before_counts_only_working_time(shifts):
+    assert shifts.before(ns('2026-03-02 05:00')) == 0
+    assert shifts.before(ns('2026-03-02 06:00')) == 0
+    assert shifts.before(ns('2026-03-02 10:00')) == 4 * HOUR
+    assert shifts.before(ns('2026-03-02 22:00')) == 16 * HOUR
+    assert shifts.before(ns('2026-03-03 03:00')) == 16 * HOUR
+    assert shifts.before(ns('2026-03-03 06:00')) == 16 * HOUR
+    assert shifts.before(ns('2026-03-04 12:00')) == 32 * HOUR
+
+
+def test_between_is_clamped_at_zero(shifts):
+    assert shifts.between(ns('2026-03-02 20:00'), ns('2026-03-03 08:00')) == 4 * HOUR
+    assert shifts.between(ns('2026-03-03 08:00'), ns('2026-03-02 20:00')) == 0
+
+
+@pytest.mark.parametrize('start, hours, expected', [
+    ('2026-03-02 08:00', 2, '2026-03-02 10:00'),
+    ('2026-03-02 06:00', 16, '2026-03-02 22:00'),      # se termină exact la sfârșitul schimbului
+    ('2026-03-02 21:00', 2, '2026-03-03 07:00'),       # trece peste noapte
+    ('2026-03-02 22:00', 1, '2026-03-03 07:00'),
+    ('2026-03-02 23:30', 1, '2026-03-03 07:00'),       # pornește din afara schimbului
+    ('2026-03-01 12:00', 1, '2026-03-02 07:00'),       # înainte de primul schimb
+    ('2026-03-02 21:00', 0, '2026-03-02 21:00'),
+])
+def test_add_crosses_shift_boundaries(shifts, start, hours, expected):
+    assert shifts.add(ns(start), hours * HOUR) == ns(expected)
+
+
+def test_add_beyond_the_horizon_returns_none(shifts):
+    assert shifts.add(ns('2026-03-03 20:00'), 3 * HOUR) is None
+    assert shifts.add(ns('2026-03-03 20:00'), 2 * HOUR) == ns('2026-03-03 22:00')
+
+
+def test_next_working(shifts):
+    assert shifts.next_working(ns('2026-03-02 05:00')) == ns('2026-03-02 06:00')
+    assert shifts.next_working(ns('2026-03-02 12:00')) == ns('2026-03-02 12:00')
+    assert shifts.next_working(ns('2026-03-02 22:00')) == ns('2026-03-03 06:00')
+    assert shifts.next_working(ns('2026-03-03 22:00')) is None
+
+
+def test_without_splits_a_shift_around_the_block(shifts):
+    blocked = shifts.without([(ns('2026-03-02 10:00'), ns('2026-03-02 12:00'))])
+    assert blocked.starts.tolist() == [ns('2026-03-02 06:00'), ns('2026-03-02 12:00'), ns('2026-03-03 06:00')]
+    assert blocked.ends.tolist() == [ns('2026-03-02 10:00'), ns('2026-03-02 22:00'), ns('2026-03-03 22:00')]
+    assert blocked.before(ns('2026-03-02 22:00')) == 14 * HOUR
+    assert blocked.add(ns('2026-03-02 09:00'), 2 * HOUR) == ns('2026-03-02 13:00')
+    # Originalul rămâne neschimbat
+    assert shifts.before(ns('2026-03-02 22:00')) == 16 * HOUR
+
+
+def test_without_blocks_spanning_and_touching_shifts(shifts):
+    overnight = shifts.without([(ns('2026-03-02 20:00'), ns('2026-03-03 08:00'))])
+    assert overnight.add(ns('2026-03-02 19:00'), 2 * HOUR) == ns('2026-03-03 09:00')
+
+    whole_day = shifts.without([(ns('2026-03-02 00:00'), ns('2026-03-03 00:00'))])
+    assert whole_day.starts.tolist() == [ns('2026-03-03 06:00')]
+
+    # Blocare lipită de schimb (între schimburi) - nimic nu se schimbă
+    touching = shifts.without([(ns('2026-03-02 22:00'), ns('2026-03-03 06:00'))])
+    assert touching.starts.tolist() == shifts.starts.tolist()
+    assert touching.ends.tolist() == shifts.ends.tolist()
+
+
+def test_stacked_lines_match_the_scalar_path():
+    config, rules = {'work_hours_per_day': 16, 'days_per_week': 5}, {}
+    calendar = shift_calendar.ShiftCalendar(lambda: config, lambda: rules)
+
+    class Blocked:
+        def blocked_intervals(self, line_id):
+            return [(ns('2026-03-03 08:00'), ns('2026-03-04 12:00'))] if line_id == 'LINE-B' else []
+
+    calendar.blocked_source = Blocked()
+    line_ids = ['LINE-A', 'LINE-B']
+    rng = np.random.default_rng(7)
+    t = ns('2026-03-02') + rng.integers(0, 14 * 24, 200) * HOUR // 2
+    durations = rng.integers(0, 40, 200) * HOUR // 4
+    rows = rng.integers(0, 2, 200)
+
+    end = calendar.add_after_ns(line_ids, rows, t, durations)
+    expected = [calendar.add_ns(line_ids[row], calendar.next_working_ns(line_ids[row], int(start)), int(duration))
+                for row, start, duration in zip(rows, t, durations)]
+    assert end.tolist() == expected